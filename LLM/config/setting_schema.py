@@ -13,6 +13,8 @@ class OpenAIConfig(BaseModel):
     api_key: Optional[str] = Field(default=os.getenv("OPENAI_API_KEY"), description="OpenAI API key")
     api_base: str = Field(default="https://api.openai.com/v1", description="OpenAI API base URL")
     model: str = Field(default="gpt-4o-mini", description="ChatGPT model to use")
+    signal_model: str = Field(default="gpt-4o-mini", description="Smaller, faster model used for per-symbol signal generation")
+    report_model: Optional[str] = Field(default=None, description="Model used for market reports (defaults to model)")
     max_tokens: int = Field(default=2000, description="Maximum tokens for response")
     temperature: float = Field(default=0.7, description="Model temperature (0-2)")
     timeout: int = Field(default=30, description="Request timeout in seconds")
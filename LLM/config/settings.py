@@ -29,6 +29,14 @@ class LLMSettings(BaseModel):
     @property
     def backend_base_url(self) -> str:
         return os.getenv("TRADEBOT_API_BASE_URL", self.core.data_sources.base_url)
+    
+    @property
+    def redis_url(self) -> Optional[str]:
+        if os.getenv("REDIS_URL"):
+            return os.getenv("REDIS_URL")
+        if os.getenv("REDIS_HOST"):
+            return f"redis://{os.getenv('REDIS_HOST')}:{os.getenv('REDIS_PORT', '6379')}/0"
+        return None
 
 @lru_cache()
 def get_llm_settings() -> LLMSettings:
@@ -47,6 +55,10 @@ def get_llm_settings() -> LLMSettings:
         core.openai.api_key = os.getenv("OPENAI_API_KEY")
     if os.getenv("OPENAI_MODEL"):
         core.openai.model = os.getenv("OPENAI_MODEL")
+    if os.getenv("OPENAI_SIGNAL_MODEL"):
+        core.openai.signal_model = os.getenv("OPENAI_SIGNAL_MODEL")
+    if os.getenv("OPENAI_REPORT_MODEL"):
+        core.openai.report_model = os.getenv("OPENAI_REPORT_MODEL")
     if os.getenv("OPENAI_MAX_TOKENS"):
         core.openai.max_tokens = int(os.getenv("OPENAI_MAX_TOKENS"))
     if os.getenv("OPENAI_TEMPERATURE"):
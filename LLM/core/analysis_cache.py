@@ -0,0 +1,122 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, Tuple
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+if TYPE_CHECKING:
+    from .redis_cache import RedisCache
+
+logger = logging.getLogger(__name__)
+
+class AnalysisCache:
+    """In-process cache of analysis results for the current candle window
+    
+    Entries expire at the end of the bar they were produced in, so a scheduled
+    run and a manual /llm command inside the same 15-minute bar share one
+    ChatGPT round-trip. Only successful results are stored. With Redis enabled,
+    results are also shared between processes (e.g. scheduler and bot).
+    """
+    
+    def __init__(self, bar_seconds: int = 900, max_entries: int = 32, log_every: int = 20):
+        self.bar_seconds = bar_seconds
+        self.max_entries = max_entries
+        self.log_every = log_every
+        self.stats = {"hits": 0, "misses": 0, "redis_hits": 0}
+        self.redis: Optional["RedisCache"] = None
+        
+        self._entries: OrderedDict[str, Tuple[float, Dict[str, Any]]] = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def enable_redis(self, url: Optional[str]) -> bool:
+        """Use Redis as a second level shared across processes; safe to call repeatedly"""
+        if self.redis is not None or not url:
+            return self.redis is not None
+        
+        from .redis_cache import RedisCache, REDIS_AVAILABLE
+        if not REDIS_AVAILABLE:
+            return False
+        
+        try:
+            self.redis = RedisCache(url, signal_ttl=self.bar_seconds)
+            logger.info("Analysis cache shared through Redis")
+        except Exception as e:
+            logger.warning("Redis analysis cache unavailable, using in-process cache only: %s", e)
+        return self.redis is not None
+    
+    def make_key(self, symbols: Optional[List[str]], generate_report: bool = True, timeframe: str = "15m") -> str:
+        """Key for (symbols, timeframe, current bar); None symbols means the defaults"""
+        payload = {
+            "symbols": sorted(symbols or []),
+            "tf": timeframe,
+            "report": generate_report,
+            "bar": int(time.time() // self.bar_seconds)
+        }
+        if ORJSON_AVAILABLE:
+            raw = orjson.dumps(payload, option=orjson.OPT_SORT_KEYS)
+        else:
+            raw = json.dumps(payload, sort_keys=True).encode("utf-8")
+        return hashlib.sha256(raw).hexdigest()
+    
+    def get_or_set(self, key: str, factory: Callable[[], Dict[str, Any]]) -> Dict[str, Any]:
+        """Return the cached results for key, or run factory and cache a successful result"""
+        now = time.time()
+        
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and entry[0] > now:
+                self._entries.move_to_end(key)
+                self._record(hit=True)
+                return entry[1]
+            self._entries.pop(key, None)
+        
+        expires_at = (int(now // self.bar_seconds) + 1) * self.bar_seconds
+        
+        # Another process may already have analyzed this bar
+        if self.redis:
+            results = self.redis.get_json(f"analysis:{key}")
+            if results is not None:
+                with self._lock:
+                    self.stats["redis_hits"] += 1
+                    self._record(hit=True)
+                    self._store(key, expires_at, results)
+                return results
+        
+        with self._lock:
+            self._record(hit=False)
+        
+        # Run outside the lock so a slow analysis doesn't block other keys
+        results = factory()
+        
+        if results.get("success"):
+            with self._lock:
+                self._store(key, expires_at, results)
+            if self.redis:
+                self.redis.set_json(f"analysis:{key}", results, ttl=max(1, int(expires_at - time.time())))
+        
+        return results
+    
+    def _store(self, key: str, expires_at: float, results: Dict[str, Any]):
+        self._entries[key] = (expires_at, results)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+    
+    def _record(self, hit: bool):
+        self.stats["hits" if hit else "misses"] += 1
+        total = self.stats["hits"] + self.stats["misses"]
+        if total % self.log_every == 0:
+            logger.info("Analysis cache hit rate: %.0f%% (%d/%d)", 100 * self.stats["hits"] / total, self.stats["hits"], total)
+
+# Shared by the scheduler and the Telegram command running in one process
+analysis_cache = AnalysisCache()
@@ -1,6 +1,8 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
+import re
+from dataclasses import dataclass, field
+from functools import lru_cache
 from typing import Dict, Any, List, Optional, Union
 from datetime import datetime
 from enum import Enum
@@ -20,6 +22,22 @@ class SignalStrength(Enum):
     STRONG = "strong"
     VERY_STRONG = "very_strong"
 
+# Telegram/console emoji for each signal type and strength
+SIGNAL_TYPE_EMOJI: Dict[SignalType, str] = {
+    SignalType.BUY: "📈",
+    SignalType.SELL: "📉",
+    SignalType.HOLD: "⏸️",
+    SignalType.CLOSE_LONG: "🔻",
+    SignalType.CLOSE_SHORT: "🔺"
+}
+
+SIGNAL_STRENGTH_EMOJI: Dict[SignalStrength, str] = {
+    SignalStrength.WEAK: "🟡",
+    SignalStrength.MODERATE: "🟠",
+    SignalStrength.STRONG: "🔴",
+    SignalStrength.VERY_STRONG: "🟣"
+}
+
 class NewsImportance(Enum):
     """News importance levels"""
     LOW = 1
@@ -213,7 +231,7 @@ class MarketData:
         if self.timestamp is None:
             self.timestamp = datetime.now()
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class TradingSignal:
     """Trading signal generated by LLM analysis"""
     symbol: str
@@ -236,15 +254,37 @@ class TradingSignal:
     timestamp: Optional[datetime] = None
     expires_at: Optional[datetime] = None
     
+    # Derived display fields, computed once per instance
+    type_emoji: str = field(init=False, repr=False, compare=False)
+    strength_emoji: str = field(init=False, repr=False, compare=False)
+    
     def __post_init__(self):
+        # Frozen instances: defaults have to bypass the generated __setattr__
+        object.__setattr__(self, "type_emoji", SIGNAL_TYPE_EMOJI.get(self.signal_type, "❓"))
+        object.__setattr__(self, "strength_emoji", SIGNAL_STRENGTH_EMOJI.get(self.strength, "⚪"))
         if self.key_factors is None:
-            self.key_factors = []
+            object.__setattr__(self, "key_factors", [])
         if self.risks is None:
-            self.risks = []
+            object.__setattr__(self, "risks", [])
         if self.timestamp is None:
-            self.timestamp = datetime.now()
+            object.__setattr__(self, "timestamp", datetime.now())
+    
+    def to_result_dict(self) -> Dict[str, Any]:
+        """Flat dict used in analysis results payloads"""
+        return {
+            "symbol": self.symbol,
+            "type": self.signal_type.value,
+            "strength": self.strength.value,
+            "confidence": f"{self.confidence:.2f}",
+            "reasoning": self.reasoning,
+            "entry_price": self.entry_price,
+            "stop_loss": self.stop_loss,
+            "take_profit": self.take_profit,
+            "key_factors": self.key_factors,
+            "risks": self.risks
+        }
 
-@dataclass  
+@dataclass(slots=True, frozen=True)
 class MarketReport:
     """Market analysis report generated by LLM"""
     title: str
@@ -268,13 +308,13 @@ class MarketReport:
     
     def __post_init__(self):
         if self.trading_signals is None:
-            self.trading_signals = []
+            object.__setattr__(self, "trading_signals", [])
         if self.key_levels is None:
-            self.key_levels = {}
+            object.__setattr__(self, "key_levels", {})
         if self.symbols_analyzed is None:
-            self.symbols_analyzed = []
+            object.__setattr__(self, "symbols_analyzed", [])
         if self.timestamp is None:
-            self.timestamp = datetime.now()
+            object.__setattr__(self, "timestamp", datetime.now())
 
 # Utility functions for data validation and conversion
 def normalize_symbol(symbol: str) -> str:
@@ -283,6 +323,17 @@ def normalize_symbol(symbol: str) -> str:
         return symbol.split(':', 1)[1]
     return symbol
 
+_OANDA_SYMBOL_RE = re.compile(r"^(?:OANDA:)?([A-Z]{3})[/_]?([A-Z]{3})$")
+
+@lru_cache(maxsize=1024)
+def normalize_oanda_symbol(symbol: str) -> str:
+    """Convert EURUSD / EUR/USD / EUR_USD to OANDA:EUR_USD (other symbols just get the prefix)"""
+    match = _OANDA_SYMBOL_RE.match(symbol.upper())
+    if match:
+        return f"OANDA:{match.group(1)}_{match.group(2)}"
+    symbol = symbol.replace("/", "_")
+    return symbol if symbol.startswith("OANDA:") else f"OANDA:{symbol}"
+
 def extract_currencies_from_symbol(symbol: str) -> List[str]:
     """Extract currency codes from symbol (e.g., EUR_USD -> ['EUR', 'USD'])"""
     normalized = normalize_symbol(symbol)
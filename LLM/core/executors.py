@@ -0,0 +1,14 @@
+from __future__ import annotations
+
+import logging
+from concurrent.futures import ThreadPoolExecutor
+
+logger = logging.getLogger(__name__)
+
+# Bounded pool for blocking LLM work offloaded from the Telegram/scheduler event loops
+LLM_EXECUTOR = ThreadPoolExecutor(max_workers=4, thread_name_prefix="llm-worker")
+
+def shutdown_executor():
+    """Stop accepting work and drop queued jobs (running jobs finish in the background)"""
+    LLM_EXECUTOR.shutdown(wait=False, cancel_futures=True)
+    logger.debug("LLM executor shut down")
@@ -3,11 +3,13 @@ from __future__ import annotations
 import asyncio
 import json
 import logging
+import time
+from collections import OrderedDict
+from dataclasses import replace
 from datetime import datetime, timedelta
-from typing import List, Optional, Dict, Any
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import List, Optional, Dict, Any, Tuple
 
-from .openai_client import OpenAIHTTPClient, ChatMessage, create_system_prompt
+from .openai_client import OpenAIHTTPClient, AsyncOpenAIHTTPClient, ChatMessage, create_system_prompt
 from .data_types import (
     MarketData, TradingSignal, SignalType, SignalStrength,
     NewsEvent, TechnicalAnalysis, ForexQuote
@@ -15,6 +17,46 @@ from .data_types import (
 
 logger = logging.getLogger(__name__)
 
+# Response schema and rules shared by the fast prompts, kept on one line to save input tokens
+_SIGNAL_SCHEMA = (
+    '{"signal":"buy|sell|hold","strength":"weak|moderate|strong","confidence":0.75,'
+    '"entry":1.2345,"stop":1.2300,"target":1.2400,"reason":"max 50 words",'
+    '"factors":["Factor 1","Factor 2"],"risks":["Risk 1"]}'
+)
+_SIGNAL_RULES = "Rules: buy/sell only if confidence > 0.7, otherwise hold. Max 2 factors, 1 risk. Be decisive."
+
+# Oldest cached signals are evicted past this many entries
+SIGNAL_CACHE_MAX_ENTRIES = 256
+
+class _JsonObjectEnd:
+    """Detects, across streamed chunks, where the first top-level JSON object closes"""
+    
+    __slots__ = ("depth", "in_string", "escape")
+    
+    def __init__(self):
+        self.depth = 0
+        self.in_string = False
+        self.escape = False
+    
+    def feed(self, text: str) -> bool:
+        for ch in text:
+            if self.in_string:
+                if self.escape:
+                    self.escape = False
+                elif ch == "\\":
+                    self.escape = True
+                elif ch == '"':
+                    self.in_string = False
+            elif ch == '"':
+                self.in_string = True
+            elif ch == "{":
+                self.depth += 1
+            elif ch == "}" and self.depth:
+                self.depth -= 1
+                if not self.depth:
+                    return True
+        return False
+
 class FastSignalGenerator:
     """Fast signal generator with parallel processing and optimized prompts"""
     
@@ -25,25 +67,41 @@ class FastSignalGenerator:
         max_tokens: int = 1000,  # Reduced tokens for faster response
         temperature: float = 0.2,  # Lower temperature for faster, more consistent responses
         confidence_threshold: float = 0.6,
-        max_workers: int = 3  # Parallel processing
+        signal_cache_ttl: int = 300  # Reuse answers for identical inputs for 5 minutes
     ):
         self.openai_client = openai_client
         self.model = model
         self.max_tokens = max_tokens
         self.temperature = temperature
         self.confidence_threshold = confidence_threshold
-        self.max_workers = max_workers
-    
-    def _create_fast_analysis_prompt(self, market_data: MarketData) -> List[ChatMessage]:
-        """Create optimized, shorter prompt for faster analysis"""
+        self.signal_cache_ttl = signal_cache_ttl
         
-        system_prompt = create_system_prompt(
-            "trading_analyst",
-            "Analyze market data quickly and provide a concise trading signal. "
-            "Focus on the most important factors only. Be decisive and brief."
-        )
+        self._signal_cache: OrderedDict[Tuple, Tuple[float, TradingSignal]] = OrderedDict()
+    
+    def _signal_cache_key(self, market_data: MarketData) -> Tuple:
+        """Inputs that decide the answer: symbol, price to 4 decimals and high-impact headlines"""
+        quote = market_data.forex_quote
+        price = round(quote.current_price, 4) if quote and quote.current_price is not None else None
+        headlines = tuple(n.title for n in market_data.related_news if n.importance.value >= 3)
+        return (market_data.symbol, self.model, price, headlines)
+    
+    def _cached_signal(self, market_data: MarketData) -> Optional[TradingSignal]:
+        entry = self._signal_cache.get(self._signal_cache_key(market_data))
+        if entry and entry[0] > time.monotonic():
+            logger.info(f"Reusing cached fast signal for {market_data.symbol}")
+            return entry[1]
+        return None
+    
+    def _cache_signal(self, market_data: MarketData, signal: TradingSignal):
+        key = self._signal_cache_key(market_data)
+        self._signal_cache[key] = (time.monotonic() + self.signal_cache_ttl, signal)
+        self._signal_cache.move_to_end(key)
+        while len(self._signal_cache) > SIGNAL_CACHE_MAX_ENTRIES:
+            self._signal_cache.popitem(last=False)
+    
+    def _summarize_market_data(self, market_data: MarketData) -> str:
+        """Build the concise per-symbol market summary used in prompts"""
         
-        # Build concise market summary
         sections = [f"QUICK ANALYSIS: {market_data.symbol}"]
         
         # Current price (essential)
@@ -74,38 +132,87 @@ class FastSignalGenerator:
             if high_impact:
                 sections.append(f"High Impact News: {high_impact[0].title[:50]}...")
         
-        market_data_text = "\n".join(sections)
+        return "\n".join(sections)
+    
+    def _create_fast_analysis_prompt(self, market_data: MarketData) -> List[ChatMessage]:
+        """Create optimized, shorter prompt for faster analysis"""
+        
+        system_prompt = create_system_prompt(
+            "trading_analyst",
+            "Analyze market data quickly and provide a concise trading signal. "
+            "Focus on the most important factors only. Be decisive and brief."
+        )
+        
+        market_data_text = self._summarize_market_data(market_data)
         
         # Simplified prompt for speed
-        user_prompt = f"""
-{market_data_text}
-
-Provide FAST trading signal in JSON:
-{{
-    "signal": "buy|sell|hold",
-    "strength": "weak|moderate|strong", 
-    "confidence": 0.75,
-    "entry": 1.2345,
-    "stop": 1.2300,
-    "target": 1.2400,
-    "reason": "Brief explanation (max 50 words)",
-    "factors": ["Factor 1", "Factor 2"],
-    "risks": ["Risk 1"]
-}}
-
-Requirements:
-- Only suggest buy/sell if confidence > 70%
-- Otherwise recommend hold
-- Keep reasoning under 50 words
-- Max 2 factors, 1 risk
-- Be decisive and quick
-"""
+        user_prompt = f"{market_data_text}\n\nReply with JSON only: {_SIGNAL_SCHEMA}\n{_SIGNAL_RULES}"
+        
+        return [
+            system_prompt,
+            ChatMessage(role="user", content=user_prompt)
+        ]
+    
+    def _create_bulk_analysis_prompt(self, market_data_list: List[MarketData]) -> List[ChatMessage]:
+        """Create one prompt covering several symbols, sharing the system instructions"""
+        
+        system_prompt = create_system_prompt(
+            "trading_analyst",
+            "Analyze market data quickly and provide a concise trading signal per symbol. "
+            "Focus on the most important factors only. Be decisive and brief."
+        )
+        
+        market_data_text = "\n\n".join(self._summarize_market_data(md) for md in market_data_list)
+        
+        user_prompt = (
+            f"{market_data_text}\n\n"
+            f'Reply with JSON only: {{"signals":[...]}}, one entry per symbol above, each '
+            f'{{"symbol":"<symbol exactly as given>",{_SIGNAL_SCHEMA[1:]}\n{_SIGNAL_RULES}'
+        )
         
         return [
             system_prompt,
             ChatMessage(role="user", content=user_prompt)
         ]
     
+    def _signal_from_data(self, data: Dict[str, Any], symbol: str) -> TradingSignal:
+        """Build a TradingSignal from one parsed JSON signal object"""
+        
+        # Parse signal type
+        signal_type_str = data.get('signal', 'hold').lower()
+        try:
+            signal_type = SignalType(signal_type_str)
+        except ValueError:
+            logger.warning(f"Invalid signal type: {signal_type_str}, defaulting to HOLD")
+            signal_type = SignalType.HOLD
+        
+        # Parse signal strength
+        strength_str = data.get('strength', 'moderate').lower()
+        try:
+            strength = SignalStrength(strength_str)
+        except ValueError:
+            logger.warning(f"Invalid signal strength: {strength_str}, defaulting to MODERATE")
+            strength = SignalStrength.MODERATE
+        
+        # Parse confidence
+        confidence = float(data.get('confidence', 0.5))
+        confidence = max(0.0, min(1.0, confidence))  # Clamp to 0-1
+        
+        return TradingSignal(
+            symbol=symbol,
+            signal_type=signal_type,
+            strength=strength,
+            confidence=confidence,
+            entry_price=data.get('entry'),
+            stop_loss=data.get('stop'),
+            take_profit=data.get('target'),
+            reasoning=data.get('reason'),
+            key_factors=data.get('factors', [])[:2],  # Max 2
+            risks=data.get('risks', [])[:1],  # Max 1
+            timestamp=datetime.now(),
+            expires_at=datetime.now() + timedelta(hours=12)  # Shorter expiry
+        )
+    
     def _parse_fast_signal_response(self, content: str, symbol: str) -> Optional[TradingSignal]:
         """Parse fast signal response"""
         
@@ -122,43 +229,7 @@ Requirements:
             json_str = content[start_idx:end_idx]
             data = json.loads(json_str)
             
-            # Parse signal type
-            signal_type_str = data.get('signal', 'hold').lower()
-            try:
-                signal_type = SignalType(signal_type_str)
-            except ValueError:
-                logger.warning(f"Invalid signal type: {signal_type_str}, defaulting to HOLD")
-                signal_type = SignalType.HOLD
-            
-            # Parse signal strength
-            strength_str = data.get('strength', 'moderate').lower()
-            try:
-                strength = SignalStrength(strength_str)
-            except ValueError:
-                logger.warning(f"Invalid signal strength: {strength_str}, defaulting to MODERATE")
-                strength = SignalStrength.MODERATE
-            
-            # Parse confidence
-            confidence = float(data.get('confidence', 0.5))
-            confidence = max(0.0, min(1.0, confidence))  # Clamp to 0-1
-            
-            # Create signal
-            signal = TradingSignal(
-                symbol=symbol,
-                signal_type=signal_type,
-                strength=strength,
-                confidence=confidence,
-                entry_price=data.get('entry'),
-                stop_loss=data.get('stop'),
-                take_profit=data.get('target'),
-                reasoning=data.get('reason'),
-                key_factors=data.get('factors', [])[:2],  # Max 2
-                risks=data.get('risks', [])[:1],  # Max 1
-                timestamp=datetime.now(),
-                expires_at=datetime.now() + timedelta(hours=12)  # Shorter expiry
-            )
-            
-            return signal
+            return self._signal_from_data(data, symbol)
             
         except json.JSONDecodeError as e:
             logger.error(f"Failed to parse JSON from fast signal response for {symbol}: {e}")
@@ -167,6 +238,23 @@ Requirements:
             logger.error(f"Failed to parse fast signal response for {symbol}: {e}")
             return None
     
+    def _apply_confidence_threshold(self, signal: TradingSignal) -> TradingSignal:
+        """Downgrade low-confidence signals to HOLD"""
+        
+        if signal.confidence < self.confidence_threshold:
+            logger.debug(f"Signal for {signal.symbol} below confidence threshold "
+                      f"({signal.confidence:.2f} < {self.confidence_threshold}), "
+                      f"converting to HOLD")
+            signal = replace(
+                signal,
+                signal_type=SignalType.HOLD,
+                reasoning=f"Low confidence ({signal.confidence:.2f}). " + (signal.reasoning or "")
+            )
+        
+        logger.info(f"Fast {signal.signal_type.value} signal for {signal.symbol} "
+                  f"(confidence: {signal.confidence:.2f})")
+        return signal
+    
     def generate_signal_fast(self, market_data: MarketData) -> Optional[TradingSignal]:
         """Generate a single trading signal quickly"""
         
@@ -174,6 +262,10 @@ Requirements:
             logger.error("Market data missing symbol")
             return None
         
+        cached = self._cached_signal(market_data)
+        if cached:
+            return cached
+        
         try:
             logger.debug(f"Fast signal generation for {market_data.symbol}")
             
@@ -183,23 +275,60 @@ Requirements:
             # Get ChatGPT response (remove problematic parameters)
             response = self.openai_client.chat_completion(
                 messages=messages,
-                model=self.model
+                model=self.model,
+                max_completion_tokens=self.max_tokens
             )
             
             # Parse response into signal
             signal = self._parse_fast_signal_response(response.content, market_data.symbol)
             
             if signal:
-                # Apply confidence threshold
-                if signal.confidence < self.confidence_threshold:
-                    logger.debug(f"Signal for {market_data.symbol} below confidence threshold "
-                              f"({signal.confidence:.2f} < {self.confidence_threshold}), "
-                              f"converting to HOLD")
-                    signal.signal_type = SignalType.HOLD
-                    signal.reasoning = f"Low confidence ({signal.confidence:.2f}). " + (signal.reasoning or "")
+                signal = self._apply_confidence_threshold(signal)
+                self._cache_signal(market_data, signal)
+                return signal
+            else:
+                logger.warning(f"Failed to parse fast signal for {market_data.symbol}")
+                return None
                 
-                logger.info(f"Fast {signal.signal_type.value} signal for {market_data.symbol} "
-                          f"(confidence: {signal.confidence:.2f})")
+        except Exception as e:
+            logger.error(f"Failed to generate fast signal for {market_data.symbol}: {e}")
+            return None
+    
+    async def generate_signal_async(
+        self,
+        market_data: MarketData,
+        client: AsyncOpenAIHTTPClient
+    ) -> Optional[TradingSignal]:
+        """Generate a single trading signal over the async client"""
+        
+        if not market_data.symbol:
+            logger.error("Market data missing symbol")
+            return None
+        
+        cached = self._cached_signal(market_data)
+        if cached:
+            return cached
+        
+        try:
+            logger.debug(f"Async signal generation for {market_data.symbol}")
+            
+            messages = self._create_fast_analysis_prompt(market_data)
+            # Stream and hang up once the JSON object closes, skipping any trailing prose
+            response = await asyncio.wait_for(
+                client.chat_completion_stream(
+                    messages=messages,
+                    model=self.model,
+                    max_completion_tokens=self.max_tokens,
+                    stop_when=_JsonObjectEnd().feed
+                ),
+                timeout=15  # 15s timeout per signal
+            )
+            
+            signal = self._parse_fast_signal_response(response.content, market_data.symbol)
+            
+            if signal:
+                signal = self._apply_confidence_threshold(signal)
+                self._cache_signal(market_data, signal)
                 return signal
             else:
                 logger.warning(f"Failed to parse fast signal for {market_data.symbol}")
@@ -209,38 +338,166 @@ Requirements:
             logger.error(f"Failed to generate fast signal for {market_data.symbol}: {e}")
             return None
     
-    def generate_signals_parallel(self, market_data_list: List[MarketData]) -> List[TradingSignal]:
-        """Generate trading signals in parallel for speed"""
+    async def generate_signals_async(
+        self,
+        market_data_list: List[MarketData],
+        client: AsyncOpenAIHTTPClient,
+        concurrency: int = 3
+    ) -> List[TradingSignal]:
+        """Generate trading signals concurrently on the event loop, at most concurrency requests at a time"""
+        
+        logger.info(f"Generating fast signals for {len(market_data_list)} symbols (async)")
+        
+        # Bound in-flight requests so larger symbol lists don't trip OpenAI rate limits
+        semaphore = asyncio.Semaphore(concurrency)
+        
+        async def generate_one(data: MarketData) -> Optional[TradingSignal]:
+            async with semaphore:
+                return await self.generate_signal_async(data, client)
+        
+        results = await asyncio.gather(
+            *(generate_one(data) for data in market_data_list),
+            return_exceptions=True
+        )
+        
+        signals = []
+        for market_data, result in zip(market_data_list, results):
+            if isinstance(result, BaseException):
+                logger.error(f"Signal generation failed for {market_data.symbol}: {result}")
+            elif result:
+                signals.append(result)
+            else:
+                logger.warning(f"No signal for {market_data.symbol}")
+        
+        logger.info(f"Generated {len(signals)} signals concurrently")
+        
+        # Sort by confidence and strength
+        signals.sort(key=lambda s: (s.confidence, s.strength.value), reverse=True)
+        
+        return signals
+    
+    async def generate_signals_bulk(
+        self,
+        market_data_list: List[MarketData],
+        client: AsyncOpenAIHTTPClient
+    ) -> List[TradingSignal]:
+        """Generate signals for several symbols with a single chat completion
+        
+        Symbols missing from the model's answer fall back to per-symbol requests.
+        """
+        
+        logger.info(f"Generating fast signals for {len(market_data_list)} symbols (bulk prompt)")
+        
+        by_symbol: Dict[str, TradingSignal] = {}
+        for md in market_data_list:
+            cached = self._cached_signal(md)
+            if cached:
+                by_symbol[md.symbol] = cached
+        
+        # Only symbols without a fresh cached answer go into the prompt
+        to_prompt = {md.symbol: md for md in market_data_list if md.symbol not in by_symbol}
+        if to_prompt:
+            try:
+                response = await asyncio.wait_for(
+                    client.chat_completion(
+                        messages=self._create_bulk_analysis_prompt(list(to_prompt.values())),
+                        model=self.model,
+                        max_completion_tokens=self.max_tokens * len(to_prompt),  # budget per symbol
+                        response_format={"type": "json_object"}
+                    ),
+                    timeout=20
+                )
+                data = json.loads(response.content)
+                
+                for item in data.get('signals', []):
+                    symbol = item.get('symbol') if isinstance(item, dict) else None
+                    if symbol not in to_prompt or symbol in by_symbol:
+                        continue
+                    try:
+                        signal = self._apply_confidence_threshold(self._signal_from_data(item, symbol))
+                    except (TypeError, ValueError) as e:
+                        logger.warning(f"Failed to parse bulk signal for {symbol}: {e}")
+                        continue
+                    by_symbol[symbol] = signal
+                    self._cache_signal(to_prompt[symbol], signal)
+            except Exception as e:
+                logger.error(f"Bulk signal generation failed: {e}")
+        
+        missing = [md for md in market_data_list if md.symbol not in by_symbol]
+        signals = list(by_symbol.values())
+        if missing:
+            logger.info(f"Bulk prompt missed {len(missing)} symbols, falling back to per-symbol requests")
+            signals.extend(await self.generate_signals_async(missing, client))
+        
+        # Sort by confidence and strength
+        signals.sort(key=lambda s: (s.confidence, s.strength.value), reverse=True)
+        
+        return signals
+    
+    def generate_signals_batch(
+        self,
+        market_data_list: List[MarketData],
+        poll_interval: int = 30,
+        max_wait: int = 24 * 3600
+    ) -> List[TradingSignal]:
+        """Generate trading signals through the OpenAI Batch API
+        
+        Intended for non-interactive runs: results arrive within the batch
+        completion window at a reduced token price, so this blocks while polling.
+        """
         
-        logger.info(f"Generating fast signals for {len(market_data_list)} symbols (parallel)")
+        logger.info(f"Submitting batch signal job for {len(market_data_list)} symbols")
         
-        def generate_single_signal(market_data: MarketData) -> Optional[TradingSignal]:
-            """Generate signal for single market data"""
-            return self.generate_signal_fast(market_data)
+        lines = []
+        for market_data in market_data_list:
+            messages = self._create_fast_analysis_prompt(market_data)
+            lines.append(json.dumps({
+                "custom_id": market_data.symbol,
+                "method": "POST",
+                "url": "/v1/chat/completions",
+                "body": {
+                    "model": self.model,
+                    "messages": [{"role": m.role, "content": m.content} for m in messages],
+                    "max_completion_tokens": self.max_tokens
+                }
+            }))
+        
+        batch = self.openai_client.create_batch("\n".join(lines))
+        batch_id = batch["id"]
+        deadline = time.time() + max_wait
+        
+        while batch.get("status") not in ("completed", "failed", "expired", "cancelled"):
+            if time.time() > deadline:
+                logger.error(f"Batch {batch_id} did not complete within {max_wait}s")
+                return []
+            time.sleep(poll_interval)
+            batch = self.openai_client.retrieve_batch(batch_id)
+            logger.debug(f"Batch {batch_id} status: {batch.get('status')}")
+        
+        if batch["status"] != "completed" or not batch.get("output_file_id"):
+            logger.error(f"Batch {batch_id} ended with status {batch['status']}")
+            return []
         
         signals = []
-        max_workers = min(self.max_workers, len(market_data_list))
-        
-        # Process in parallel
-        with ThreadPoolExecutor(max_workers=max_workers) as executor:
-            future_to_data = {
-                executor.submit(generate_single_signal, data): data 
-                for data in market_data_list
-            }
+        for line in self.openai_client.get_file_content(batch["output_file_id"]).splitlines():
+            if not line.strip():
+                continue
+            try:
+                item = json.loads(line)
+                symbol = item["custom_id"]
+                body = (item.get("response") or {}).get("body") or {}
+                content = body["choices"][0]["message"]["content"]
+            except (json.JSONDecodeError, KeyError, IndexError, TypeError) as e:
+                logger.error(f"Malformed batch output line: {e}")
+                continue
             
-            for future in as_completed(future_to_data):
-                market_data = future_to_data[future]
-                try:
-                    signal = future.result(timeout=15)  # 15s timeout per signal
-                    if signal:
-                        signals.append(signal)
-                        logger.debug(f"Generated signal for {signal.symbol}")
-                    else:
-                        logger.warning(f"No signal for {market_data.symbol}")
-                except Exception as e:
-                    logger.error(f"Signal generation failed for {market_data.symbol}: {e}")
-        
-        logger.info(f"Generated {len(signals)} signals in parallel")
+            signal = self._parse_fast_signal_response(content, symbol)
+            if signal:
+                signals.append(self._apply_confidence_threshold(signal))
+            else:
+                logger.warning(f"Failed to parse batch signal for {symbol}")
+        
+        logger.info(f"Batch {batch_id} produced {len(signals)} signals")
         
         # Sort by confidence and strength
         signals.sort(key=lambda s: (s.confidence, s.strength.value), reverse=True)
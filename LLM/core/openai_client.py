@@ -1,16 +1,101 @@
 from __future__ import annotations
 
+import asyncio
 import json
+import os
+import socket
+import stat
+import struct
+import threading
 import time
 import logging
-from typing import Dict, Any, Optional, List
+from typing import Callable, Dict, Any, Optional, List
 from dataclasses import dataclass
+from functools import lru_cache
+import httpx
 import requests
 from requests.adapters import HTTPAdapter
 from requests.packages.urllib3.util.retry import Retry
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 logger = logging.getLogger(__name__)
 
+# Unix socket of the optional connection sidecar (LLM/daemon.py)
+SIDECAR_SOCKET = os.getenv("LLM_OPENAI_SOCKET", "/tmp/llm_openai.sock")
+
+def dumps_json(data: Any, indent: bool = False) -> bytes:
+    """Encode JSON to UTF-8 bytes, with orjson when installed"""
+    if ORJSON_AVAILABLE:
+        option = orjson.OPT_NON_STR_KEYS | (orjson.OPT_INDENT_2 if indent else 0)
+        return orjson.dumps(data, option=option)
+    return json.dumps(data, indent=2 if indent else None, ensure_ascii=False).encode("utf-8")
+
+def _sidecar_trusted(path: str) -> bool:
+    """True if path is a Unix socket owned by this user; /tmp is world-writable,
+    so anyone else's socket there could read prompts and forge completions"""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return False
+    if not stat.S_ISSOCK(st.st_mode) or st.st_uid != os.getuid():
+        logger.warning("Ignoring OpenAI sidecar socket %s: not a socket owned by this user", path)
+        return False
+    return True
+
+def _sidecar_response(data: Dict[str, Any], model: str) -> ChatResponse:
+    """Turn a decoded sidecar reply into a ChatResponse"""
+    if not data.get("ok"):
+        raise ValueError(f"OpenAI API error: {data.get('error', 'unknown sidecar error')}")
+    
+    return ChatResponse(
+        content=data["content"],
+        model=data.get("model", model),
+        usage=data.get("usage", {}),
+        finish_reason=data.get("finish_reason", "unknown")
+    )
+
+def _recv_exactly(sock: socket.socket, size: int) -> bytes:
+    buf = bytearray()
+    while len(buf) < size:
+        chunk = sock.recv(size - len(buf))
+        if not chunk:
+            raise ConnectionError("Sidecar closed the connection")
+        buf.extend(chunk)
+    return bytes(buf)
+
+def _build_session(retries: int, backoff: float) -> requests.Session:
+    """Create a pooled session with the given retry strategy"""
+    session = requests.Session()
+    
+    retry_strategy = Retry(
+        total=retries,
+        status_forcelist=[429, 500, 502, 503, 504],
+        allowed_methods=["HEAD", "GET", "PUT", "DELETE", "OPTIONS", "TRACE", "POST"],
+        backoff_factor=backoff,
+        respect_retry_after_header=True
+    )
+    
+    adapter = HTTPAdapter(max_retries=retry_strategy, pool_connections=10, pool_maxsize=40)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    
+    return session
+
+@lru_cache(maxsize=None)
+def get_shared_session(retries: int = 3, backoff: float = 1.0) -> requests.Session:
+    """
+    Process-wide pooled session for a given retry policy
+    
+    Reusing one session keeps TLS connections to the API alive across client
+    instances. Clients built on it must not close it.
+    """
+    return _build_session(retries, backoff)
+
 @dataclass
 class ChatMessage:
     """Represents a single chat message"""
@@ -34,7 +119,9 @@ class OpenAIHTTPClient:
         api_base: str = "https://api.openai.com/v1",
         timeout: int = 30,
         retries: int = 3,
-        backoff: float = 1.0
+        backoff: float = 1.0,
+        session: Optional[requests.Session] = None,
+        sidecar_socket: Optional[str] = SIDECAR_SOCKET
     ):
         if not api_key:
             raise ValueError("OpenAI API key is required")
@@ -44,29 +131,18 @@ class OpenAIHTTPClient:
         self.timeout = timeout
         self.retries = retries
         self.backoff = backoff
+        self.sidecar_socket = sidecar_socket
         
-        # Configure session with retry strategy
-        self.session = requests.Session()
-        
-        # Setup retry strategy
-        retry_strategy = Retry(
-            total=retries,
-            status_forcelist=[429, 500, 502, 503, 504],
-            allowed_methods=["HEAD", "GET", "PUT", "DELETE", "OPTIONS", "TRACE", "POST"],
-            backoff_factor=backoff,
-            respect_retry_after_header=True
-        )
+        # Use a shared pooled session if given, otherwise own a private one
+        self._owns_session = session is None
+        self.session = session if session is not None else _build_session(retries, backoff)
         
-        adapter = HTTPAdapter(max_retries=retry_strategy)
-        self.session.mount("http://", adapter)
-        self.session.mount("https://", adapter)
-        
-        # Set default headers
-        self.session.headers.update({
+        # Headers go on each request so shared sessions stay credential-free
+        self.headers = {
             "Authorization": f"Bearer {api_key}",
             "Content-Type": "application/json",
             "User-Agent": "LLM-Trading-Bot/1.0"
-        })
+        }
         
     def chat_completion(
         self,
@@ -110,25 +186,28 @@ class OpenAIHTTPClient:
         # Skip temperature and max_tokens parameters for gpt-4o models to avoid API errors
         # These models have restrictions on parameter customization
         
-        logger.debug(f"Sending chat completion request: model={model}, messages={len(messages)}, max_tokens={max_tokens}")
+        logger.debug("Sending chat completion request: model=%s, messages=%d, max_tokens=%s", model, len(messages), max_tokens)
+        
+        # Hand off to the sidecar when running, it keeps TLS connections warm between runs
+        if self.sidecar_socket and _sidecar_trusted(self.sidecar_socket):
+            try:
+                return self._chat_completion_via_sidecar(payload)
+            except OSError as e:
+                logger.warning("OpenAI sidecar unavailable, using direct HTTPS: %s", e)
         
         try:
             start_time = time.time()
             response = self.session.post(
                 url,
-                json=payload,
+                data=dumps_json(payload),
+                headers=self.headers,
                 timeout=self.timeout
             )
             elapsed = time.time() - start_time
             
-            logger.debug(f"OpenAI API response: status={response.status_code}, elapsed={elapsed:.2f}s")
-            
-            # Handle rate limiting
-            if response.status_code == 429:
-                retry_after = int(response.headers.get('Retry-After', '60'))
-                logger.warning(f"Rate limited, retrying after {retry_after}s")
-                raise requests.exceptions.RetryError(f"Rate limited, retry after {retry_after}s")
+            logger.debug("OpenAI API response: status=%s, elapsed=%.2fs", response.status_code, elapsed)
             
+            # 429/5xx are retried by the session's urllib3 Retry (honoring Retry-After)
             response.raise_for_status()
             
             data = response.json()
@@ -151,6 +230,9 @@ class OpenAIHTTPClient:
         except requests.exceptions.Timeout:
             logger.error(f"OpenAI API timeout after {self.timeout}s")
             raise
+        except requests.exceptions.RetryError as e:
+            logger.error(f"OpenAI API retries exhausted: {e}")
+            raise
         except requests.exceptions.ConnectionError:
             logger.error("OpenAI API connection error")  
             raise
@@ -171,9 +253,83 @@ class OpenAIHTTPClient:
             logger.error(f"Unexpected error in OpenAI API call: {e}")
             raise
     
+    def warm_up(self):
+        """Open a pooled API connection in the background so the first completion skips the handshake"""
+        
+        def get_models():
+            try:
+                self.session.get(f"{self.api_base}/models", headers=self.headers, timeout=5)
+            except requests.exceptions.RequestException as e:
+                logger.debug("OpenAI warm-up request failed: %s", e)
+        
+        threading.Thread(target=get_models, name="openai-warm-up", daemon=True).start()
+    
+    def _chat_completion_via_sidecar(self, payload: Dict[str, Any]) -> ChatResponse:
+        """Send a chat completion payload over the sidecar's length-prefixed JSON protocol"""
+        body = dumps_json(payload)
+        
+        start_time = time.time()
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.settimeout(self.timeout)
+            sock.connect(self.sidecar_socket)
+            sock.sendall(struct.pack(">I", len(body)) + body)
+            size = struct.unpack(">I", _recv_exactly(sock, 4))[0]
+            data = json.loads(_recv_exactly(sock, size))
+        
+        logger.debug("OpenAI sidecar response: elapsed=%.2fs", time.time() - start_time)
+        
+        return _sidecar_response(data, payload["model"])
+    
+    def create_batch(self, requests_jsonl: str, completion_window: str = "24h") -> Dict[str, Any]:
+        """
+        Upload a JSONL file of chat completion requests and start a Batch API job
+        
+        Args:
+            requests_jsonl: One JSON request object per line
+            completion_window: Batch completion window accepted by the API
+            
+        Returns:
+            Batch object as returned by the API
+        """
+        # multipart upload must not carry the JSON content type
+        upload = self.session.post(
+            f"{self.api_base}/files",
+            data={"purpose": "batch"},
+            files={"file": ("batch_input.jsonl", requests_jsonl.encode("utf-8"), "application/jsonl")},
+            headers={k: v for k, v in self.headers.items() if k != "Content-Type"},
+            timeout=self.timeout
+        )
+        upload.raise_for_status()
+        input_file_id = upload.json()["id"]
+        
+        response = self.session.post(
+            f"{self.api_base}/batches",
+            json={
+                "input_file_id": input_file_id,
+                "endpoint": "/v1/chat/completions",
+                "completion_window": completion_window
+            },
+            headers=self.headers,
+            timeout=self.timeout
+        )
+        response.raise_for_status()
+        return response.json()
+    
+    def retrieve_batch(self, batch_id: str) -> Dict[str, Any]:
+        """Fetch the current state of a Batch API job"""
+        response = self.session.get(f"{self.api_base}/batches/{batch_id}", headers=self.headers, timeout=self.timeout)
+        response.raise_for_status()
+        return response.json()
+    
+    def get_file_content(self, file_id: str) -> str:
+        """Download the raw content of an uploaded or generated file"""
+        response = self.session.get(f"{self.api_base}/files/{file_id}/content", headers=self.headers, timeout=self.timeout)
+        response.raise_for_status()
+        return response.text
+    
     def close(self):
-        """Close the HTTP session"""
-        if self.session:
+        """Close the HTTP session (shared sessions are left open)"""
+        if self.session and self._owns_session:
             self.session.close()
     
     def __enter__(self):
@@ -182,6 +338,253 @@ class OpenAIHTTPClient:
     def __exit__(self, exc_type, exc_val, exc_tb):
         self.close()
 
+class AsyncOpenAIHTTPClient:
+    """Async HTTP client for OpenAI ChatGPT API built on httpx.AsyncClient
+    
+    Mirrors OpenAIHTTPClient so concurrent callers can overlap requests on one
+    event loop. Create and close it within the loop that uses it.
+    """
+    
+    _RETRY_STATUSES = (429, 500, 502, 503, 504)
+    
+    def __init__(
+        self,
+        api_key: str,
+        api_base: str = "https://api.openai.com/v1",
+        timeout: int = 30,
+        retries: int = 3,
+        backoff: float = 1.0,
+        sidecar_socket: Optional[str] = SIDECAR_SOCKET
+    ):
+        if not api_key:
+            raise ValueError("OpenAI API key is required")
+        
+        self.api_key = api_key
+        self.api_base = api_base.rstrip('/')
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff = backoff
+        self.sidecar_socket = sidecar_socket
+        
+        self.client = httpx.AsyncClient(
+            base_url=self.api_base,
+            timeout=httpx.Timeout(timeout),
+            limits=httpx.Limits(max_connections=100, max_keepalive_connections=40, keepalive_expiry=30),
+            headers={
+                "Authorization": f"Bearer {api_key}",
+                "Content-Type": "application/json",
+                "User-Agent": "LLM-Trading-Bot/1.0"
+            }
+        )
+    
+    async def chat_completion(
+        self,
+        messages: List[ChatMessage],
+        model: str = "gpt-4o-mini",
+        **kwargs
+    ) -> ChatResponse:
+        """
+        Send chat completion request to OpenAI API
+        
+        Args:
+            messages: List of chat messages
+            model: Model to use (default: gpt-4o-mini)
+            **kwargs: Additional parameters for the API
+            
+        Returns:
+            ChatResponse object with the completion
+            
+        Raises:
+            httpx.HTTPError: For transport errors
+            ValueError: For API errors or invalid responses
+        """
+        payload = {
+            "model": model,
+            "messages": [{"role": msg.role, "content": msg.content} for msg in messages],
+            **kwargs
+        }
+        
+        logger.debug("Sending async chat completion request: model=%s, messages=%d", model, len(messages))
+        
+        # Hand off to the sidecar when running, it keeps TLS connections warm between runs
+        response = await self._try_sidecar(payload)
+        if response is not None:
+            return response
+        
+        for attempt in range(self.retries + 1):
+            start_time = time.time()
+            response = await self.client.post("/chat/completions", content=dumps_json(payload))
+            elapsed = time.time() - start_time
+            
+            logger.debug("OpenAI API response: status=%s, elapsed=%.2fs", response.status_code, elapsed)
+            
+            if response.status_code in self._RETRY_STATUSES and attempt < self.retries:
+                await asyncio.sleep(self._retry_delay(response, attempt))
+                continue
+            
+            if response.is_error:
+                raise self._api_error(response)
+            
+            try:
+                data = response.json()
+            except json.JSONDecodeError as e:
+                logger.error(f"Invalid JSON response from OpenAI API: {e}")
+                raise ValueError(f"Invalid JSON response: {e}")
+            
+            if "choices" not in data or not data["choices"]:
+                raise ValueError("Invalid OpenAI API response: missing choices")
+            
+            choice = data["choices"][0]
+            if "message" not in choice or "content" not in choice["message"]:
+                raise ValueError("Invalid OpenAI API response: missing message content")
+            
+            return ChatResponse(
+                content=choice["message"]["content"],
+                model=data.get("model", model),
+                usage=data.get("usage", {}),
+                finish_reason=choice.get("finish_reason", "unknown")
+            )
+        
+        raise ValueError("OpenAI API retries exhausted")
+    
+    async def chat_completion_stream(
+        self,
+        messages: List[ChatMessage],
+        model: str = "gpt-4o-mini",
+        stop_when: Optional[Callable[[str], bool]] = None,
+        **kwargs
+    ) -> ChatResponse:
+        """
+        Stream a chat completion, optionally closing the response early
+        
+        Args:
+            messages: List of chat messages
+            model: Model to use (default: gpt-4o-mini)
+            stop_when: Called with each content delta; returning True closes
+                the stream so the model stops decoding (finish_reason "early_stop")
+            **kwargs: Additional parameters for the API
+            
+        Returns:
+            ChatResponse with the content received so far (usage is not reported)
+        """
+        payload = {
+            "model": model,
+            "messages": [{"role": msg.role, "content": msg.content} for msg in messages],
+            "stream": True,
+            **kwargs
+        }
+        
+        logger.debug("Sending streamed chat completion request: model=%s, messages=%d", model, len(messages))
+        
+        # The sidecar protocol is not streamed: it returns the whole completion
+        # and stop_when is not applied, which still beats a fresh TLS handshake
+        response = await self._try_sidecar({k: v for k, v in payload.items() if k != "stream"})
+        if response is not None:
+            return response
+        
+        for attempt in range(self.retries + 1):
+            async with self.client.stream("POST", "/chat/completions", content=dumps_json(payload)) as response:
+                if response.status_code in self._RETRY_STATUSES and attempt < self.retries:
+                    delay = self._retry_delay(response, attempt)
+                else:
+                    if response.is_error:
+                        await response.aread()
+                        raise self._api_error(response)
+                    
+                    parts = []
+                    response_model = model
+                    finish_reason = "unknown"
+                    async for line in response.aiter_lines():
+                        if not line.startswith("data: "):
+                            continue
+                        if line == "data: [DONE]":
+                            break
+                        
+                        chunk = json.loads(line[6:])
+                        response_model = chunk.get("model", response_model)
+                        if not chunk.get("choices"):
+                            continue
+                        
+                        choice = chunk["choices"][0]
+                        delta = (choice.get("delta") or {}).get("content") or ""
+                        parts.append(delta)
+                        finish_reason = choice.get("finish_reason") or finish_reason
+                        
+                        if delta and stop_when and stop_when(delta):
+                            finish_reason = "early_stop"
+                            break
+                    
+                    # Leaving the stream context closes the connection on an early stop
+                    return ChatResponse(
+                        content="".join(parts),
+                        model=response_model,
+                        usage={},
+                        finish_reason=finish_reason
+                    )
+            
+            await asyncio.sleep(delay)
+        
+        raise ValueError("OpenAI API retries exhausted")
+    
+    async def _try_sidecar(self, payload: Dict[str, Any]) -> Optional[ChatResponse]:
+        """Completion from the sidecar, or None when it isn't running or fails to answer"""
+        if not self.sidecar_socket or not _sidecar_trusted(self.sidecar_socket):
+            return None
+        try:
+            return await asyncio.wait_for(self._chat_completion_via_sidecar(payload), timeout=self.timeout)
+        except (OSError, asyncio.IncompleteReadError) as e:
+            logger.warning("OpenAI sidecar unavailable, using direct HTTPS: %s", e)
+            return None
+    
+    async def _chat_completion_via_sidecar(self, payload: Dict[str, Any]) -> ChatResponse:
+        """Send a chat completion payload over the sidecar's length-prefixed JSON protocol"""
+        body = dumps_json(payload)
+        
+        start_time = time.time()
+        reader, writer = await asyncio.open_unix_connection(self.sidecar_socket)
+        try:
+            writer.write(struct.pack(">I", len(body)) + body)
+            await writer.drain()
+            size = struct.unpack(">I", await reader.readexactly(4))[0]
+            data = json.loads(await reader.readexactly(size))
+        finally:
+            writer.close()
+        
+        logger.debug("OpenAI sidecar response: elapsed=%.2fs", time.time() - start_time)
+        
+        return _sidecar_response(data, payload["model"])
+    
+    def _retry_delay(self, response: httpx.Response, attempt: int) -> float:
+        retry_after = response.headers.get("Retry-After")
+        delay = float(retry_after) if retry_after and retry_after.isdigit() else self.backoff * (2 ** attempt)
+        logger.warning(f"OpenAI API returned {response.status_code}, retrying in {delay:.1f}s")
+        return delay
+    
+    def _api_error(self, response: httpx.Response) -> ValueError:
+        try:
+            error_msg = response.json().get('error', {}).get('message', response.text)
+        except (json.JSONDecodeError, AttributeError):
+            error_msg = response.text
+        logger.error(f"OpenAI API HTTP error: {response.status_code}")
+        return ValueError(f"OpenAI API error: {error_msg}")
+    
+    async def warm_up(self):
+        """Open a pooled API connection ahead of the first completion"""
+        try:
+            await self.client.get("/models", timeout=5)
+        except httpx.HTTPError as e:
+            logger.debug("OpenAI warm-up request failed: %s", e)
+    
+    async def aclose(self):
+        """Close the HTTP client"""
+        await self.client.aclose()
+    
+    async def __aenter__(self):
+        return self
+    
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.aclose()
+
 # Convenience function for creating system prompts
 def create_system_prompt(role: str, context: str = "") -> ChatMessage:
     """Create a system message with predefined role and context"""
@@ -4,7 +4,8 @@ import asyncio
 import logging
 import time
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Any
+from typing import AsyncIterator, Dict, List, Optional, Any
+import httpx
 import requests
 from concurrent.futures import ThreadPoolExecutor, as_completed
 
@@ -12,6 +13,7 @@ from .data_types import (
     ForexQuote, TechnicalAnalysis, NewsEvent, MarketData,
     NewsImportance, extract_currencies_from_symbol
 )
+from .redis_cache import RedisCache
 
 logger = logging.getLogger(__name__)
 
@@ -23,12 +25,14 @@ class OptimizedMarketDataService:
         base_url: str = "http://127.0.0.1:5000",
         timeout: int = 15,  # Reduced timeout
         retries: int = 1,   # Reduced retries
-        max_workers: int = 3  # Parallel requests
+        max_workers: int = 3,  # Parallel requests
+        redis_cache: Optional[RedisCache] = None  # Shared cross-process cache
     ):
         self.base_url = base_url.rstrip('/')
         self.timeout = timeout
         self.retries = retries
         self.max_workers = max_workers
+        self.redis_cache = redis_cache
         
         # Setup session
         self.session = requests.Session()
@@ -38,24 +42,73 @@ class OptimizedMarketDataService:
         self._cache: Dict[str, Dict[str, Any]] = {}
         self._cache_ttl = 180  # 3 minutes cache
         
+        # Single-flight: identical async requests already on the wire, by cache key
+        self._inflight: Dict[str, asyncio.Future] = {}
+        
+    def _get_local(self, cache_key: str) -> Optional[Dict[str, Any]]:
+        """Look up a response in the in-process cache"""
+        if cache_key in self._cache:
+            cached_data = self._cache[cache_key]
+            if time.time() - cached_data['timestamp'] < self._cache_ttl:
+                logger.debug("Using cached data for %s", cache_key)
+                return cached_data['data']
+        return None
+    
+    def _get_shared(self, cache_key: str) -> Optional[Dict[str, Any]]:
+        """Look up a response in the shared cache (blocking Redis call)"""
+        data = self.redis_cache.get_json(f"md:{cache_key}")
+        if data is not None:
+            logger.debug("Using Redis cached data for %s", cache_key)
+            self._cache[cache_key] = {'data': data, 'timestamp': time.time()}
+        return data
+    
+    def _get_cached(self, cache_key: str) -> Optional[Dict[str, Any]]:
+        """Look up a response in the in-process cache, then the shared cache"""
+        data = self._get_local(cache_key)
+        if data is None and self.redis_cache:
+            data = self._get_shared(cache_key)
+        return data
+    
+    async def _get_cached_async(self, cache_key: str) -> Optional[Dict[str, Any]]:
+        """_get_cached for the event loop: Redis is queried on a worker thread"""
+        data = self._get_local(cache_key)
+        if data is None and self.redis_cache:
+            data = await asyncio.to_thread(self._get_shared, cache_key)
+        return data
+    
+    def _store_local(self, cache_key: str, data: Dict[str, Any]):
+        self._cache[cache_key] = {
+            'data': data,
+            'timestamp': time.time()
+        }
+    
+    def _store_cached(self, cache_key: str, data: Dict[str, Any]):
+        """Cache a response in-process and in the shared cache"""
+        self._store_local(cache_key, data)
+        if self.redis_cache:
+            self.redis_cache.set_json(f"md:{cache_key}", data, self._cache_ttl)
+    
+    async def _store_cached_async(self, cache_key: str, data: Dict[str, Any]):
+        """_store_cached for the event loop: Redis is written on a worker thread"""
+        self._store_local(cache_key, data)
+        if self.redis_cache:
+            await asyncio.to_thread(self.redis_cache.set_json, f"md:{cache_key}", data, self._cache_ttl)
+    
     def _make_request(self, endpoint: str, params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """Make HTTP request with reduced timeout and retries"""
         
         # Create cache key
         cache_key = f"{endpoint}:{str(sorted((params or {}).items()))}"
         
-        # Check cache
-        if cache_key in self._cache:
-            cached_data = self._cache[cache_key]
-            if time.time() - cached_data['timestamp'] < self._cache_ttl:
-                logger.debug(f"Using cached data for {endpoint}")
-                return cached_data['data']
+        cached = self._get_cached(cache_key)
+        if cached is not None:
+            return cached
         
         url = f"{self.base_url}{endpoint}"
         
         for attempt in range(self.retries + 1):
             try:
-                logger.debug(f"Request attempt {attempt + 1} to {url}")
+                logger.debug("Request attempt %d to %s", attempt + 1, url)
                 response = self.session.get(url, params=params, timeout=self.timeout)
                 response.raise_for_status()
                 
@@ -66,10 +119,7 @@ class OptimizedMarketDataService:
                     raise ValueError(f"API error: {error_msg}")
                 
                 # Cache the response
-                self._cache[cache_key] = {
-                    'data': data,
-                    'timestamp': time.time()
-                }
+                self._store_cached(cache_key, data)
                 
                 return data
                 
@@ -82,6 +132,118 @@ class OptimizedMarketDataService:
         
         raise Exception("Should not reach here")
     
+    async def _make_request_async(
+        self,
+        client: httpx.AsyncClient,
+        endpoint: str,
+        params: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        """Async counterpart of _make_request sharing the same caches"""
+        
+        cache_key = f"{endpoint}:{str(sorted((params or {}).items()))}"
+        
+        cached = await self._get_cached_async(cache_key)
+        if cached is not None:
+            return cached
+        
+        # Join an identical request that is already in flight
+        inflight = self._inflight.get(cache_key)
+        if inflight is not None:
+            return await asyncio.shield(inflight)
+        
+        future = asyncio.get_running_loop().create_future()
+        future.add_done_callback(lambda f: f.cancelled() or f.exception())  # No "never retrieved" warnings
+        self._inflight[cache_key] = future
+        try:
+            data = await self._fetch_async(client, endpoint, params, cache_key)
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(data)
+            return data
+        finally:
+            del self._inflight[cache_key]
+    
+    async def _fetch_async(
+        self,
+        client: httpx.AsyncClient,
+        endpoint: str,
+        params: Optional[Dict[str, Any]],
+        cache_key: str
+    ) -> Dict[str, Any]:
+        for attempt in range(self.retries + 1):
+            try:
+                logger.debug("Async request attempt %d to %s", attempt + 1, endpoint)
+                response = await client.get(endpoint, params=params)
+                response.raise_for_status()
+                
+                data = response.json()
+                
+                if not data.get('ok'):
+                    error_msg = data.get('error', 'Unknown API error')
+                    raise ValueError(f"API error: {error_msg}")
+                
+                await self._store_cached_async(cache_key, data)
+                
+                return data
+                
+            except (httpx.HTTPError, ValueError) as e:
+                if attempt == self.retries:
+                    logger.error(f"Request failed after {self.retries + 1} attempts: {e}")
+                    raise
+                logger.warning(f"Request attempt {attempt + 1} failed, retrying: {e}")
+                await asyncio.sleep(0.5)  # Short delay between retries
+        
+        raise Exception("Should not reach here")
+    
+    @staticmethod
+    def _parse_quotes(data: Dict[str, Any]) -> List[ForexQuote]:
+        """Parse a forex quote API response"""
+        quotes = []
+        
+        for item in data.get('data', []):
+            try:
+                quote = ForexQuote.from_api_response(item)
+                quotes.append(quote)
+            except Exception as e:
+                logger.warning(f"Failed to parse forex quote: {e}")
+                continue
+        
+        logger.info(f"Fetched {len(quotes)} forex quotes")
+        return quotes
+    
+    @staticmethod
+    def _parse_news(data: Dict[str, Any]) -> List[NewsEvent]:
+        """Parse a news list API response"""
+        news_events = []
+        
+        for item in data.get('data', []):
+            try:
+                news_event = NewsEvent.from_api_response(item)
+                news_events.append(news_event)
+            except Exception as e:
+                logger.warning(f"Failed to parse news event: {e}")
+                continue
+        
+        logger.info(f"Fetched {len(news_events)} news events (fast)")
+        return news_events
+    
+    @staticmethod
+    def _news_params(hours_back: int, min_importance: int, limit: int) -> Dict[str, str]:
+        end_time = datetime.now()
+        start_time = end_time - timedelta(hours=hours_back)
+        
+        return {
+            'from_ts': str(int(start_time.timestamp())),
+            'to_ts': str(int(end_time.timestamp())),
+            'min_importance': str(min_importance),
+            'limit': str(limit)
+        }
+    
     def get_forex_quotes(self, symbols: Optional[List[str]] = None) -> List[ForexQuote]:
         """Fetch forex quotes (fast)"""
         
@@ -91,18 +253,7 @@ class OptimizedMarketDataService:
         
         try:
             data = self._make_request('/api/v1/forex/quote', params)
-            quotes = []
-            
-            for item in data.get('data', []):
-                try:
-                    quote = ForexQuote.from_api_response(item)
-                    quotes.append(quote)
-                except Exception as e:
-                    logger.warning(f"Failed to parse forex quote: {e}")
-                    continue
-            
-            logger.info(f"Fetched {len(quotes)} forex quotes")
-            return quotes
+            return self._parse_quotes(data)
             
         except Exception as e:
             logger.error(f"Failed to fetch forex quotes: {e}")
@@ -126,7 +277,7 @@ class OptimizedMarketDataService:
             data = self._make_request('/api/v1/technical/analysis', params)
             
             analysis = TechnicalAnalysis.from_api_response(symbol, data)
-            logger.debug(f"Fast TA for {symbol}: {analysis.pattern_count} patterns")
+            logger.debug("Fast TA for %s: %d patterns", symbol, analysis.pattern_count)
             
             return analysis
             
@@ -163,31 +314,12 @@ class OptimizedMarketDataService:
     ) -> List[NewsEvent]:
         """Fetch recent news with faster parameters"""
         
-        end_time = datetime.now()
-        start_time = end_time - timedelta(hours=hours_back)
-        
-        params = {
-            'from_ts': str(int(start_time.timestamp())),
-            'to_ts': str(int(end_time.timestamp())),
-            'min_importance': str(min_importance),
-            'limit': str(limit)
-        }
+        params = self._news_params(hours_back, min_importance, limit)
         
         try:
             # Skip news fetch trigger for speed
             data = self._make_request('/api/v1/news/list', params)
-            
-            news_events = []
-            for item in data.get('data', []):
-                try:
-                    news_event = NewsEvent.from_api_response(item)
-                    news_events.append(news_event)
-                except Exception as e:
-                    logger.warning(f"Failed to parse news event: {e}")
-                    continue
-            
-            logger.info(f"Fetched {len(news_events)} news events (fast)")
-            return news_events
+            return self._parse_news(data)
             
         except Exception as e:
             logger.error(f"Failed to fetch news events: {e}")
@@ -227,7 +359,7 @@ class OptimizedMarketDataService:
         def fetch_technical_for_symbol(symbol: str) -> Optional[MarketData]:
             """Fetch technical analysis for one symbol"""
             try:
-                logger.debug(f"Fetching TA for {symbol}")
+                logger.debug("Fetching TA for %s", symbol)
                 
                 forex_quote = quotes_map.get(symbol)
                 technical_analysis = self.get_technical_analysis_fast(symbol, timeframe, analysis_days)
@@ -258,7 +390,7 @@ class OptimizedMarketDataService:
                     market_data = future.result(timeout=20)  # 20s timeout per symbol
                     if market_data:
                         market_data_list.append(market_data)
-                        logger.debug(f"Completed {symbol}")
+                        logger.debug("Completed %s", symbol)
                     else:
                         logger.warning(f"Failed {symbol}")
                 except Exception as e:
@@ -267,6 +399,125 @@ class OptimizedMarketDataService:
         logger.info(f"Successfully fetched market data for {len(market_data_list)} symbols")
         return market_data_list
     
+    async def _get_forex_quotes_async(self, client: httpx.AsyncClient, symbols: List[str]) -> List[ForexQuote]:
+        try:
+            data = await self._make_request_async(client, '/api/v1/forex/quote', {'symbols': ','.join(symbols)})
+            return self._parse_quotes(data)
+        except Exception as e:
+            logger.error(f"Failed to fetch forex quotes: {e}")
+            return []
+    
+    async def _get_recent_news_async(self, client: httpx.AsyncClient, hours_back: int) -> List[NewsEvent]:
+        try:
+            data = await self._make_request_async(
+                client, '/api/v1/news/list', self._news_params(hours_back, min_importance=2, limit=50)
+            )
+            return self._parse_news(data)
+        except Exception as e:
+            logger.error(f"Failed to fetch news events: {e}")
+            return []
+    
+    async def _get_technical_analysis_async(
+        self,
+        client: httpx.AsyncClient,
+        symbol: str,
+        timeframe: str,
+        days: int
+    ) -> Optional[TechnicalAnalysis]:
+        params = {
+            'symbol': symbol,
+            'resolution': timeframe,
+            'days': str(days)
+        }
+        
+        try:
+            data = await self._make_request_async(client, '/api/v1/technical/analysis', params)
+            analysis = TechnicalAnalysis.from_api_response(symbol, data)
+            logger.debug("Fast TA for %s: %d patterns", symbol, analysis.pattern_count)
+            return analysis
+            
+        except Exception as e:
+            logger.warning(f"Fast TA failed for {symbol}, trying basic: {e}")
+            
+            # Fallback: support/resistance only, same as the sync path
+            try:
+                await self._make_request_async(client, '/api/v1/technical/support-resistance', params)
+                return TechnicalAnalysis(
+                    symbol=symbol,
+                    timeframe=timeframe,
+                    support_levels=[],
+                    resistance_levels=[],
+                    patterns=[],
+                    timestamp=datetime.now()
+                )
+            except Exception as e2:
+                logger.error(f"Fallback TA also failed for {symbol}: {e2}")
+                return None
+    
+    async def iter_market_data_async(
+        self, 
+        symbols: List[str], 
+        timeframe: str = "15",
+        analysis_days: int = 7,  # Reduced days
+        news_hours: int = 12     # Reduced hours
+    ) -> AsyncIterator[MarketData]:
+        """Yield market data per symbol as soon as its technical analysis arrives"""
+        
+        logger.info(f"Fetching market data for {len(symbols)} symbols (async)")
+        
+        async with httpx.AsyncClient(
+            base_url=self.base_url,
+            timeout=httpx.Timeout(self.timeout),
+            limits=httpx.Limits(max_connections=100, max_keepalive_connections=40, keepalive_expiry=30)
+        ) as client:
+            # Quotes, shared news and per-symbol TA are independent requests
+            shared = asyncio.gather(
+                self._get_forex_quotes_async(client, symbols),
+                self._get_recent_news_async(client, news_hours)
+            )
+            
+            async def fetch_technical(symbol: str):
+                return symbol, await self._get_technical_analysis_async(client, symbol, timeframe, analysis_days)
+            
+            pending = [asyncio.ensure_future(fetch_technical(s)) for s in symbols]
+            
+            try:
+                quotes, all_news = await shared
+                quotes_map = {quote.symbol: quote for quote in quotes}
+                logger.info(f"Got quotes for {len(quotes_map)} symbols, {len(all_news)} news events")
+                
+                for next_done in asyncio.as_completed(pending):
+                    symbol, technical_analysis = await next_done
+                    yield MarketData(
+                        symbol=symbol,
+                        forex_quote=quotes_map.get(symbol),
+                        technical_analysis=technical_analysis,
+                        related_news=self.get_symbol_related_news(symbol, all_news),
+                        timestamp=datetime.now()
+                    )
+            finally:
+                # Consumer stopped early or failed: don't leave requests on a closed client
+                for task in pending:
+                    task.cancel()
+    
+    async def get_market_data_parallel_async(
+        self, 
+        symbols: List[str], 
+        timeframe: str = "15",
+        analysis_days: int = 7,  # Reduced days
+        news_hours: int = 12     # Reduced hours
+    ) -> List[MarketData]:
+        """Fetch market data concurrently on the event loop over one pooled client"""
+        
+        by_symbol = {
+            md.symbol: md
+            async for md in self.iter_market_data_async(symbols, timeframe, analysis_days, news_hours)
+        }
+        market_data_list = [by_symbol[s] for s in symbols if s in by_symbol]
+        
+        logger.info(f"Successfully fetched market data for {len(market_data_list)} symbols")
+        return market_data_list
+    
     def get_symbol_related_news(
         self, 
         symbol: str, 
@@ -0,0 +1,143 @@
+from __future__ import annotations
+
+import json
+import logging
+import time
+from datetime import datetime
+from typing import Dict, Any, List, Optional
+
+from .data_types import TradingSignal, SignalType, SignalStrength
+
+try:
+    import redis
+    REDIS_AVAILABLE = True
+except ImportError:
+    REDIS_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+class RedisCache:
+    """Redis-backed cache shared across LLM analysis processes
+    
+    Holds generated signals per (symbol, timeframe, bar bucket) and raw backend
+    API responses, so repeated runs inside one candle window skip both the
+    backend fetch and the ChatGPT call. Redis errors are logged and treated as
+    cache misses.
+    """
+    
+    def __init__(self, url: str, signal_ttl: int = 900):
+        if not REDIS_AVAILABLE:
+            raise ImportError("redis package is not installed")
+        
+        self.signal_ttl = signal_ttl
+        self.client = redis.Redis.from_url(
+            url,
+            decode_responses=True,
+            socket_timeout=1,
+            socket_connect_timeout=1
+        )
+    
+    def _signal_key(self, symbol: str, timeframe: str) -> str:
+        bucket = int(time.time() // self.signal_ttl)
+        return f"sig:{symbol}:{timeframe}:{bucket}"
+    
+    def get_signals(self, symbols: List[str], timeframe: str) -> Dict[str, TradingSignal]:
+        """Return cached signals for the current bar, keyed by symbol"""
+        
+        if not symbols:
+            return {}
+        
+        try:
+            values = self.client.mget([self._signal_key(s, timeframe) for s in symbols])
+        except redis.RedisError as e:
+            logger.warning(f"Redis signal lookup failed: {e}")
+            return {}
+        
+        cached = {}
+        for symbol, value in zip(symbols, values):
+            if value is None:
+                continue
+            try:
+                cached[symbol] = _signal_from_dict(json.loads(value))
+            except (json.JSONDecodeError, KeyError, ValueError) as e:
+                logger.warning(f"Discarding unreadable cached signal for {symbol}: {e}")
+        
+        return cached
+    
+    def set_signals(self, signals: List[TradingSignal], timeframe: str):
+        """Store signals for the current bar"""
+        
+        try:
+            pipe = self.client.pipeline()
+            for signal in signals:
+                pipe.setex(
+                    self._signal_key(signal.symbol, timeframe),
+                    self.signal_ttl,
+                    json.dumps(_signal_to_dict(signal))
+                )
+            pipe.execute()
+        except redis.RedisError as e:
+            logger.warning(f"Redis signal store failed: {e}")
+    
+    def get_json(self, key: str) -> Optional[Dict[str, Any]]:
+        """Return a cached JSON document, or None on miss"""
+        
+        try:
+            value = self.client.get(key)
+        except redis.RedisError as e:
+            logger.warning(f"Redis lookup failed for {key}: {e}")
+            return None
+        
+        if value is None:
+            return None
+        try:
+            return json.loads(value)
+        except (json.JSONDecodeError, TypeError) as e:
+            logger.warning(f"Discarding unreadable cached value for {key}: {e}")
+            return None
+    
+    def set_json(self, key: str, data: Dict[str, Any], ttl: int):
+        """Store a JSON document with a TTL in seconds"""
+        
+        try:
+            self.client.setex(key, ttl, json.dumps(data))
+        except (redis.RedisError, TypeError) as e:
+            logger.warning(f"Redis store failed for {key}: {e}")
+    
+    def close(self):
+        """Close the Redis connection pool"""
+        self.client.close()
+
+def _signal_to_dict(signal: TradingSignal) -> Dict[str, Any]:
+    return {
+        "symbol": signal.symbol,
+        "signal_type": signal.signal_type.value,
+        "strength": signal.strength.value,
+        "confidence": signal.confidence,
+        "entry_price": signal.entry_price,
+        "stop_loss": signal.stop_loss,
+        "take_profit": signal.take_profit,
+        "reasoning": signal.reasoning,
+        "key_factors": signal.key_factors,
+        "risks": signal.risks,
+        "timeframe": signal.timeframe,
+        "timestamp": signal.timestamp.isoformat() if signal.timestamp else None,
+        "expires_at": signal.expires_at.isoformat() if signal.expires_at else None
+    }
+
+def _signal_from_dict(data: Dict[str, Any]) -> TradingSignal:
+    return TradingSignal(
+        symbol=data["symbol"],
+        signal_type=SignalType(data["signal_type"]),
+        strength=SignalStrength(data["strength"]),
+        confidence=float(data["confidence"]),
+        entry_price=data.get("entry_price"),
+        stop_loss=data.get("stop_loss"),
+        take_profit=data.get("take_profit"),
+        reasoning=data.get("reasoning"),
+        key_factors=data.get("key_factors", []),
+        risks=data.get("risks", []),
+        timeframe=data.get("timeframe"),
+        timestamp=datetime.fromisoformat(data["timestamp"]) if data.get("timestamp") else None,
+        expires_at=datetime.fromisoformat(data["expires_at"]) if data.get("expires_at") else None
+    )
@@ -2,6 +2,7 @@ from __future__ import annotations
 
 import json
 import logging
+from dataclasses import replace
 from datetime import datetime, timedelta
 from typing import List, Optional, Dict, Any
 
@@ -252,9 +253,12 @@ IMPORTANT:
                     logger.info(f"Signal for {market_data.symbol} below confidence threshold "
                               f"({signal.confidence:.2f} < {self.confidence_threshold}), "
                               f"converting to HOLD")
-                    signal.signal_type = SignalType.HOLD
-                    signal.reasoning = (f"Low confidence ({signal.confidence:.2f}). " + 
-                                      (signal.reasoning or ""))
+                    signal = replace(
+                        signal,
+                        signal_type=SignalType.HOLD,
+                        reasoning=(f"Low confidence ({signal.confidence:.2f}). " + 
+                                   (signal.reasoning or ""))
+                    )
                 
                 logger.info(f"Generated {signal.signal_type.value} signal for {market_data.symbol} "
                           f"(confidence: {signal.confidence:.2f}, strength: {signal.strength.value})")
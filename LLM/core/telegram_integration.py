@@ -1,13 +1,33 @@
 from __future__ import annotations
 
+import asyncio
 import logging
-from typing import List, Optional, Dict, Any
+import time
+from itertools import islice
+from typing import List, Optional, Dict, Any, Tuple
 from datetime import datetime
 
 from .data_types import TradingSignal, MarketReport, SignalType, SignalStrength
 
+try:
+    from telegram import Bot
+    from telegram.request import HTTPXRequest
+    TELEGRAM_AVAILABLE = True
+except ImportError:
+    TELEGRAM_AVAILABLE = False
+
 logger = logging.getLogger(__name__)
 
+# Long-lived bots by token, so every sender in the process shares one keep-alive pool
+_BOT_SINGLETON: Dict[str, Bot] = {}
+
+_ACTIONABLE_TYPES = frozenset((SignalType.BUY, SignalType.SELL))
+
+# Static message fragments
+_EMPTY_SUMMARY = "📊 <b>LLM Trading Analysis</b>\n\n⏸️ No actionable signals generated.\nMarket conditions suggest holding positions."
+_SUMMARY_HEADER = "🤖 <b>LLM Trading Analysis Results</b>"
+_ERROR_TMPL = "❌ <b>LLM Analysis Error</b>\n\n🚨 {}\n\n<i>Please try again later or check the configuration.</i>"
+
 class TelegramFormatter:
     """Formats LLM trading analysis for Telegram messages"""
     
@@ -15,26 +35,9 @@ class TelegramFormatter:
     def format_signal(signal: TradingSignal) -> str:
         """Format a single trading signal for Telegram"""
         
-        # Signal type emoji
-        type_emoji = {
-            SignalType.BUY: "📈",
-            SignalType.SELL: "📉", 
-            SignalType.HOLD: "⏸️",
-            SignalType.CLOSE_LONG: "🔻",
-            SignalType.CLOSE_SHORT: "🔺"
-        }.get(signal.signal_type, "❓")
-        
-        # Strength emoji
-        strength_emoji = {
-            SignalStrength.WEAK: "🟡",
-            SignalStrength.MODERATE: "🟠",
-            SignalStrength.STRONG: "🔴", 
-            SignalStrength.VERY_STRONG: "🟣"
-        }.get(signal.strength, "⚪")
-        
         lines = [
-            f"{type_emoji} <b>{signal.symbol} - {signal.signal_type.value.upper()}</b>",
-            f"{strength_emoji} Strength: {signal.strength.value.upper()}",
+            f"{signal.type_emoji} <b>{signal.symbol} - {signal.signal_type.value.upper()}</b>",
+            f"{signal.strength_emoji} Strength: {signal.strength.value.upper()}",
             f"🎯 Confidence: {signal.confidence:.0%}"
         ]
         
@@ -53,13 +56,13 @@ class TelegramFormatter:
         # Add key factors
         if signal.key_factors:
             lines.append("\n<b>Key Factors:</b>")
-            for factor in signal.key_factors[:3]:  # Limit to 3 factors
+            for factor in islice(signal.key_factors, 3):  # Limit to 3 factors
                 lines.append(f"• {factor}")
         
         # Add risks
         if signal.risks:
             lines.append("\n<b>⚠️ Risks:</b>")
-            for risk in signal.risks[:2]:  # Limit to 2 risks
+            for risk in islice(signal.risks, 2):  # Limit to 2 risks
                 lines.append(f"• {risk}")
         
         return "\n".join(lines)
@@ -69,15 +72,22 @@ class TelegramFormatter:
         """Format multiple signals into a summary"""
         
         if not signals:
-            return "📊 <b>LLM Trading Analysis</b>\n\n⏸️ No actionable signals generated.\nMarket conditions suggest holding positions."
-        
-        # Group signals by type
-        buy_signals = [s for s in signals if s.signal_type == SignalType.BUY]
-        sell_signals = [s for s in signals if s.signal_type == SignalType.SELL] 
-        hold_signals = [s for s in signals if s.signal_type == SignalType.HOLD]
+            return _EMPTY_SUMMARY
+        
+        # Group signals by type in a single pass
+        grouped: Dict[SignalType, List[TradingSignal]] = {
+            SignalType.BUY: [], SignalType.SELL: [], SignalType.HOLD: []
+        }
+        for s in signals:
+            bucket = grouped.get(s.signal_type)
+            if bucket is not None:
+                bucket.append(s)
+        buy_signals = grouped[SignalType.BUY]
+        sell_signals = grouped[SignalType.SELL]
+        hold_signals = grouped[SignalType.HOLD]
         
         lines = [
-            "🤖 <b>LLM Trading Analysis Results</b>",
+            _SUMMARY_HEADER,
             f"⏰ {datetime.now().strftime('%Y-%m-%d %H:%M UTC')}",
             ""
         ]
@@ -96,22 +106,25 @@ class TelegramFormatter:
         # Buy signals
         if buy_signals:
             lines.append("📈 <b>BUY SIGNALS:</b>")
-            for signal in buy_signals[:3]:  # Limit to top 3
-                lines.append(f"• {signal.symbol} ({signal.confidence:.0%}) - {signal.strength.value}")
+            lines.append("\n".join(  # Limit to top 3
+                f"• {s.symbol} ({s.confidence:.0%}) - {s.strength.value}"
+                for s in islice(buy_signals, 3)
+            ))
             lines.append("")
         
         # Sell signals  
         if sell_signals:
             lines.append("📉 <b>SELL SIGNALS:</b>")
-            for signal in sell_signals[:3]:  # Limit to top 3
-                lines.append(f"• {signal.symbol} ({signal.confidence:.0%}) - {signal.strength.value}")
+            lines.append("\n".join(  # Limit to top 3
+                f"• {s.symbol} ({s.confidence:.0%}) - {s.strength.value}"
+                for s in islice(sell_signals, 3)
+            ))
             lines.append("")
         
         # Hold recommendations
         if hold_signals and len(hold_signals) <= 5:
             lines.append("⏸️ <b>HOLD RECOMMENDATIONS:</b>")
-            for signal in hold_signals:
-                lines.append(f"• {signal.symbol} ({signal.confidence:.0%})")
+            lines.append("\n".join(f"• {s.symbol} ({s.confidence:.0%})" for s in hold_signals))
         elif hold_signals:
             lines.append(f"⏸️ <b>HOLD RECOMMENDATIONS:</b> {len(hold_signals)} pairs")
         
@@ -168,7 +181,7 @@ class TelegramFormatter:
         
         # Trading signals count
         if report.trading_signals:
-            actionable = len([s for s in report.trading_signals if s.signal_type in [SignalType.BUY, SignalType.SELL]])
+            actionable = sum(1 for s in report.trading_signals if s.signal_type in _ACTIONABLE_TYPES)
             lines.extend([
                 "📊 <b>Trading Signals:</b>",
                 f"Total: {len(report.trading_signals)} | Actionable: {actionable}",
@@ -213,14 +226,43 @@ class TelegramFormatter:
     @staticmethod
     def format_error_message(error: str) -> str:
         """Format error message for Telegram"""
-        return f"❌ <b>LLM Analysis Error</b>\n\n🚨 {error}\n\n<i>Please try again later or check the configuration.</i>"
+        return _ERROR_TMPL.format(error)
+
+def get_shared_bot(token: str) -> Bot:
+    """Return the process-wide Bot for token, creating it on first use"""
+    bot = _BOT_SINGLETON.get(token)
+    if bot is not None:
+        return bot
+    
+    if not TELEGRAM_AVAILABLE:
+        raise ImportError("python-telegram-bot package is not installed")
+    
+    request_kwargs = dict(connection_pool_size=64, connect_timeout=10, read_timeout=30, write_timeout=30)
+    try:
+        request = HTTPXRequest(http_version="2", **request_kwargs)
+    except ImportError:
+        # HTTP/2 needs the h2 package (httpx[http2])
+        logger.warning("h2 not installed, Telegram bot falls back to HTTP/1.1")
+        request = HTTPXRequest(**request_kwargs)
+    
+    bot = _BOT_SINGLETON[token] = Bot(token=token, request=request)
+    return bot
+
+def register_shared_bot(bot: Bot):
+    """Make an existing bot (e.g. the Application's) the shared one for its token"""
+    _BOT_SINGLETON.setdefault(bot.token, bot)
 
 class TelegramNotifier:
     """Handles sending LLM analysis to Telegram"""
     
+    # Stay under Telegram's ~30 messages/s per bot
+    MAX_MESSAGES_PER_SECOND = 25
+    
     def __init__(self, telegram_bot_instance=None):
         self.bot = telegram_bot_instance
         self.formatter = TelegramFormatter()
+        self._rate_lock = asyncio.Lock()
+        self._next_send_at = 0.0
     
     async def send_analysis_results(
         self, 
@@ -236,71 +278,97 @@ class TelegramNotifier:
                 await self._send_message(chat_id, error_msg)
                 return False
             
-            # Send summary first
-            signals_data = results.get("signals", [])
-            signals = []
-            
-            # Convert dict signals back to TradingSignal objects for formatting
-            for signal_data in signals_data:
-                try:
-                    signal = TradingSignal(
-                        symbol=signal_data["symbol"],
-                        signal_type=SignalType(signal_data["type"]),
-                        strength=SignalStrength(signal_data["strength"]), 
-                        confidence=float(signal_data["confidence"]),
-                        entry_price=signal_data.get("entry_price"),
-                        stop_loss=signal_data.get("stop_loss"),
-                        take_profit=signal_data.get("take_profit"),
-                        reasoning=signal_data.get("reasoning"),
-                        key_factors=signal_data.get("key_factors", []),
-                        risks=signal_data.get("risks", [])
-                    )
-                    signals.append(signal)
-                except Exception as e:
-                    logger.warning(f"Failed to convert signal data: {e}")
-                    continue
+            messages = self.render_analysis(results, send_detailed)
             
-            # Send signals summary
-            summary_text = self.formatter.format_signals_summary(signals)
-            await self._send_message(chat_id, summary_text)
-            
-            # Send market report if available
-            report_data = results.get("report")
-            if report_data and report_data.get("content"):
-                try:
-                    # Create a simplified report object for formatting
-                    from ..core.data_types import MarketReport
-                    report = MarketReport(
-                        title=report_data.get("title", "Market Analysis"),
-                        summary=report_data.get("summary", ""),
-                        content=report_data.get("content", ""),
-                        market_bias=report_data.get("market_bias"),
-                        technical_summary=report_data.get("technical_summary"),
-                        news_summary=report_data.get("news_summary"),
-                        trading_signals=signals
-                    )
-                    
-                    report_text = self.formatter.format_market_report(report)
-                    await self._send_message(chat_id, report_text)
-                    
-                except Exception as e:
-                    logger.error(f"Failed to send market report: {e}")
-            
-            # Send detailed signals if requested and there are actionable ones
-            if send_detailed:
-                actionable_signals = [s for s in signals if s.signal_type in [SignalType.BUY, SignalType.SELL]]
+        except Exception as e:
+            logger.error(f"Failed to send analysis results to Telegram: {e}")
+            try:
+                error_msg = self.formatter.format_error_message(f"Failed to send results: {str(e)}")
+                await self._send_message(chat_id, error_msg)
+            except:
+                pass  # Don't fail on error message failure
+            return False
+        
+        return await self.send_rendered(chat_id, messages)
+    
+    def render_analysis(self, results: Dict[str, Any], send_detailed: bool = True) -> List[Tuple[str, bool]]:
+        """Render successful analysis results into ready-to-send (HTML, silent) messages
+        
+        The output does not depend on the chat, so a fan-out renders once and
+        passes the messages to send_rendered for every recipient. The stats
+        message stays separate and is sent without a notification.
+        """
+        
+        signals_data = results.get("signals", [])
+        signals = []
+        
+        # Convert dict signals back to TradingSignal objects for formatting
+        for signal_data in signals_data:
+            try:
+                signal = TradingSignal(
+                    symbol=signal_data["symbol"],
+                    signal_type=SignalType(signal_data["type"]),
+                    strength=SignalStrength(signal_data["strength"]), 
+                    confidence=float(signal_data["confidence"]),
+                    entry_price=signal_data.get("entry_price"),
+                    stop_loss=signal_data.get("stop_loss"),
+                    take_profit=signal_data.get("take_profit"),
+                    reasoning=signal_data.get("reasoning"),
+                    key_factors=signal_data.get("key_factors", []),
+                    risks=signal_data.get("risks", [])
+                )
+                signals.append(signal)
+            except Exception as e:
+                logger.warning(f"Failed to convert signal data: {e}")
+                continue
+        
+        # Signals summary
+        parts = [self.formatter.format_signals_summary(signals)]
+        
+        # Send market report if available
+        report_data = results.get("report")
+        if report_data and report_data.get("content"):
+            try:
+                # Create a simplified report object for formatting
+                from ..core.data_types import MarketReport
+                report = MarketReport(
+                    title=report_data.get("title", "Market Analysis"),
+                    summary=report_data.get("summary", ""),
+                    content=report_data.get("content", ""),
+                    market_bias=report_data.get("market_bias"),
+                    technical_summary=report_data.get("technical_summary"),
+                    news_summary=report_data.get("news_summary"),
+                    trading_signals=signals
+                )
                 
-                if actionable_signals:
-                    detail_header = "🎯 <b>Detailed Signal Analysis</b>\n"
-                    await self._send_message(chat_id, detail_header)
-                    
-                    for signal in actionable_signals[:3]:  # Limit to top 3 detailed
-                        signal_text = self.formatter.format_signal(signal)
-                        await self._send_message(chat_id, signal_text)
+                parts.append(self.formatter.format_market_report(report))
+                
+            except Exception as e:
+                logger.error(f"Failed to format market report: {e}")
+        
+        # Send detailed signals if requested and there are actionable ones
+        if send_detailed:
+            actionable_signals = [s for s in signals if s.signal_type in _ACTIONABLE_TYPES]
             
-            # Send analysis stats
-            stats_text = self._format_analysis_stats(results)
-            await self._send_message(chat_id, stats_text)
+            if actionable_signals:
+                # One part for header + top 3 signals; split below if too long
+                parts.append("🎯 <b>Detailed Signal Analysis</b>\n\n" + "\n\n―――\n\n".join(
+                    self.formatter.format_signal(s) for s in islice(actionable_signals, 3)
+                ))
+        
+        # Pack the parts into as few messages as fit, to spare the send rate limit
+        messages = [(message, False) for text in self._coalesce(parts) for message in self.formatter.split_long_message(text)]
+        
+        # Analysis stats go last, on their own and silently
+        messages.append((self._format_analysis_stats(results), True))
+        return messages
+    
+    async def send_rendered(self, chat_id: int, messages: List[Tuple[str, bool]]) -> bool:
+        """Send messages produced by render_analysis to one chat"""
+        
+        try:
+            for text, silent in messages:
+                await self._send_message(chat_id, text, disable_notification=silent)
             
             return True
             
@@ -313,6 +381,25 @@ class TelegramNotifier:
                 pass  # Don't fail on error message failure
             return False
     
+    @staticmethod
+    def _coalesce(chunks: List[str], max_length: int = 4000, separator: str = "\n\n") -> List[str]:
+        """Greedily pack consecutive message chunks into messages of up to max_length"""
+        packed = []
+        for chunk in chunks:
+            if packed and len(packed[-1]) + len(separator) + len(chunk) <= max_length:
+                packed[-1] += separator + chunk
+            else:
+                packed.append(chunk)
+        return packed
+    
+    async def _throttle(self):
+        """Space sends from this notifier to at most MAX_MESSAGES_PER_SECOND"""
+        async with self._rate_lock:
+            now = time.monotonic()
+            if self._next_send_at > now:
+                await asyncio.sleep(self._next_send_at - now)
+            self._next_send_at = max(now, self._next_send_at) + 1 / self.MAX_MESSAGES_PER_SECOND
+    
     def _format_analysis_stats(self, results: Dict[str, Any]) -> str:
         """Format analysis statistics"""
         
@@ -326,7 +413,22 @@ class TelegramNotifier:
             f"🤖 Powered by ChatGPT"
         )
     
-    async def _send_message(self, chat_id: int, text: str):
+    async def _send_with_flood_wait(self, **kwargs):
+        """bot.send_message, waiting out one Telegram flood-control (429) response"""
+        await self._throttle()
+        try:
+            return await self.bot.send_message(**kwargs)
+        except Exception as e:
+            # telegram.error.RetryAfter carries the server's wait time
+            retry_after = getattr(e, "retry_after", None)
+            if retry_after is None:
+                raise
+            delay = retry_after.total_seconds() if hasattr(retry_after, "total_seconds") else float(retry_after)
+            logger.warning(f"Telegram flood control for chat {kwargs.get('chat_id')}, retrying in {delay:.0f}s")
+            await asyncio.sleep(delay)
+            return await self.bot.send_message(**kwargs)
+    
+    async def _send_message(self, chat_id: int, text: str, disable_notification: bool = False):
         """Send a single message, handling long text splitting"""
         
         if not self.bot:
@@ -338,10 +440,12 @@ class TelegramNotifier:
         for message in messages:
             try:
                 # Use the bot's context to send message
-                await self.bot.send_message(
+                await self._send_with_flood_wait(
                     chat_id=chat_id,
                     text=message,
-                    parse_mode='HTML'
+                    parse_mode='HTML',
+                    disable_web_page_preview=True,
+                    disable_notification=disable_notification
                 )
             except Exception as e:
                 logger.error(f"Failed to send message to Telegram: {e}")
@@ -351,9 +455,11 @@ class TelegramNotifier:
                     clean_text = message.replace('<b>', '').replace('</b>', '')
                     clean_text = clean_text.replace('<i>', '').replace('</i>', '')
                     
-                    await self.bot.send_message(
+                    await self._send_with_flood_wait(
                         chat_id=chat_id,
-                        text=clean_text
+                        text=clean_text,
+                        disable_web_page_preview=True,
+                        disable_notification=disable_notification
                     )
                 except Exception as e2:
                     logger.error(f"Failed to send fallback message: {e2}")
@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+OpenAI Connection Sidecar
+
+Long-lived process that owns one pooled AsyncOpenAIHTTPClient, so TLS and
+keep-alive connections to the API survive between short CLI runs such as
+fast_main.py. OpenAIHTTPClient and AsyncOpenAIHTTPClient hand chat completions
+to it whenever the socket exists and is owned by the current user, and fall
+back to direct HTTPS otherwise. Streamed completions are answered whole.
+Only one sidecar may own the socket; a second instance refuses to start.
+
+Protocol (both directions): 4-byte big-endian length prefix + UTF-8 JSON
+    request:  {"model": ..., "messages": [{"role": ..., "content": ...}], ...}
+    response: {"ok": true, "content": ..., "model": ..., "usage": ..., "finish_reason": ...}
+              {"ok": false, "error": ...}
+
+Usage:
+    python -m LLM.daemon [--socket /tmp/llm_openai.sock]
+
+Example systemd --user unit (~/.config/systemd/user/llm-openai.service):
+
+    [Unit]
+    Description=LLM OpenAI connection sidecar
+
+    [Service]
+    WorkingDirectory=/path/to/TradeBot
+    EnvironmentFile=/path/to/TradeBot/.env
+    ExecStart=/usr/bin/python3 -m LLM.daemon
+    Restart=on-failure
+
+    [Install]
+    WantedBy=default.target
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import struct
+import sys
+from dataclasses import asdict
+from pathlib import Path
+
+# Add parent directory to path when run as a script
+if not __package__:
+    sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from LLM.logger import setup_logging, get_logger
+from LLM.config.settings import get_llm_settings
+from LLM.core.openai_client import AsyncOpenAIHTTPClient, ChatMessage, SIDECAR_SOCKET
+
+logger = get_logger(__name__)
+
+async def handle_connection(
+    reader: asyncio.StreamReader,
+    writer: asyncio.StreamWriter,
+    client: AsyncOpenAIHTTPClient
+):
+    """Serve length-prefixed chat completion requests until the peer disconnects"""
+    try:
+        while True:
+            try:
+                header = await reader.readexactly(4)
+                request = json.loads(await reader.readexactly(struct.unpack(">I", header)[0]))
+            except asyncio.IncompleteReadError:
+                break
+            
+            try:
+                messages = [ChatMessage(**m) for m in request.pop("messages")]
+                response = await client.chat_completion(messages=messages, **request)
+                reply = {"ok": True, **asdict(response)}
+            except Exception as e:
+                logger.error(f"Sidecar chat completion failed: {e}")
+                reply = {"ok": False, "error": str(e)}
+            
+            body = json.dumps(reply).encode("utf-8")
+            writer.write(struct.pack(">I", len(body)) + body)
+            await writer.drain()
+    except (ConnectionError, json.JSONDecodeError) as e:
+        logger.warning(f"Dropping sidecar connection: {e}")
+    finally:
+        writer.close()
+
+async def serve(socket_path: str):
+    """Run the sidecar until cancelled"""
+    settings = get_llm_settings()
+    if not settings.openai_api_key:
+        raise ValueError("OpenAI API key not found. Please set OPENAI_API_KEY environment variable.")
+    
+    # A live sidecar keeps its socket; only a stale one from a crashed run is removed
+    if os.path.exists(socket_path):
+        try:
+            _, probe = await asyncio.open_unix_connection(socket_path)
+        except OSError:
+            os.unlink(socket_path)
+        else:
+            probe.close()
+            raise RuntimeError(f"Another OpenAI sidecar is already listening on {socket_path}")
+    
+    async with AsyncOpenAIHTTPClient(
+        api_key=settings.openai_api_key,
+        api_base=settings.core.openai.api_base,
+        timeout=settings.core.openai.timeout,
+        retries=settings.core.openai.retries,
+        backoff=settings.core.openai.backoff,
+        sidecar_socket=None  # the sidecar itself always talks HTTPS
+    ) as client:
+        # Requests go out with our API key: bind the socket owner-only from the
+        # start, rather than chmod-ing it after it is already reachable
+        old_umask = os.umask(0o077)
+        try:
+            server = await asyncio.start_unix_server(
+                lambda r, w: handle_connection(r, w, client),
+                path=socket_path
+            )
+        finally:
+            os.umask(old_umask)
+        
+        logger.info(f"OpenAI sidecar listening on {socket_path}")
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            if os.path.exists(socket_path):
+                os.unlink(socket_path)
+
+def main():
+    """Main entry point"""
+    parser = argparse.ArgumentParser(description="OpenAI connection sidecar for LLM CLI runs")
+    parser.add_argument(
+        "--socket",
+        type=str,
+        default=SIDECAR_SOCKET,
+        help=f"Unix socket path (default: {SIDECAR_SOCKET})"
+    )
+    
+    args = parser.parse_args()
+    
+    settings = get_llm_settings()
+    setup_logging(
+        level=settings.core.log_level,
+        log_file=settings.core.log_file,
+        format_string="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+    )
+    
+    try:
+        asyncio.run(serve(args.socket))
+    except KeyboardInterrupt:
+        logger.info("OpenAI sidecar stopped")
+    except RuntimeError as e:
+        logger.error(str(e))
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
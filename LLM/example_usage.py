@@ -5,13 +5,14 @@ Example usage of the LLM Trading Analysis System
 This script demonstrates how to use the LLM trading system programmatically.
 """
 
+import asyncio
 import sys
 import os
 from pathlib import Path
 
-# Add project root to path
-project_root = Path(__file__).parent.parent
-sys.path.insert(0, str(project_root))
+# Add project root to path when run as a script
+if not __package__:
+    sys.path.insert(0, str(Path(__file__).parent.parent))
 
 # Try to load environment variables
 try:
@@ -23,7 +24,7 @@ except ImportError:
 from LLM import LLMTradingSystem, get_llm_settings
 from LLM.core.data_types import SignalType
 
-def basic_example():
+async def basic_example():
     """Basic usage example"""
     print("🤖 LLM Trading Analysis - Basic Example")
     print("=" * 50)
@@ -43,7 +44,7 @@ def basic_example():
         
         # Run analysis with default symbols
         print("📊 Running analysis with default symbols...")
-        results = system.run_analysis()
+        results = await asyncio.to_thread(system.run_analysis)
         
         # Print results
         system.print_results(results)
@@ -54,7 +55,7 @@ def basic_example():
         if system:
             system.cleanup()
 
-def custom_symbols_example():
+async def custom_symbols_example():
     """Example with custom symbols"""
     print("\n🎯 Custom Symbols Example")
     print("=" * 50)
@@ -73,7 +74,9 @@ def custom_symbols_example():
         custom_symbols = ["OANDA:EUR_USD", "OANDA:GBP_USD", "OANDA:XAU_USD"]
         
         print(f"📊 Analyzing custom symbols: {', '.join(custom_symbols)}")
-        results = system.run_analysis(symbols=custom_symbols, generate_report=True)
+        results = await asyncio.to_thread(
+            system.run_analysis, symbols=custom_symbols, generate_report=True
+        )
         
         if results['success']:
             print("\n✅ Analysis completed successfully!")
@@ -104,6 +107,7 @@ def configuration_example():
     
     print("Current Configuration:")
     print(f"  • OpenAI Model: {settings.core.openai.model}")
+    print(f"  • Signal Model: {settings.core.openai.signal_model}")
     print(f"  • Max Tokens: {settings.core.openai.max_tokens}")
     print(f"  • Temperature: {settings.core.openai.temperature}")
     print(f"  • Backend URL: {settings.backend_base_url}")
@@ -118,6 +122,11 @@ def configuration_example():
     print("  LLM_ANALYSIS_DAYS=60  # Look back 60 days instead of 30")
     print("  LLM_DEBUG=true  # Enable debug logging")
 
+async def _amain():
+    """Run the network-bound examples concurrently, then the configuration one"""
+    await asyncio.gather(basic_example(), custom_symbols_example())
+    configuration_example()
+
 def main():
     """Main example runner"""
     print("🚀 LLM Trading Analysis System - Examples")
@@ -141,9 +150,7 @@ def main():
     
     # Run examples
     try:
-        basic_example()
-        custom_symbols_example() 
-        configuration_example()
+        asyncio.run(_amain())
         
         print("\n🎉 Examples completed!")
         print("\nNext steps:")
@@ -6,27 +6,38 @@ Optimized version for sub-30 second analysis with parallel processing
 and reduced data fetching.
 
 Usage:
-    python LLM/fast_main.py [--symbols EUR_USD,GBP_USD]
+    python -m LLM.fast_main [--symbols EUR_USD,GBP_USD]
 """
 
 import argparse
+import asyncio
+import re
 import sys
 import time
+from datetime import datetime
 from pathlib import Path
-from typing import List, Optional
+from typing import TYPE_CHECKING, List, Optional, Tuple
 
-# Add parent directory to path for imports
-sys.path.insert(0, str(Path(__file__).parent.parent))
+# Add parent directory to path when run as a script
+if not __package__:
+    sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from LLM.logger import setup_logging, get_logger
 from LLM.config.settings import get_llm_settings
-from LLM.core.openai_client import OpenAIHTTPClient
-from LLM.core.optimized_data_service import OptimizedMarketDataService
-from LLM.core.fast_signal_generator import FastSignalGenerator
-from LLM.core.data_types import SignalType
+from LLM.core.openai_client import OpenAIHTTPClient, AsyncOpenAIHTTPClient, get_shared_session, dumps_json
+from LLM.core.data_types import SignalType, MarketData, TradingSignal, normalize_oanda_symbol
+
+if TYPE_CHECKING:
+    # Service modules are imported lazily in initialize_services
+    from LLM.core.optimized_data_service import OptimizedMarketDataService
+    from LLM.core.fast_signal_generator import FastSignalGenerator
+    from LLM.core.redis_cache import RedisCache
 
 logger = get_logger(__name__)
 
+# A normalize_oanda_symbol result that names a real currency pair
+_PAIR_RE = re.compile(r"^OANDA:[A-Z]{3}_[A-Z]{3}$")
+
 class FastLLMTradingSystem:
     """Fast LLM Trading Analysis System optimized for speed"""
     
@@ -36,8 +47,9 @@ class FastLLMTradingSystem:
         
         # Initialize components
         self.openai_client: Optional[OpenAIHTTPClient] = None
-        self.market_data_service: Optional[OptimizedMarketDataService] = None
-        self.signal_generator: Optional[FastSignalGenerator] = None
+        self.market_data_service: Optional["OptimizedMarketDataService"] = None
+        self.signal_generator: Optional["FastSignalGenerator"] = None
+        self.redis_cache: Optional["RedisCache"] = None
         
         logger.info("Fast LLM Trading System initialized")
     
@@ -51,6 +63,10 @@ class FastLLMTradingSystem:
     
     def initialize_services(self):
         """Initialize all services with fast parameters"""
+        from LLM.core.optimized_data_service import OptimizedMarketDataService
+        from LLM.core.fast_signal_generator import FastSignalGenerator
+        from LLM.core.redis_cache import RedisCache, REDIS_AVAILABLE
+        
         try:
             # Validate OpenAI API key
             if not self.settings.openai_api_key:
@@ -62,15 +78,25 @@ class FastLLMTradingSystem:
                 api_base=self.settings.core.openai.api_base,
                 timeout=20,  # Reduced timeout
                 retries=2,   # Reduced retries
-                backoff=0.5  # Faster backoff
+                backoff=0.5,  # Faster backoff
+                session=get_shared_session(retries=2, backoff=0.5)
             )
             
+            # Shared cache across runs (optional)
+            if REDIS_AVAILABLE and self.settings.redis_url:
+                try:
+                    self.redis_cache = RedisCache(self.settings.redis_url, signal_ttl=900)  # 15-minute bar
+                    logger.info("Redis cache enabled")
+                except Exception as e:
+                    logger.warning("Redis cache unavailable, continuing without it: %s", e)
+            
             # Initialize optimized market data service
             self.market_data_service = OptimizedMarketDataService(
                 base_url=self.settings.backend_base_url,
                 timeout=15,  # Reduced timeout
                 retries=1,   # Reduced retries 
-                max_workers=3  # Parallel requests
+                max_workers=3,  # Parallel requests
+                redis_cache=self.redis_cache
             )
             
             # Set shorter cache TTL for fresh data
@@ -79,25 +105,41 @@ class FastLLMTradingSystem:
             # Initialize fast signal generator
             self.signal_generator = FastSignalGenerator(
                 openai_client=self.openai_client,
-                model=self.settings.core.openai.model,
-                max_tokens=1000,  # Reduced tokens
+                model=self.settings.core.openai.signal_model,
+                max_tokens=350,  # Short JSON answers from the small signal model
                 temperature=0.2,  # Lower temperature for speed
-                confidence_threshold=self.settings.core.analysis.signal_confidence_threshold,
-                max_workers=3  # Parallel signal generation
+                confidence_threshold=self.settings.core.analysis.signal_confidence_threshold
             )
             
             logger.info("All fast services initialized successfully")
             
         except Exception as e:
-            logger.error(f"Failed to initialize fast services: {e}")
+            logger.error("Failed to initialize fast services: %s", e)
             raise
     
     def run_fast_analysis(
         self, 
         symbols: Optional[List[str]] = None,
-        max_symbols: int = 3  # Limit symbols for speed
+        max_symbols: int = 3,  # Limit symbols for speed
+        batch_mode: bool = False,
+        legacy_threads: bool = False
+    ) -> dict:
+        """Run fast market analysis optimized for speed (blocking wrapper)"""
+        return asyncio.run(self.run_fast_analysis_async(
+            symbols=symbols,
+            max_symbols=max_symbols,
+            batch_mode=batch_mode,
+            legacy_threads=legacy_threads
+        ))
+    
+    async def run_fast_analysis_async(
+        self, 
+        symbols: Optional[List[str]] = None,
+        max_symbols: int = 3,  # Limit symbols for speed
+        batch_mode: bool = False,  # Use the OpenAI Batch API (non-interactive runs)
+        legacy_threads: bool = False  # Fetch market data with the thread-pool service
     ) -> dict:
-        """Run fast market analysis optimized for speed"""
+        """Run fast market analysis, overlapping per-symbol OpenAI calls on the event loop"""
         
         if not symbols:
             symbols = self.settings.core.analysis.default_symbols
@@ -105,35 +147,56 @@ class FastLLMTradingSystem:
         # Limit symbols for speed
         if len(symbols) > max_symbols:
             symbols = symbols[:max_symbols]
-            logger.info(f"Limited to {max_symbols} symbols for speed: {symbols}")
+            logger.info("Limited to %d symbols for speed: %s", max_symbols, symbols)
         
-        logger.info(f"Starting FAST analysis for symbols: {symbols}")
+        logger.info("Starting FAST analysis for symbols: %s", symbols)
         start_time = time.time()
+        started_at = datetime.now()
         
         try:
-            # 1. Fetch market data in parallel (optimized)
-            logger.info("Step 1: Fetching market data (parallel)...")
-            market_data_list = self.market_data_service.get_market_data_parallel(
-                symbols=symbols,
-                timeframe="15",   # 15-minute timeframe
-                analysis_days=7,  # Reduced from 30 to 7 days
-                news_hours=12,    # Reduced from 24 to 12 hours
-                max_workers=3     # Parallel fetching
-            )
-            
-            if not market_data_list:
-                logger.error("No market data retrieved")
-                return {"success": False, "error": "No market data retrieved"}
+            # Signals cached for the current bar need neither data nor an LLM call
+            pending = symbols
+            cached_signals = {}
+            if self.redis_cache:
+                # redis-py blocks; keep it off the event loop
+                cached_signals = await asyncio.to_thread(self.redis_cache.get_signals, symbols, "15")
+                if cached_signals:
+                    logger.info("Using cached signals for %d symbols", len(cached_signals))
+                    pending = [s for s in symbols if s not in cached_signals]
             
-            logger.info(f"Retrieved market data for {len(market_data_list)} symbols")
+            market_data_list = []
+            signals = []
+            if pending:
+                async with self._async_openai_client() as async_client:
+                    # Open the API connection while the backend data is being fetched
+                    warm_up = asyncio.create_task(async_client.warm_up())
+                    try:
+                        market_data_list, signals = await self._generate_signals(
+                            pending, async_client, batch_mode, legacy_threads
+                        )
+                    finally:
+                        warm_up.cancel()
+                        await asyncio.gather(warm_up, return_exceptions=True)
+                
+                if not market_data_list:
+                    logger.error("No market data retrieved")
+                    return {"success": False, "error": "No market data retrieved"}
             
-            # 2. Generate trading signals in parallel
-            logger.info("Step 2: Generating trading signals (parallel)...")
-            signals = self.signal_generator.generate_signals_parallel(market_data_list)
+            if self.redis_cache and signals:
+                await asyncio.to_thread(self.redis_cache.set_signals, signals, "15")
+            if cached_signals:
+                signals = sorted(
+                    signals + list(cached_signals.values()),
+                    key=lambda s: (s.confidence, s.strength.value),
+                    reverse=True
+                )
             
             actionable_signals = self.signal_generator.filter_actionable_signals(signals)
             
-            logger.info(f"Generated {len(signals)} total signals, {len(actionable_signals)} actionable")
+            # Signals from the Redis or in-process caches predate this run
+            cached_count = sum(1 for s in signals if s.timestamp < started_at)
+            
+            logger.info("Generated %d total signals, %d actionable, %d cached", len(signals), len(actionable_signals), cached_count)
             
             # 3. Quick summary (no detailed report for speed)
             elapsed = time.time() - start_time
@@ -146,31 +209,122 @@ class FastLLMTradingSystem:
                 "market_data_count": len(market_data_list),
                 "total_signals": len(signals),
                 "actionable_signals": len(actionable_signals),
-                "signals": [
-                    {
-                        "symbol": s.symbol,
-                        "type": s.signal_type.value,
-                        "strength": s.strength.value,
-                        "confidence": f"{s.confidence:.2f}",
-                        "reasoning": s.reasoning,
-                        "entry_price": s.entry_price,
-                        "stop_loss": s.stop_loss,
-                        "take_profit": s.take_profit,
-                        "key_factors": s.key_factors,
-                        "risks": s.risks
-                    }
-                    for s in signals
-                ],
+                "cached_signals": cached_count,
+                "cache_hit": bool(signals) and cached_count == len(signals),
+                "signals": [s.to_result_dict() for s in signals],
                 "report": None  # Skip report for speed
             }
             
-            logger.info(f"FAST analysis completed successfully in {elapsed:.2f}s")
+            logger.info("FAST analysis completed successfully in %.2fs", elapsed)
             return results
             
         except Exception as e:
-            logger.error(f"Fast analysis failed: {e}")
+            logger.error("Fast analysis failed: %s", e)
             return {"success": False, "error": str(e)}
     
+    def _async_openai_client(self) -> AsyncOpenAIHTTPClient:
+        return AsyncOpenAIHTTPClient(
+            api_key=self.settings.openai_api_key,
+            api_base=self.settings.core.openai.api_base,
+            timeout=20,
+            retries=2,
+            backoff=0.5
+        )
+    
+    async def _fetch_market_data(self, symbols: List[str], legacy_threads: bool) -> List[MarketData]:
+        if legacy_threads:
+            logger.info("Step 1: Fetching market data (thread pool)...")
+            return await asyncio.to_thread(
+                self.market_data_service.get_market_data_parallel,
+                symbols=symbols,
+                timeframe="15",   # 15-minute timeframe
+                analysis_days=7,  # Reduced from 30 to 7 days
+                news_hours=12,    # Reduced from 24 to 12 hours
+                max_workers=3     # Parallel fetching
+            )
+        
+        logger.info("Step 1: Fetching market data (async)...")
+        return await self.market_data_service.get_market_data_parallel_async(
+            symbols=symbols,
+            timeframe="15",   # 15-minute timeframe
+            analysis_days=7,  # Reduced from 30 to 7 days
+            news_hours=12     # Reduced from 24 to 12 hours
+        )
+    
+    async def _generate_signals(
+        self,
+        symbols: List[str],
+        async_client: AsyncOpenAIHTTPClient,
+        batch_mode: bool,
+        legacy_threads: bool
+    ) -> Tuple[List[MarketData], List[TradingSignal]]:
+        if not (legacy_threads or batch_mode or len(symbols) <= 5):
+            logger.info("Steps 1-2: Fetching market data and generating signals (pipelined)...")
+            market_data_list, signals = await self._run_pipeline(symbols, async_client)
+            signals.sort(key=lambda s: (s.confidence, s.strength.value), reverse=True)
+            return market_data_list, signals
+        
+        # Bulk/batch prompts need every symbol's data up front
+        market_data_list = await self._fetch_market_data(symbols, legacy_threads)
+        if not market_data_list:
+            return [], []
+        
+        logger.info("Retrieved market data for %d symbols", len(market_data_list))
+        
+        if batch_mode and len(market_data_list) > 3:
+            logger.info("Step 2: Generating trading signals (batch API)...")
+            signals = await asyncio.to_thread(
+                self.signal_generator.generate_signals_batch, market_data_list
+            )
+        elif len(market_data_list) <= 5:
+            # Few symbols: one prompt amortizes the shared instructions
+            logger.info("Step 2: Generating trading signals (async)...")
+            signals = await self.signal_generator.generate_signals_bulk(market_data_list, async_client)
+        else:
+            logger.info("Step 2: Generating trading signals (async)...")
+            signals = await self.signal_generator.generate_signals_async(market_data_list, async_client)
+        
+        return market_data_list, signals
+    
+    async def _run_pipeline(
+        self,
+        symbols: List[str],
+        async_client: AsyncOpenAIHTTPClient,
+        consumers: int = 3
+    ) -> Tuple[List[MarketData], List[TradingSignal]]:
+        """Start each symbol's LLM call as soon as its market data arrives
+        
+        Wall time becomes max(fetch + llm) per symbol instead of the slowest
+        fetch plus the slowest LLM call.
+        """
+        
+        queue: asyncio.Queue = asyncio.Queue()
+        market_data_list: List[MarketData] = []
+        signals: List[TradingSignal] = []
+        
+        async def produce():
+            async for market_data in self.market_data_service.iter_market_data_async(
+                symbols, timeframe="15", analysis_days=7, news_hours=12
+            ):
+                market_data_list.append(market_data)
+                await queue.put(market_data)
+        
+        async def consume():
+            while (market_data := await queue.get()) is not None:
+                signal = await self.signal_generator.generate_signal_async(market_data, async_client)
+                if signal:
+                    signals.append(signal)
+        
+        workers = [asyncio.create_task(consume()) for _ in range(consumers)]
+        try:
+            await produce()
+        finally:
+            for _ in workers:
+                queue.put_nowait(None)
+            await asyncio.gather(*workers)
+        
+        return market_data_list, signals
+    
     def print_fast_results(self, results: dict):
         """Print fast analysis results"""
         
@@ -213,6 +367,8 @@ class FastLLMTradingSystem:
             self.openai_client.close()
         if self.market_data_service:
             self.market_data_service.close()
+        if self.redis_cache:
+            self.redis_cache.close()
 
 def main():
     """Main entry point"""
@@ -228,6 +384,21 @@ def main():
         default=3,
         help="Maximum number of symbols to analyze for speed (default: 3)"
     )
+    parser.add_argument(
+        "--batch-mode",
+        action="store_true",
+        help="Generate signals through the OpenAI Batch API (cheaper, may take minutes to hours)"
+    )
+    parser.add_argument(
+        "--legacy-threads",
+        action="store_true",
+        help="Fetch market data with the thread-pool implementation instead of asyncio"
+    )
+    parser.add_argument(
+        "--json-output",
+        action="store_true",
+        help="Write the raw results as JSON to stdout instead of the formatted summary"
+    )
     parser.add_argument(
         "--debug",
         action="store_true",
@@ -252,32 +423,37 @@ def main():
             logger.error("LLM Trading System is disabled in configuration")
             sys.exit(1)
         
-        # Initialize services
-        system.initialize_services()
-        
-        # Parse symbols
+        # Parse symbols into OANDA format, dropping malformed ones before any fetch
         symbols = None
         if args.symbols:
-            symbols = [s.strip() for s in args.symbols.split(",") if s.strip()]
-            # Convert to OANDA format
-            formatted_symbols = []
-            for symbol in symbols:
-                if not symbol.startswith("OANDA:"):
-                    if "_" in symbol:
-                        formatted_symbols.append(f"OANDA:{symbol}")
-                    elif len(symbol) == 6:
-                        formatted_symbols.append(f"OANDA:{symbol[:3]}_{symbol[3:]}")
-                    else:
-                        formatted_symbols.append(f"OANDA:{symbol}")
-                else:
-                    formatted_symbols.append(symbol)
-            symbols = formatted_symbols
+            raw = [s.strip() for s in args.symbols.split(",") if s.strip()]
+            normalized = {s: normalize_oanda_symbol(s) for s in raw}
+            # Drop aliases of the same pair (EURUSD, EUR/USD, EUR_USD, ...)
+            symbols = list(dict.fromkeys(n for n in normalized.values() if _PAIR_RE.match(n)))
+            invalid = [s for s, n in normalized.items() if not _PAIR_RE.match(n)]
+            if invalid:
+                logger.warning("Ignoring invalid symbols: %s", ', '.join(invalid))
+            if not symbols:
+                logger.error("No valid symbols given")
+                sys.exit(1)
+        
+        # Initialize services
+        system.initialize_services()
         
         # Run fast analysis
-        results = system.run_fast_analysis(symbols=symbols, max_symbols=args.max_symbols)
+        results = system.run_fast_analysis(
+            symbols=symbols,
+            max_symbols=args.max_symbols,
+            batch_mode=args.batch_mode,
+            legacy_threads=args.legacy_threads
+        )
         
         # Print results
-        system.print_fast_results(results)
+        if args.json_output:
+            sys.stdout.buffer.write(dumps_json(results, indent=True) + b"\n")
+            sys.stdout.flush()
+        else:
+            system.print_fast_results(results)
         
         # Exit with appropriate code
         sys.exit(0 if results.get("success") else 1)
@@ -286,7 +462,7 @@ def main():
         logger.info("Fast analysis interrupted by user")
         sys.exit(130)
     except Exception as e:
-        logger.error(f"Fast system error: {e}")
+        logger.error("Fast system error: %s", e)
         sys.exit(1)
     finally:
         if system:
@@ -1,11 +1,16 @@
 from __future__ import annotations
 
 import os
+import atexit
 import logging
 import logging.handlers
+import queue
 from pathlib import Path
 from typing import Optional
 
+# Background listener that performs the actual console/file writes
+_listener: Optional[logging.handlers.QueueListener] = None
+
 def setup_logging(
     level: str = "INFO",
     log_file: Optional[str] = None,
@@ -16,6 +21,9 @@ def setup_logging(
     """
     Setup logging configuration for the LLM Trading system
     
+    Records are handed to a queue on the calling thread; console and file
+    output happen on a background QueueListener thread.
+    
     Args:
         level: Logging level (DEBUG, INFO, WARNING, ERROR)
         log_file: Path to log file (optional)
@@ -33,6 +41,11 @@ def setup_logging(
     if format_string is None:
         format_string = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
     
+    global _listener
+    
+    # Stop a listener from a previous setup before replacing it
+    shutdown_logging()
+    
     # Configure root logger
     root_logger = logging.getLogger()
     root_logger.setLevel(getattr(logging, level.upper()))
@@ -46,7 +59,7 @@ def setup_logging(
     console_handler = logging.StreamHandler()
     console_handler.setFormatter(formatter)
     console_handler.setLevel(getattr(logging, level.upper()))
-    root_logger.addHandler(console_handler)
+    handlers = [console_handler]
     
     # File handler with rotation (if log file specified)
     if log_file:
@@ -57,12 +70,30 @@ def setup_logging(
         )
         file_handler.setFormatter(formatter)
         file_handler.setLevel(getattr(logging, level.upper()))
-        root_logger.addHandler(file_handler)
+        handlers.append(file_handler)
+    
+    # Only the non-blocking queue handler sits on the root logger
+    log_queue: queue.Queue = queue.Queue(-1)
+    root_logger.addHandler(logging.handlers.QueueHandler(log_queue))
+    _listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+    _listener.start()
     
     # Set specific loggers to avoid noise
     logging.getLogger("urllib3").setLevel(logging.WARNING)
     logging.getLogger("requests").setLevel(logging.WARNING)
 
+def shutdown_logging() -> None:
+    """Flush queued records and stop the background logging listener"""
+    global _listener
+    
+    if _listener is not None:
+        _listener.stop()
+        for handler in _listener.handlers:
+            handler.close()
+        _listener = None
+
+atexit.register(shutdown_logging)
+
 def get_logger(name: str) -> logging.Logger:
     """Get a logger instance for the given name"""
     return logging.getLogger(name)
@@ -11,7 +11,7 @@ It fetches data from TradeBot APIs, normalizes the data, and uses AI analysis to
 4. Provide actionable trading insights
 
 Usage:
-    python main.py [--symbols EUR_USD,GBP_USD] [--report-only] [--config path/to/config]
+    python -m LLM.main [--symbols EUR_USD,GBP_USD] [--report-only] [--config path/to/config]
 """
 
 import argparse
@@ -19,19 +19,23 @@ import asyncio
 import sys
 import time
 from pathlib import Path
-from typing import List, Optional
+from typing import TYPE_CHECKING, List, Optional
 
-# Add parent directory to path for imports
-sys.path.insert(0, str(Path(__file__).parent.parent))
+# Add parent directory to path when run as a script
+if not __package__:
+    sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from LLM.logger import setup_logging, get_logger
 from LLM.config.settings import get_llm_settings
-from LLM.core.openai_client import OpenAIHTTPClient
-from LLM.core.market_data_service import MarketDataService
-from LLM.core.signal_generator import SignalGenerator
-from LLM.core.market_reporter import MarketReporter
+from LLM.core.openai_client import OpenAIHTTPClient, get_shared_session
 from LLM.core.data_types import SignalType
 
+if TYPE_CHECKING:
+    # Heavy service modules are imported lazily in initialize_services
+    from LLM.core.market_data_service import MarketDataService
+    from LLM.core.signal_generator import SignalGenerator
+    from LLM.core.market_reporter import MarketReporter
+
 logger = get_logger(__name__)
 
 class LLMTradingSystem:
@@ -43,9 +47,9 @@ class LLMTradingSystem:
         
         # Initialize components
         self.openai_client: Optional[OpenAIHTTPClient] = None
-        self.market_data_service: Optional[MarketDataService] = None
-        self.signal_generator: Optional[SignalGenerator] = None
-        self.market_reporter: Optional[MarketReporter] = None
+        self.market_data_service: Optional["MarketDataService"] = None
+        self.signal_generator: Optional["SignalGenerator"] = None
+        self.market_reporter: Optional["MarketReporter"] = None
         
         logger.info("LLM Trading System initialized")
     
@@ -57,8 +61,11 @@ class LLMTradingSystem:
             format_string="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
         )
     
-    def initialize_services(self):
-        """Initialize all services"""
+    def initialize_services(self, with_reporter: bool = True):
+        """Initialize all services (the market reporter only when reports are wanted)"""
+        from LLM.core.market_data_service import MarketDataService
+        from LLM.core.signal_generator import SignalGenerator
+        
         try:
             # Validate OpenAI API key
             if not self.settings.openai_api_key:
@@ -70,7 +77,11 @@ class LLMTradingSystem:
                 api_base=self.settings.core.openai.api_base,
                 timeout=self.settings.core.openai.timeout,
                 retries=self.settings.core.openai.retries,
-                backoff=self.settings.core.openai.backoff
+                backoff=self.settings.core.openai.backoff,
+                session=get_shared_session(
+                    retries=self.settings.core.openai.retries,
+                    backoff=self.settings.core.openai.backoff
+                )
             )
             
             # Initialize market data service
@@ -87,26 +98,36 @@ class LLMTradingSystem:
             # Initialize signal generator
             self.signal_generator = SignalGenerator(
                 openai_client=self.openai_client,
-                model=self.settings.core.openai.model,
+                model=self.settings.core.openai.signal_model,
                 max_tokens=self.settings.core.openai.max_tokens,
                 temperature=self.settings.core.openai.temperature,
                 confidence_threshold=self.settings.core.analysis.signal_confidence_threshold
             )
             
             # Initialize market reporter
-            self.market_reporter = MarketReporter(
-                openai_client=self.openai_client,
-                model=self.settings.core.openai.model,
-                max_tokens=self.settings.core.openai.max_tokens + 500,  # More tokens for reports
-                temperature=self.settings.core.openai.temperature
-            )
+            if with_reporter:
+                self.initialize_market_reporter()
+            
+            # Overlap the API TLS handshake with the first market data fetch
+            self.openai_client.warm_up()
             
             logger.info("All services initialized successfully")
             
         except Exception as e:
-            logger.error(f"Failed to initialize services: {e}")
+            logger.error("Failed to initialize services: %s", e)
             raise
     
+    def initialize_market_reporter(self):
+        """Initialize the market reporter on first use"""
+        from LLM.core.market_reporter import MarketReporter
+        
+        self.market_reporter = MarketReporter(
+            openai_client=self.openai_client,
+            model=self.settings.core.openai.report_model or self.settings.core.openai.model,
+            max_tokens=self.settings.core.openai.max_tokens + 500,  # More tokens for reports
+            temperature=self.settings.core.openai.temperature
+        )
+    
     def run_analysis(
         self, 
         symbols: Optional[List[str]] = None,
@@ -117,7 +138,7 @@ class LLMTradingSystem:
         if not symbols:
             symbols = self.settings.core.analysis.default_symbols
         
-        logger.info(f"Starting market analysis for symbols: {symbols}")
+        logger.info("Starting market analysis for symbols: %s", symbols)
         start_time = time.time()
         
         try:
@@ -134,7 +155,7 @@ class LLMTradingSystem:
                 logger.error("No market data retrieved")
                 return {"success": False, "error": "No market data retrieved"}
             
-            logger.info(f"Retrieved market data for {len(market_data_list)} symbols")
+            logger.info("Retrieved market data for %d symbols", len(market_data_list))
             
             # 2. Generate trading signals
             logger.info("Step 2: Generating trading signals...")
@@ -142,16 +163,18 @@ class LLMTradingSystem:
             
             actionable_signals = self.signal_generator.filter_actionable_signals(signals)
             
-            logger.info(f"Generated {len(signals)} total signals, {len(actionable_signals)} actionable")
+            logger.info("Generated %d total signals, %d actionable", len(signals), len(actionable_signals))
             
             # 3. Generate market report (if requested)
             report = None
             if generate_report:
                 logger.info("Step 3: Generating market report...")
+                if self.market_reporter is None:
+                    self.initialize_market_reporter()
                 report = self.market_reporter.generate_market_report(market_data_list, signals)
                 
                 if report:
-                    logger.info(f"Generated market report: {report.title}")
+                    logger.info("Generated market report: %s", report.title)
                 else:
                     logger.warning("Failed to generate market report")
             
@@ -166,21 +189,7 @@ class LLMTradingSystem:
                 "market_data_count": len(market_data_list),
                 "total_signals": len(signals),
                 "actionable_signals": len(actionable_signals),
-                "signals": [
-                    {
-                        "symbol": s.symbol,
-                        "type": s.signal_type.value,
-                        "strength": s.strength.value,
-                        "confidence": f"{s.confidence:.2f}",
-                        "reasoning": s.reasoning,
-                        "entry_price": s.entry_price,
-                        "stop_loss": s.stop_loss,
-                        "take_profit": s.take_profit,
-                        "key_factors": s.key_factors,
-                        "risks": s.risks
-                    }
-                    for s in signals
-                ],
+                "signals": [s.to_result_dict() for s in signals],
                 "report": {
                     "title": report.title if report else None,
                     "summary": report.summary if report else None,
@@ -189,11 +198,11 @@ class LLMTradingSystem:
                 } if report else None
             }
             
-            logger.info(f"Analysis completed successfully in {elapsed:.2f}s")
+            logger.info("Analysis completed successfully in %.2fs", elapsed)
             return results
             
         except Exception as e:
-            logger.error(f"Analysis failed: {e}")
+            logger.error("Analysis failed: %s", e)
             return {"success": False, "error": str(e)}
     
     def print_results(self, results: dict):
@@ -289,7 +298,7 @@ def main():
             sys.exit(1)
         
         # Initialize services
-        system.initialize_services()
+        system.initialize_services(with_reporter=not args.no_report)
         
         # Parse symbols
         symbols = None
@@ -310,7 +319,7 @@ def main():
         logger.info("Analysis interrupted by user")
         sys.exit(130)
     except Exception as e:
-        logger.error(f"System error: {e}")
+        logger.error("System error: %s", e)
         sys.exit(1)
     finally:
         if system:
@@ -4,26 +4,37 @@ Quick test to validate the fast system is working
 """
 
 import sys
+from concurrent.futures import ThreadPoolExecutor, as_completed, TimeoutError as FuturesTimeoutError
 from pathlib import Path
+from typing import List
 
-# Add project root to path
-sys.path.insert(0, str(Path(__file__).parent.parent))
+import requests
+from requests.adapters import HTTPAdapter
 
-def test_openai_api():
+# Add project root to path when run as a script
+if not __package__:
+    sys.path.insert(0, str(Path(__file__).parent.parent))
+
+# One keep-alive pool for all TradeBot API probes
+_SESSION = requests.Session()
+_SESSION.mount("http://", HTTPAdapter(pool_connections=4, pool_maxsize=4))
+
+def test_openai_api(out: List[str]):
     """Test OpenAI API with correct parameters"""
     try:
         from LLM.config.settings import get_llm_settings
-        from LLM.core.openai_client import OpenAIHTTPClient, ChatMessage
+        from LLM.core.openai_client import OpenAIHTTPClient, ChatMessage, get_shared_session
         
         settings = get_llm_settings()
         if not settings.openai_api_key:
-            print("❌ No OpenAI API key configured")
+            out.append("❌ No OpenAI API key configured")
             return False
         
         client = OpenAIHTTPClient(
             api_key=settings.openai_api_key,
             timeout=20,
-            retries=1
+            retries=1,
+            session=get_shared_session(retries=1)
         )
         
         messages = [
@@ -31,36 +42,34 @@ def test_openai_api():
             ChatMessage(role="user", content="Say 'API test successful' in JSON format: {\"result\": \"API test successful\"}")
         ]
         
-        print("🧪 Testing OpenAI API...")
+        out.append("🧪 Testing OpenAI API...")
         response = client.chat_completion(
             messages=messages,
             model="gpt-4o-mini"
         )
         
-        print(f"✅ OpenAI API working: {response.content[:50]}...")
+        out.append(f"✅ OpenAI API working: {response.content[:50]}...")
         client.close()
         return True
         
     except Exception as e:
-        print(f"❌ OpenAI API test failed: {e}")
+        out.append(f"❌ OpenAI API test failed: {e}")
         return False
 
-def test_tradebot_api():
+def test_tradebot_api(out: List[str]):
     """Test TradeBot API endpoints"""
     try:
-        import requests
-        
-        print("🧪 Testing TradeBot API...")
+        out.append("🧪 Testing TradeBot API...")
         
         # Test health
-        response = requests.get("http://127.0.0.1:5000/health", timeout=5)
+        response = _SESSION.get("http://127.0.0.1:5000/health", timeout=5)
         if response.status_code == 200:
-            print("✅ TradeBot API health: OK")
+            out.append("✅ TradeBot API health: OK")
         else:
-            print(f"⚠️ TradeBot API health: {response.status_code}")
+            out.append(f"⚠️ TradeBot API health: {response.status_code}")
         
         # Test quotes (fast endpoint)
-        response = requests.get(
+        response = _SESSION.get(
             "http://127.0.0.1:5000/api/v1/forex/quote", 
             params={'names': 'EURUSD'},
             timeout=10
@@ -68,24 +77,24 @@ def test_tradebot_api():
         if response.status_code == 200:
             data = response.json()
             if data.get('ok') and data.get('data'):
-                print(f"✅ Forex quotes working: {len(data['data'])} quotes")
+                out.append(f"✅ Forex quotes working: {len(data['data'])} quotes")
             else:
-                print(f"⚠️ Forex quotes: {data}")
+                out.append(f"⚠️ Forex quotes: {data}")
         else:
-            print(f"❌ Forex quotes failed: {response.status_code}")
+            out.append(f"❌ Forex quotes failed: {response.status_code}")
         
         return True
         
     except Exception as e:
-        print(f"❌ TradeBot API test failed: {e}")
+        out.append(f"❌ TradeBot API test failed: {e}")
         return False
 
-def test_fast_system():
+def test_fast_system(out: List[str]):
     """Test the fast analysis system with minimal data"""
     try:
         from LLM.fast_main import FastLLMTradingSystem
         
-        print("🧪 Testing Fast LLM System...")
+        out.append("🧪 Testing Fast LLM System...")
         
         system = FastLLMTradingSystem()
         system.initialize_services()
@@ -97,21 +106,23 @@ def test_fast_system():
         )
         
         if results.get("success"):
-            print(f"✅ Fast analysis successful in {results.get('analysis_time')}")
-            print(f"   Signals: {results.get('total_signals')}")
+            out.append(f"✅ Fast analysis successful in {results.get('analysis_time')}")
+            out.append(f"   Signals: {results.get('total_signals')}")
             return True
         else:
-            print(f"❌ Fast analysis failed: {results.get('error')}")
+            out.append(f"❌ Fast analysis failed: {results.get('error')}")
             return False
             
     except Exception as e:
-        print(f"❌ Fast system test failed: {e}")
+        out.append(f"❌ Fast system test failed: {e}")
         return False
 
 def main():
     """Run all tests"""
-    print("🚀 Quick System Test")
-    print("=" * 30)
+    # Output is collected per test and written in one go, so concurrent
+    # probes don't interleave and the stream sees a handful of writes
+    lines = ["🚀 Quick System Test", "=" * 30]
+    sys.stdout.write("\n".join(lines) + "\n")
     
     tests = [
         ("TradeBot API", test_tradebot_api),
@@ -119,27 +130,52 @@ def main():
         ("Fast LLM System", test_fast_system)
     ]
     
-    passed = 0
-    for name, test_func in tests:
+    def run_test(name, test_func):
+        out: List[str] = []
         try:
-            print(f"\n🧪 {name}:")
-            if test_func():
-                passed += 1
-            else:
-                print(f"❌ {name} test failed")
+            return test_func(out), out
         except Exception as e:
-            print(f"❌ {name} test crashed: {e}")
+            sys.stderr.write(f"❌ {name} test crashed: {e}\n")
+            return False, out
     
-    print("\n" + "=" * 30)
-    print(f"📊 Results: {passed}/{len(tests)} tests passed")
+    # Probes are network-bound and independent: run them at once
+    results = {name: False for name, _ in tests}
+    executor = ThreadPoolExecutor(max_workers=len(tests))
+    futures = {executor.submit(run_test, name, test_func): name for name, test_func in tests}
+    try:
+        for future in as_completed(futures, timeout=90):
+            results[futures[future]], out = future.result()
+            if out:
+                sys.stdout.write("\n".join(out) + "\n")
+                sys.stdout.flush()
+    except FuturesTimeoutError:
+        for future, name in futures.items():
+            if not future.done():
+                sys.stderr.write(f"❌ {name} test timed out\n")
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+    
+    lines = [""]
+    passed = 0
+    for name, _ in tests:
+        if results[name]:
+            passed += 1
+        else:
+            lines.append(f"❌ {name} test failed")
+    
+    lines.append("\n" + "=" * 30)
+    lines.append(f"📊 Results: {passed}/{len(tests)} tests passed")
     
     if passed == len(tests):
-        print("🎉 All tests passed! System is ready.")
+        lines.append("🎉 All tests passed! System is ready.")
     else:
-        print("⚠️ Some tests failed. Check the issues above.")
+        lines.append("⚠️ Some tests failed. Check the issues above.")
+    
+    sys.stdout.write("\n".join(lines) + "\n")
+    sys.stdout.flush()
     
     return passed == len(tests)
 
 if __name__ == "__main__":
     success = main()
-    sys.exit(0 if success else 1)
+    sys.exit(0 if success else 1)
\ No newline at end of file
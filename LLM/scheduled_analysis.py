@@ -9,16 +9,21 @@ Can be run as a standalone script or integrated into your existing scheduler.
 import asyncio
 import logging
 import os
+import re
 import sys
+import time
 from pathlib import Path
 from typing import List, Optional
 
-# Add project root to path
-project_root = Path(__file__).parent.parent
-sys.path.insert(0, str(project_root))
+# Add project root to path when run as a script
+if not __package__:
+    sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from LLM.main import LLMTradingSystem
-from LLM.core.telegram_integration import TelegramNotifier
+from LLM.core.telegram_integration import TelegramNotifier, get_shared_bot
+from LLM.core.analysis_cache import analysis_cache
+from LLM.core.data_types import normalize_oanda_symbol
+from LLM.core.executors import LLM_EXECUTOR, shutdown_executor
 from LLM.config.settings import get_llm_settings
 
 # Telegram integration
@@ -30,6 +35,12 @@ except ImportError:
 
 logger = logging.getLogger(__name__)
 
+# Concurrent Telegram sends; fits within the shared bot's connection pool
+_SEND_CONCURRENCY = 8
+
+# Whole comma-separated Telegram chat IDs (negative for groups) in TELEGRAM_CHAT_IDS
+_CID_RE = re.compile(r"(?:^|,)\s*(-?\d+)\s*(?=,|$)")
+
 class ScheduledLLMAnalysis:
     """Handles scheduled LLM analysis and Telegram notifications"""
     
@@ -40,6 +51,9 @@ class ScheduledLLMAnalysis:
         self.notifier: Optional[TelegramNotifier] = None
         self.telegram_chat_ids: List[int] = []
         
+        # Shared across runs to stay under Telegram's global send rate
+        self._send_semaphore = asyncio.Semaphore(_SEND_CONCURRENCY)
+        
         # Setup logging
         from LLM.logger import setup_logging
         setup_logging(
@@ -60,6 +74,7 @@ class ScheduledLLMAnalysis:
             
             self.llm_system = LLMTradingSystem()
             self.llm_system.initialize_services()
+            analysis_cache.enable_redis(self.settings.redis_url)
             logger.info("LLM system initialized")
             
             # Initialize Telegram if available
@@ -67,18 +82,16 @@ class ScheduledLLMAnalysis:
             chat_ids_str = os.getenv("TELEGRAM_CHAT_IDS", "")
             
             if TELEGRAM_AVAILABLE and bot_token:
-                self.telegram_bot = Bot(token=bot_token)
+                # Reused across runs (and with the /llm command in the same process)
+                self.telegram_bot = get_shared_bot(bot_token)
                 
                 # Parse chat IDs
                 if chat_ids_str:
-                    try:
-                        self.telegram_chat_ids = [
-                            int(cid.strip()) for cid in chat_ids_str.split(",") 
-                            if cid.strip().replace('-', '').isdigit()
-                        ]
-                        logger.info(f"Telegram configured for {len(self.telegram_chat_ids)} chats")
-                    except ValueError as e:
-                        logger.warning(f"Invalid chat IDs format: {e}")
+                    self.telegram_chat_ids = list(map(int, _CID_RE.findall(chat_ids_str)))
+                    invalid = [c.strip() for c in chat_ids_str.split(",") if c.strip() and not _CID_RE.match(c)]
+                    if invalid:
+                        logger.warning("Ignoring invalid Telegram chat IDs: %s", ", ".join(invalid))
+                    logger.info(f"Telegram configured for {len(self.telegram_chat_ids)} chats")
                 
                 # Initialize notifier
                 if self.telegram_chat_ids:
@@ -110,10 +123,17 @@ class ScheduledLLMAnalysis:
                 logger.error("LLM system not initialized")
                 return False
             
-            # Run analysis with 15-minute timeframe
-            results = self.llm_system.run_analysis(
-                symbols=symbols,
-                generate_report=True
+            # The market report is only ever read from Telegram
+            need_report = bool(self.notifier and self.telegram_chat_ids)
+            if not need_report:
+                logger.info("No Telegram recipients configured, skipping market report generation")
+            
+            # Run analysis with 15-minute timeframe (reused within the bar)
+            results = await asyncio.get_running_loop().run_in_executor(
+                LLM_EXECUTOR,
+                analysis_cache.get_or_set,
+                analysis_cache.make_key(symbols, generate_report=need_report),
+                lambda: self.llm_system.run_analysis(symbols=symbols, generate_report=need_report)
             )
             
             if not results.get("success"):
@@ -124,21 +144,26 @@ class ScheduledLLMAnalysis:
             
             # Send to Telegram if configured
             if self.notifier and self.telegram_chat_ids:
-                success_count = 0
-                for chat_id in self.telegram_chat_ids:
-                    try:
-                        success = await self.notifier.send_analysis_results(
-                            chat_id=chat_id,
-                            results=results,
-                            send_detailed=send_detailed
-                        )
-                        if success:
-                            success_count += 1
-                            logger.info(f"Successfully sent analysis to chat {chat_id}")
-                        else:
-                            logger.warning(f"Failed to send analysis to chat {chat_id}")
-                    except Exception as e:
-                        logger.error(f"Error sending to chat {chat_id}: {e}")
+                # The messages are the same for every chat: render them once
+                messages = self.notifier.render_analysis(results, send_detailed)
+                
+                async def send_one(chat_id: int) -> bool:
+                    async with self._send_semaphore:
+                        try:
+                            success = await self.notifier.send_rendered(chat_id, messages)
+                        except Exception as e:
+                            logger.error(f"Error sending to chat {chat_id}: {e}")
+                            return False
+                    
+                    if success:
+                        logger.info(f"Successfully sent analysis to chat {chat_id}")
+                    else:
+                        logger.warning(f"Failed to send analysis to chat {chat_id}")
+                    return success
+                
+                # Chats are independent: one slow chat no longer delays the rest
+                sent = await asyncio.gather(*(send_one(chat_id) for chat_id in self.telegram_chat_ids))
+                success_count = sum(sent)
                 
                 logger.info(f"Sent analysis to {success_count}/{len(self.telegram_chat_ids)} chats")
                 return success_count > 0
@@ -166,6 +191,7 @@ class ScheduledLLMAnalysis:
         """Cleanup resources"""
         if self.llm_system:
             self.llm_system.cleanup()
+        shutdown_executor()
 
 async def run_once(
     symbols: Optional[List[str]] = None,
@@ -175,7 +201,7 @@ async def run_once(
     
     scheduler = ScheduledLLMAnalysis()
     
-    if not scheduler.initialize():
+    if not await asyncio.get_running_loop().run_in_executor(LLM_EXECUTOR, scheduler.initialize):
         logger.error("Failed to initialize scheduler")
         return False
     
@@ -199,10 +225,13 @@ async def run_continuous_schedule(
     
     scheduler = ScheduledLLMAnalysis()
     
-    if not scheduler.initialize():
+    if not await asyncio.get_running_loop().run_in_executor(LLM_EXECUTOR, scheduler.initialize):
         logger.error("Failed to initialize scheduler")
         return
     
+    interval = interval_minutes * 60
+    next_run = time.monotonic()
+    
     try:
         while True:
             try:
@@ -219,9 +248,17 @@ async def run_continuous_schedule(
             except Exception as e:
                 logger.error(f"Error in scheduled run: {e}")
             
-            # Wait for next run
-            logger.info(f"Next analysis in {interval_minutes} minutes...")
-            await asyncio.sleep(interval_minutes * 60)
+            # Wait for the next tick on a fixed grid, so run time doesn't add drift
+            next_run += interval
+            delay = next_run - time.monotonic()
+            if delay < 0:
+                # Overran the interval: run now and re-anchor instead of replaying missed ticks
+                logger.warning(f"Analysis overran the {interval_minutes}-minute interval by {-delay:.0f}s, running now")
+                next_run = time.monotonic()
+                delay = 0
+            else:
+                logger.info(f"Next analysis in {delay / 60:.1f} minutes...")
+            await asyncio.sleep(delay)
             
     except KeyboardInterrupt:
         logger.info("Scheduled analysis stopped by user")
@@ -269,20 +306,8 @@ def main():
     # Parse symbols
     symbols = None
     if args.symbols:
-        symbols = [s.strip() for s in args.symbols.split(",") if s.strip()]
-        # Convert to OANDA format
-        formatted_symbols = []
-        for symbol in symbols:
-            if not symbol.startswith("OANDA:"):
-                if "_" in symbol:
-                    formatted_symbols.append(f"OANDA:{symbol}")
-                elif len(symbol) == 6:
-                    formatted_symbols.append(f"OANDA:{symbol[:3]}_{symbol[3:]}")
-                else:
-                    formatted_symbols.append(f"OANDA:{symbol}")
-            else:
-                formatted_symbols.append(symbol)
-        symbols = formatted_symbols
+        # Convert to OANDA format, dropping aliases of the same pair (EURUSD, EUR_USD, ...)
+        symbols = list(dict.fromkeys(normalize_oanda_symbol(s.strip()) for s in args.symbols.split(",") if s.strip()))
     
     try:
         if args.once:
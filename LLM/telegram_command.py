@@ -9,12 +9,14 @@ import asyncio
 import logging
 import os
 import sys
+import textwrap
+import time
 from pathlib import Path
 from typing import List, Optional
 
-# Add project root to path for imports
-project_root = Path(__file__).parent.parent
-sys.path.insert(0, str(project_root))
+# Add project root to path when run as a script
+if not __package__:
+    sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from telegram import Update
 from telegram.ext import ContextTypes
@@ -22,17 +24,82 @@ from telegram.constants import ParseMode
 
 # LLM imports
 from LLM.main import LLMTradingSystem
-from LLM.core.telegram_integration import TelegramNotifier
+from LLM.core.telegram_integration import TelegramNotifier, register_shared_bot
+from LLM.core.analysis_cache import analysis_cache
+from LLM.core.data_types import normalize_oanda_symbol
+from LLM.core.executors import LLM_EXECUTOR, shutdown_executor
 
 logger = logging.getLogger(__name__)
 
+# Static message payloads, built once at import
+_STARTING_TEXT = (
+    "🤖 <b>Starting LLM Trading Analysis...</b>\n\n"
+    "📊 Fetching market data...\n"
+    "🔍 Analyzing with ChatGPT...\n"
+    "📝 Generating report...\n\n"
+    "<i>This may take 30-60 seconds...</i>"
+)
+
+_LLM_HELP_TEXT = textwrap.dedent("""
+    🤖 <b>LLM Trading Analysis Commands</b>
+    
+    <b>🎯 Main Command:</b>
+    /llm - Run AI trading analysis with default symbols
+    /llm EUR_USD,GBP_USD - Analyze specific symbols
+    /llm EUR/USD,GBP/USD - Alternative format
+    
+    <b>📊 What it does:</b>
+    • Fetches live forex quotes, technical analysis, and news
+    • Uses ChatGPT to analyze market conditions
+    • Generates buy/sell/hold signals with confidence levels
+    • Provides detailed reasoning and risk assessment
+    • Creates comprehensive market reports
+    
+    <b>📝 Output includes:</b>
+    • Trading signals (Buy/Sell/Hold) with confidence %
+    • Entry, stop loss, and take profit levels
+    • Market bias (Bullish/Bearish/Neutral)
+    • Technical analysis summary
+    • News impact assessment
+    • Risk factors and key levels
+    
+    <b>⚙️ Requirements:</b>
+    • OpenAI API key must be configured
+    • TradeBot API must be running
+    • Analysis takes 30-60 seconds to complete
+    
+    <b>💡 Examples:</b>
+    /llm - Analyze default pairs
+    /llm EURUSD - Analyze EUR/USD only
+    /llm EUR_USD,GBP_USD,XAU_USD - Multiple pairs
+    
+    <i>Powered by ChatGPT for intelligent market analysis</i>
+""").strip()
+
 class LLMTelegramCommand:
     """LLM command handler for Telegram bot"""
     
     def __init__(self):
         self.llm_system: Optional[LLMTradingSystem] = None
-        self.notifier = TelegramNotifier()
+        self._notifier: Optional[TelegramNotifier] = None
         self._initialized = False
+        self._init_lock = asyncio.Lock()
+    
+    @property
+    def notifier(self) -> TelegramNotifier:
+        """Notifier shared by all commands, created on first use"""
+        if self._notifier is None:
+            self._notifier = TelegramNotifier()
+        return self._notifier
+    
+    async def _ensure_initialized(self):
+        """Initialize the LLM system once, even under concurrent /llm commands"""
+        if self._initialized:
+            return
+        async with self._init_lock:
+            if not self._initialized:
+                # initialize_services is blocking, keep it off the event loop
+                await asyncio.get_running_loop().run_in_executor(LLM_EXECUTOR, self._initialize_llm_system)
     
     def _initialize_llm_system(self):
         """Initialize LLM system if not already done"""
@@ -40,6 +107,7 @@ class LLMTelegramCommand:
             try:
                 self.llm_system = LLMTradingSystem()
                 self.llm_system.initialize_services()
+                analysis_cache.enable_redis(self.llm_system.settings.redis_url)
                 self._initialized = True
                 logger.info("LLM system initialized successfully")
             except Exception as e:
@@ -65,36 +133,16 @@ class LLMTelegramCommand:
         if context.args:
             # Parse symbols from command arguments
             symbols_arg = " ".join(context.args)
-            symbols = [s.strip().replace("/", "_") for s in symbols_arg.split(",") if s.strip()]
-            
-            # Convert common formats to OANDA format
-            formatted_symbols = []
-            for symbol in symbols:
-                if not symbol.startswith("OANDA:"):
-                    # Convert formats like EUR_USD or EURUSD to OANDA:EUR_USD
-                    if "_" in symbol:
-                        formatted_symbols.append(f"OANDA:{symbol}")
-                    elif len(symbol) == 6:
-                        formatted_symbols.append(f"OANDA:{symbol[:3]}_{symbol[3:]}")
-                    else:
-                        formatted_symbols.append(f"OANDA:{symbol}")
-                else:
-                    formatted_symbols.append(symbol)
-            symbols = formatted_symbols
+            # Convert formats like EUR_USD, EUR/USD or EURUSD to OANDA:EUR_USD, keeping
+            # the first occurrence of each pair so it is only analyzed once
+            symbols = list(dict.fromkeys(normalize_oanda_symbol(s.strip()) for s in symbols_arg.split(",") if s.strip()))
         
         # Send initial message
-        progress_message = await update.message.reply_text(
-            "🤖 <b>Starting LLM Trading Analysis...</b>\n\n"
-            "📊 Fetching market data...\n"
-            "🔍 Analyzing with ChatGPT...\n"
-            "📝 Generating report...\n\n"
-            "<i>This may take 30-60 seconds...</i>",
-            parse_mode=ParseMode.HTML
-        )
+        progress_message = await update.message.reply_text(_STARTING_TEXT, parse_mode=ParseMode.HTML)
         
         try:
             # Initialize LLM system if needed
-            self._initialize_llm_system()
+            await self._ensure_initialized()
             
             if not self.llm_system:
                 await progress_message.edit_text(
@@ -105,25 +153,39 @@ class LLMTelegramCommand:
                 return
             
             # Update progress
-            await progress_message.edit_text(
+            progress_text = (
                 "🤖 <b>LLM Trading Analysis</b>\n\n"
                 f"📊 Analyzing symbols: {', '.join(symbols) if symbols else 'Default symbols'}\n"
                 "🔍 ChatGPT processing market data...\n\n"
-                "<i>Please wait...</i>",
+            )
+            await progress_message.edit_text(
+                progress_text + "<i>Please wait...</i>",
                 parse_mode=ParseMode.HTML
             )
             
-            # Run LLM analysis with 15-minute timeframe
-            results = self.llm_system.run_analysis(
-                symbols=symbols,
-                generate_report=True
-            )
+            # Run LLM analysis with 15-minute timeframe (reused within the bar) on a
+            # worker thread, so other updates keep flowing while it runs
+            ticker = asyncio.create_task(self._progress_ticker(progress_message, progress_text))
+            try:
+                results = await asyncio.get_running_loop().run_in_executor(
+                    LLM_EXECUTOR,
+                    analysis_cache.get_or_set,
+                    analysis_cache.make_key(symbols, generate_report=True),
+                    lambda: self.llm_system.run_analysis(symbols=symbols, generate_report=True)
+                )
+            finally:
+                ticker.cancel()
+                # Never let a late edit race the delete below
+                await asyncio.gather(ticker, return_exceptions=True)
             
             # Delete progress message
             await progress_message.delete()
             
-            # Set up notifier with bot reference
-            self.notifier.bot = context.bot
+            # Bind the application's bot (and its pooled connections) once, and share
+            # it with a scheduler running in the same process
+            if self.notifier.bot is None:
+                self.notifier.bot = context.bot
+                register_shared_bot(context.bot)
             
             # Send results to Telegram
             success = await self.notifier.send_analysis_results(
@@ -155,51 +217,29 @@ class LLMTelegramCommand:
                 parse_mode=ParseMode.HTML
             )
     
+    async def _progress_ticker(self, progress_message, progress_text: str, interval: float = 10):
+        """Refresh the progress message with the elapsed time until cancelled"""
+        started = time.monotonic()
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await progress_message.edit_text(
+                    progress_text + f"<i>Still working... {time.monotonic() - started:.0f}s elapsed</i>",
+                    parse_mode=ParseMode.HTML
+                )
+            except Exception as e:
+                logger.debug("Progress update failed: %s", e)
+    
     async def llm_help_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Handle /llmhelp command"""
         
-        help_text = """
-        🤖 <b>LLM Trading Analysis Commands</b>
-        
-        <b>🎯 Main Command:</b>
-        /llm - Run AI trading analysis with default symbols
-        /llm EUR_USD,GBP_USD - Analyze specific symbols
-        /llm EUR/USD,GBP/USD - Alternative format
-        
-        <b>📊 What it does:</b>
-        • Fetches live forex quotes, technical analysis, and news
-        • Uses ChatGPT to analyze market conditions
-        • Generates buy/sell/hold signals with confidence levels
-        • Provides detailed reasoning and risk assessment
-        • Creates comprehensive market reports
-        
-        <b>📝 Output includes:</b>
-        • Trading signals (Buy/Sell/Hold) with confidence %
-        • Entry, stop loss, and take profit levels
-        • Market bias (Bullish/Bearish/Neutral)
-        • Technical analysis summary
-        • News impact assessment
-        • Risk factors and key levels
-        
-        <b>⚙️ Requirements:</b>
-        • OpenAI API key must be configured
-        • TradeBot API must be running
-        • Analysis takes 30-60 seconds to complete
-        
-        <b>💡 Examples:</b>
-        /llm - Analyze default pairs
-        /llm EURUSD - Analyze EUR/USD only
-        /llm EUR_USD,GBP_USD,XAU_USD - Multiple pairs
-        
-        <i>Powered by ChatGPT for intelligent market analysis</i>
-        """
-        
-        await update.message.reply_text(help_text, parse_mode=ParseMode.HTML)
+        await update.message.reply_text(_LLM_HELP_TEXT, parse_mode=ParseMode.HTML)
     
     def cleanup(self):
         """Cleanup LLM system resources"""
         if self.llm_system:
             self.llm_system.cleanup()
+        shutdown_executor()
 
 # Global instance for use in main Telegram bot
 llm_command_handler = LLMTelegramCommand()
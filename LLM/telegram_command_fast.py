@@ -3,43 +3,159 @@
 Fast LLM command for Telegram integration
 
 Optimized version that completes analysis in under 30 seconds
+
+Handlers send several replies/edits per command through the Application's bot,
+so build it with a pool that fits concurrent commands (the default HTTPXRequest
+pool holds a single connection), e.g.:
+
+    Application.builder().token(token)
+        .connection_pool_size(32).pool_timeout(20)
+        .get_updates_connection_pool_size(4)
+        .build()
 """
 
 import asyncio
 import logging
 import os
 import sys
+import textwrap
 from pathlib import Path
-from typing import List, Optional
+from typing import Dict, List, Optional, Tuple
 
-# Add project root to path for imports
-project_root = Path(__file__).parent.parent
-sys.path.insert(0, str(project_root))
+# Add project root to path when run as a script
+if not __package__:
+    sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from telegram import Update
 from telegram.ext import ContextTypes
-from telegram.constants import ParseMode
+from telegram.constants import ChatAction, ParseMode
+from telegram.error import TelegramError
 
 # Fast LLM imports
 from LLM.fast_main import FastLLMTradingSystem
-from LLM.core.telegram_integration import TelegramNotifier
+from LLM.core.telegram_integration import TelegramFormatter
+from LLM.core.data_types import normalize_oanda_symbol
+from LLM.core.executors import LLM_EXECUTOR, shutdown_executor
 
 logger = logging.getLogger(__name__)
 
+# Emoji for actionable signal types, as they appear in results["signals"]
+_TYPE_EMOJI = {"buy": "📈", "sell": "📉"}
+
+# Static message payloads, built once at import
+_STARTING_TEXTS = {
+    n: (
+        "⚡ <b>Starting FAST LLM Analysis...</b>\n\n"
+        f"📊 Max Symbols: {n}\n"
+        "🔍 Optimized for speed...\n\n"
+        "<i>Target: Under 30 seconds</i>"
+    )
+    for n in range(1, 6)  # max_symbols is clamped to 1-5
+}
+
+_SUMMARY_TMPL = "⚡ <b>Fast LLM Analysis Complete</b>\n⏱️ Time: {}{}\n📊 Signals: {} total, {} actionable\n\n"
+
+_LLMFAST_HELP_TEXT = textwrap.dedent("""
+    ⚡ <b>Fast LLM Trading Analysis Commands</b>
+    
+    <b>🎯 Fast Commands:</b>
+    /llmfast - Fast AI analysis (under 30s, max 3 symbols)
+    /llmfast EUR_USD,GBP_USD - Fast analysis of specific symbols
+    /llmfast EURUSD 2 - Fast analysis with max 2 symbols
+    /fastllm - Alternative to /llmfast
+    
+    <b>⚡ Speed Optimizations:</b>
+    • Parallel data fetching and signal generation
+    • Reduced historical data (7 days vs 30 days)
+    • Optimized ChatGPT prompts (shorter responses)
+    • Limited symbols (1-5 max, default 3)
+    • Cached data for faster repeat requests
+    
+    <b>📊 What's included:</b>
+    • Live forex quotes and current prices
+    • Key support/resistance levels (nearest only)
+    • Top chart patterns (most relevant)
+    • High-impact news events only
+    • Buy/sell/hold signals with confidence
+    • Quick reasoning and key factors
+    
+    <b>🎯 Target Performance:</b>
+    • Analysis time: Under 30 seconds
+    • Data freshness: Real-time quotes
+    • Signal quality: High confidence only
+    • Resource usage: Optimized for speed
+    
+    <b>💡 When to use:</b>
+    • Quick market check during trading hours
+    • Fast signal confirmation
+    • When you need immediate analysis
+    • Mobile/low-bandwidth situations
+    
+    <b>🔄 For comprehensive analysis use:</b>
+    /llm - Full detailed analysis (60-120s)
+    
+    <i>Fast mode trades depth for speed while maintaining accuracy</i>
+""").strip()
+
 class FastLLMTelegramCommand:
     """Fast LLM command handler for Telegram bot"""
     
+    __slots__ = ("llm_system", "_initialized", "_init_lock", "_has_openai_key", "_preinit_task", "_inflight")
+    
     def __init__(self):
         self.llm_system: Optional[FastLLMTradingSystem] = None
-        self.notifier = TelegramNotifier()
         self._initialized = False
+        self._init_lock = asyncio.Lock()
+        # .env is already loaded by LLM.config.settings (imported via fast_main)
+        self._has_openai_key = bool(os.getenv("OPENAI_API_KEY"))
+        self._preinit_task: Optional[asyncio.Task] = None
+        
+        # Single-flight: analyses already running, by (chat, symbols, max_symbols)
+        self._inflight: Dict[Tuple, asyncio.Future] = {}
+        
+        # Created inside a running bot: start warming up right away
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            pass
+        else:
+            self.start_background_init()
+    
+    def start_background_init(self):
+        """Initialize in the background so the first /llmfast doesn't pay for it
+        
+        Must be called from the bot's event loop; a command arriving meanwhile
+        waits on the same in-flight initialization.
+        """
+        if self._initialized or self._preinit_task:
+            return
+        self._preinit_task = asyncio.get_running_loop().create_task(self._preinit())
+    
+    async def _preinit(self):
+        try:
+            await self._ensure_initialized()
+        except Exception as e:
+            # Already logged; the first command retries the initialization
+            logger.warning(f"Background fast LLM initialization failed: {e}")
+    
+    async def _ensure_initialized(self):
+        """Initialize the fast LLM system once, even under concurrent /llmfast commands"""
+        if self._initialized:
+            return
+        async with self._init_lock:
+            if not self._initialized:
+                # initialize_services is blocking, keep it off the event loop
+                await asyncio.get_running_loop().run_in_executor(LLM_EXECUTOR, self._initialize_llm_system)
     
     def _initialize_llm_system(self):
-        """Initialize fast LLM system"""
+        """Initialize fast LLM system (blocking; called through _ensure_initialized)"""
         if not self._initialized:
             try:
-                self.llm_system = FastLLMTradingSystem()
-                self.llm_system.initialize_services()
+                # Publish the system only once its services are up, so a failed
+                # attempt never leaves a half-initialized instance behind
+                llm_system = FastLLMTradingSystem()
+                llm_system.initialize_services()
+                self.llm_system = llm_system
                 self._initialized = True
                 logger.info("Fast LLM system initialized successfully")
             except Exception as e:
@@ -49,10 +165,8 @@ class FastLLMTelegramCommand:
     async def llm_fast_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Handle /llmfast command for fast AI trading analysis"""
         
-        chat_id = update.effective_chat.id
-        
         # Check if OpenAI API key is available
-        if not os.getenv("OPENAI_API_KEY"):
+        if not self._has_openai_key:
             await update.message.reply_text(
                 "❌ <b>Fast LLM Analysis Unavailable</b>\n\n"
                 "OpenAI API key not configured. Please contact admin to set up OPENAI_API_KEY.",
@@ -69,21 +183,8 @@ class FastLLMTelegramCommand:
             symbols_arg = context.args[0] if context.args else ""
             
             if symbols_arg and not symbols_arg.isdigit():
-                symbols = [s.strip().replace("/", "_") for s in symbols_arg.split(",") if s.strip()]
-                
-                # Convert common formats to OANDA format
-                formatted_symbols = []
-                for symbol in symbols:
-                    if not symbol.startswith("OANDA:"):
-                        if "_" in symbol:
-                            formatted_symbols.append(f"OANDA:{symbol}")
-                        elif len(symbol) == 6:
-                            formatted_symbols.append(f"OANDA:{symbol[:3]}_{symbol[3:]}")
-                        else:
-                            formatted_symbols.append(f"OANDA:{symbol}")
-                    else:
-                        formatted_symbols.append(symbol)
-                symbols = formatted_symbols
+                # Convert formats like EUR_USD, EUR/USD or EURUSD to OANDA:EUR_USD
+                symbols = [normalize_oanda_symbol(s.strip()) for s in symbols_arg.split(",") if s.strip()]
             
             # Check if there's a max_symbols argument
             if len(context.args) > 1:
@@ -95,16 +196,13 @@ class FastLLMTelegramCommand:
         
         # Send initial message
         progress_message = await update.message.reply_text(
-            "⚡ <b>Starting FAST LLM Analysis...</b>\n\n"
-            f"📊 Max Symbols: {max_symbols}\n"
-            "🔍 Optimized for speed...\n\n"
-            "<i>Target: Under 30 seconds</i>",
+            _STARTING_TEXTS[max_symbols],
             parse_mode=ParseMode.HTML
         )
         
         try:
             # Initialize fast LLM system if needed
-            self._initialize_llm_system()
+            await self._ensure_initialized()
             
             if not self.llm_system:
                 await progress_message.edit_text(
@@ -114,20 +212,24 @@ class FastLLMTelegramCommand:
                 )
                 return
             
-            # Update progress
-            await progress_message.edit_text(
+            # Update progress without holding up the analysis
+            progress_update = asyncio.create_task(progress_message.edit_text(
                 "⚡ <b>Fast LLM Analysis Running</b>\n\n"
                 f"📊 Analyzing: {', '.join(symbols) if symbols else f'Default top {max_symbols}'}\n"
                 "🚀 Parallel processing active...\n\n"
                 "<i>Please wait...</i>",
                 parse_mode=ParseMode.HTML
-            )
+            ))
             
-            # Run fast LLM analysis with 15-minute timeframe
-            results = self.llm_system.run_fast_analysis(
-                symbols=symbols,
-                max_symbols=max_symbols
-            )
+            # Run fast LLM analysis with 15-minute timeframe, showing "typing..." meanwhile
+            heartbeat = asyncio.create_task(self._typing_heartbeat(context.bot, update.effective_chat.id))
+            try:
+                results = await self._run_analysis_once(update.effective_chat.id, symbols, max_symbols)
+            finally:
+                # Never let a late edit race the delete below
+                heartbeat.cancel()
+                progress_update.cancel()
+                await asyncio.gather(heartbeat, progress_update, return_exceptions=True)
             
             # Delete progress message
             await progress_message.delete()
@@ -139,61 +241,62 @@ class FastLLMTelegramCommand:
                 total_signals = results.get("total_signals", 0)
                 actionable = results.get("actionable_signals", 0)
                 
-                # Build quick summary
+                # Build quick summary and collect actionable signals in one pass
                 signals_text = []
+                actionable_signals = []
                 for signal in results.get("signals", []):
-                    if signal["type"] in ["buy", "sell"]:
-                        emoji = "📈" if signal["type"] == "buy" else "📉"
+                    emoji = _TYPE_EMOJI.get(signal["type"])
+                    if emoji:
+                        actionable_signals.append(signal)
                         signals_text.append(f"{emoji} {signal['symbol']} - {signal['type'].upper()} ({signal['confidence']})")
                 
-                summary_text = (
-                    f"⚡ <b>Fast LLM Analysis Complete</b>\n"
-                    f"⏱️ Time: {analysis_time}\n"
-                    f"📊 Signals: {total_signals} total, {actionable} actionable\n\n"
-                )
+                summary_parts = [_SUMMARY_TMPL.format(
+                    analysis_time, " (cached)" if results.get("cache_hit") else "", total_signals, actionable
+                )]
                 
                 if signals_text:
-                    summary_text += "<b>🎯 Actionable Signals:</b>\n"
-                    summary_text += "\n".join(signals_text[:5])  # Max 5
-                    summary_text += f"\n\n💡 Fast mode: Optimized analysis"
+                    summary_parts.append("<b>🎯 Actionable Signals:</b>\n")
+                    summary_parts.append("\n".join(signals_text[:5]))  # Max 5
+                    summary_parts.append("\n\n💡 Fast mode: Optimized analysis")
                 else:
-                    summary_text += "⏸️ <b>No actionable signals</b>\nMarket conditions suggest holding positions.\n\n"
-                    summary_text += "💡 Consider using full analysis: /llm"
+                    summary_parts.append("⏸️ <b>No actionable signals</b>\nMarket conditions suggest holding positions.\n\n")
+                    summary_parts.append("💡 Consider using full analysis: /llm")
                 
-                await update.message.reply_text(summary_text, parse_mode=ParseMode.HTML)
+                await update.message.reply_text("".join(summary_parts), parse_mode=ParseMode.HTML)
                 
                 # Send detailed signals if any actionable ones exist
-                actionable_signals = [s for s in results.get("signals", []) if s["type"] in ["buy", "sell"]]
-                
                 if actionable_signals:
-                    await update.message.reply_text("🎯 <b>Detailed Signals:</b>", parse_mode=ParseMode.HTML)
-                    
+                    # Header and details go out as one message (split only if too long)
+                    details = []
                     for signal in actionable_signals[:2]:  # Max 2 detailed signals
                         signal_type = signal["type"].upper()
-                        emoji = "📈" if signal_type == "BUY" else "📉"
+                        emoji = _TYPE_EMOJI[signal["type"]]
                         strength = signal["strength"].upper()
                         
-                        detail_text = (
-                            f"{emoji} <b>{signal['symbol']} - {signal_type}</b>\n"
+                        detail_parts = [
+                            f"{emoji} <b>{signal['symbol']} - {signal_type}</b>\n",
                             f"💪 Strength: {strength} | 🎯 Confidence: {signal['confidence']}\n"
-                        )
+                        ]
                         
                         if signal.get("entry_price"):
-                            detail_text += (
+                            detail_parts.append(
                                 f"💰 Entry: {signal['entry_price']}\n"
                                 f"🛑 Stop: {signal['stop_loss']}\n"
                                 f"🎯 Target: {signal['take_profit']}\n"
                             )
                         
                         if signal.get("reasoning"):
-                            detail_text += f"\n💡 {signal['reasoning']}\n"
+                            detail_parts.append(f"\n💡 {signal['reasoning']}\n")
                         
                         if signal.get("key_factors"):
-                            detail_text += f"\n📋 Key factors:\n"
-                            for factor in signal["key_factors"][:2]:
-                                detail_text += f"• {factor}\n"
+                            detail_parts.append("\n📋 Key factors:\n")
+                            detail_parts.extend(f"• {factor}\n" for factor in signal["key_factors"][:2])
                         
-                        await update.message.reply_text(detail_text, parse_mode=ParseMode.HTML)
+                        details.append("".join(detail_parts))
+                    
+                    detail_message = "🎯 <b>Detailed Signals:</b>\n\n" + "\n―――\n\n".join(details)
+                    for text in TelegramFormatter.split_long_message(detail_message):
+                        await update.message.reply_text(text, parse_mode=ParseMode.HTML)
             else:
                 error_msg = results.get("error", "Unknown error")
                 await update.message.reply_text(
@@ -208,8 +311,9 @@ class FastLLMTelegramCommand:
             
             try:
                 await progress_message.delete()
-            except:
-                pass
+            except TelegramError:
+                # Already gone or too old to delete; CancelledError still propagates
+                logger.debug("Progress message delete failed", exc_info=True)
             
             await update.message.reply_text(
                 f"❌ <b>Fast LLM Analysis Failed</b>\n\n"
@@ -218,57 +322,54 @@ class FastLLMTelegramCommand:
                 parse_mode=ParseMode.HTML
             )
     
-    async def llmfast_help_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
-        """Handle /llmfasthelp command"""
-        
-        help_text = """
-        ⚡ <b>Fast LLM Trading Analysis Commands</b>
-        
-        <b>🎯 Fast Commands:</b>
-        /llmfast - Fast AI analysis (under 30s, max 3 symbols)
-        /llmfast EUR_USD,GBP_USD - Fast analysis of specific symbols
-        /llmfast EURUSD 2 - Fast analysis with max 2 symbols
-        /fastllm - Alternative to /llmfast
-        
-        <b>⚡ Speed Optimizations:</b>
-        • Parallel data fetching and signal generation
-        • Reduced historical data (7 days vs 30 days)
-        • Optimized ChatGPT prompts (shorter responses)
-        • Limited symbols (1-5 max, default 3)
-        • Cached data for faster repeat requests
-        
-        <b>📊 What's included:</b>
-        • Live forex quotes and current prices
-        • Key support/resistance levels (nearest only)
-        • Top chart patterns (most relevant)
-        • High-impact news events only
-        • Buy/sell/hold signals with confidence
-        • Quick reasoning and key factors
-        
-        <b>🎯 Target Performance:</b>
-        • Analysis time: Under 30 seconds
-        • Data freshness: Real-time quotes
-        • Signal quality: High confidence only
-        • Resource usage: Optimized for speed
-        
-        <b>💡 When to use:</b>
-        • Quick market check during trading hours
-        • Fast signal confirmation
-        • When you need immediate analysis
-        • Mobile/low-bandwidth situations
+    async def _typing_heartbeat(self, bot, chat_id: int, interval: float = 4):
+        """Keep the chat's "typing..." indicator on until cancelled (Telegram clears it after ~5s)"""
+        while True:
+            try:
+                await bot.send_chat_action(chat_id=chat_id, action=ChatAction.TYPING)
+            except TelegramError as e:
+                logger.debug("Chat action failed: %s", e)
+            await asyncio.sleep(interval)
+    
+    async def _run_analysis_once(self, chat_id: int, symbols: Optional[List[str]], max_symbols: int) -> dict:
+        """Run the analysis, or join an identical one this chat already started"""
+        key = (chat_id, tuple(symbols) if symbols else None, max_symbols)
         
-        <b>🔄 For comprehensive analysis use:</b>
-        /llm - Full detailed analysis (60-120s)
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            logger.info(f"Joining in-flight fast analysis for chat {chat_id}")
+            return await asyncio.shield(inflight)
         
-        <i>Fast mode trades depth for speed while maintaining accuracy</i>
-        """
+        future = asyncio.get_running_loop().create_future()
+        future.add_done_callback(lambda f: f.cancelled() or f.exception())  # No "never retrieved" warnings
+        self._inflight[key] = future
+        try:
+            results = await self.llm_system.run_fast_analysis_async(
+                symbols=symbols,
+                max_symbols=max_symbols
+            )
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(results)
+            return results
+        finally:
+            del self._inflight[key]
+    
+    async def llmfast_help_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
+        """Handle /llmfasthelp command"""
         
-        await update.message.reply_text(help_text, parse_mode=ParseMode.HTML)
+        await update.message.reply_text(_LLMFAST_HELP_TEXT, parse_mode=ParseMode.HTML)
     
     def cleanup(self):
         """Cleanup fast LLM system resources"""
         if self.llm_system:
             self.llm_system.cleanup()
+        shutdown_executor()
 
 # Global instance for use in main Telegram bot
 fast_llm_command_handler = FastLLMTelegramCommand()
@@ -1,4 +1,4 @@
-from .setting_schema import TelegramConfig, DatabaseConfig, LoggingConfig, MT5Config, TradingConfig, StrategyConfig, RiskConfig, TradingBotConfig, FinnhubConfig
+from .setting_schema import TelegramConfig, DatabaseConfig, LoggingConfig, MT5Config, TradingConfig, StrategyConfig, RiskConfig, TradingBotConfig, FinnhubConfig, get_config
 
 __author__ = "Trading Bot Team"
 
@@ -11,5 +11,6 @@ __all__ = [
     'StrategyConfig',
     'RiskConfig',
     'TradingBotConfig',
-    'FinnhubConfig'
+    'FinnhubConfig',
+    'get_config'
 ]
@@ -1,23 +1,62 @@
 from __future__ import annotations
 
 import os
+from functools import lru_cache
 from typing import List, Dict, Optional
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 import dotenv
 
-dotenv.load_dotenv()
+@lru_cache(maxsize=1)
+def _load_env() -> Dict[str, str]:
+    """Load .env once and snapshot the environment; TRADEBOT_SKIP_DOTENV=1 skips the .env scan"""
+    if not os.environ.get("TRADEBOT_SKIP_DOTENV"):
+        dotenv.load_dotenv(override=False)
+    return dict(os.environ)
+
+# One snapshot of the environment (including .env) for all config defaults
+_ENV = _load_env()
 
 PYDANTIC_AVAILABLE = True
 
+# Configs are read-only after startup: frozen, and nested models are never re-validated
+_FROZEN_CONFIG = ConfigDict(frozen=True, revalidate_instances="never")
+
 def _list_from_env(env_var: str, default: List[str]) -> List[str]:
     """Helper function to parse comma-separated list from environment variable"""
-    env_value = os.getenv(env_var)
+    env_value = _ENV.get(env_var)
     if not env_value:
         return default
     return [item.strip() for item in env_value.split(',') if item.strip()]
 
+# Environment-derived values for the nested configs, shared by the validating
+# default factories and TradingBotConfig.from_env
+def _database_env() -> Dict:
+    return dict(
+        host=_ENV.get("POSTGRES_HOST", "postgres"),
+        port=int(_ENV.get("POSTGRES_PORT", 5432)),
+        password=_ENV.get("POSTGRES_PASSWORD", "default_password"),
+        user=_ENV.get("POSTGRES_USER", "default_user")
+    )
+
+def _mt5_env() -> Dict:
+    return dict(
+        login=int(_ENV.get("MT5_LOGIN", 123456)),
+        password=_ENV.get("MT5_PASSWORD", "default_password"),
+        server=_ENV.get("MT5_SERVER", "MetaQuotes-Demo")
+    )
+
+def _telegram_env() -> Dict:
+    return dict(bot_token=_ENV.get("TELEGRAM_TOKEN"))
+
+def _finnhub_env() -> Dict:
+    return dict(
+        api_base=_ENV.get("FINNHUB_API_BASE"),
+        api_token=_ENV.get("FINNHUB_API_KEY")
+    )
+
 class DatabaseConfig(BaseModel):
     """Database configuration schema"""
+    model_config = _FROZEN_CONFIG
     host: str = Field(default="postgres", description="Database host")
     port: int = Field(default=5432, description="Database port")
     user: str = Field(default="trading_bot", description="Database user")
@@ -36,6 +75,7 @@ class DatabaseConfig(BaseModel):
         return f"postgresql://{self.user}:{self.password}@{self.host}:{self.port}/{self.database}"
     
 class FinnhubConfig(BaseModel):
+    model_config = _FROZEN_CONFIG
     api_base: Optional[str] = Field(default=None, description="url api")
     api_token: Optional[str] = Field(default=None, description="api key")
     HTTP_TIMEOUT: int = Field(default=15, description="15 sec timeout")
@@ -44,6 +84,7 @@ class FinnhubConfig(BaseModel):
 
 class NewsConfig(BaseModel):
     """News/Economic events configuration"""
+    model_config = _FROZEN_CONFIG
     enabled: bool = Field(default=True, description="Enable news ingestion")
     sources: List[str] = Field(
                                default_factory=lambda: _list_from_env("NEWS_SOURCES", ["chatgpt"]),
@@ -51,37 +92,38 @@ class NewsConfig(BaseModel):
                                )
 
     # HTTP
-    request_timeout: int = Field(default=int(os.getenv("NEWS_REQUEST_TIMEOUT", 15)))
-    retries: int = Field(default=int(os.getenv("NEWS_RETRIES", 2)))
-    backoff: float = Field(default=float(os.getenv("NEWS_BACKOFF", 0.8)))
-    max_items_per_source: int = Field(default=int(os.getenv("NEWS_MAX_ITEMS_PER_SOURCE", 200)))
+    request_timeout: int = Field(default_factory=lambda: int(_ENV.get("NEWS_REQUEST_TIMEOUT", 15)))
+    retries: int = Field(default_factory=lambda: int(_ENV.get("NEWS_RETRIES", 2)))
+    backoff: float = Field(default_factory=lambda: float(_ENV.get("NEWS_BACKOFF", 0.8)))
+    max_items_per_source: int = Field(default_factory=lambda: int(_ENV.get("NEWS_MAX_ITEMS_PER_SOURCE", 200)))
 
     # ChatGPT/OpenAI
-    openai_api_key: Optional[str] = Field(default=os.getenv("OPENAI_API_KEY"), description="OpenAI API key")
-    openai_model: str = Field(default=os.getenv("OPENAI_MODEL", "gpt-4o-mini"), description="OpenAI model to use")
-    openai_api_base: str = Field(default=os.getenv("OPENAI_API_BASE", "https://api.openai.com/v1"), description="OpenAI API base URL")
-    chatgpt_max_news_items: int = Field(default=int(os.getenv("CHATGPT_MAX_NEWS_ITEMS", 10)), description="Max news items from ChatGPT")
+    openai_api_key: Optional[str] = Field(default_factory=lambda: _ENV.get("OPENAI_API_KEY"), description="OpenAI API key")
+    openai_model: str = Field(default_factory=lambda: _ENV.get("OPENAI_MODEL", "gpt-4o-mini"), description="OpenAI model to use")
+    openai_api_base: str = Field(default_factory=lambda: _ENV.get("OPENAI_API_BASE", "https://api.openai.com/v1"), description="OpenAI API base URL")
+    chatgpt_max_news_items: int = Field(default_factory=lambda: int(_ENV.get("CHATGPT_MAX_NEWS_ITEMS", 10)), description="Max news items from ChatGPT")
 
     # Investing (RSS)
     investing_rss_urls: List[str] = Field(
-        default=list(filter(None, (os.getenv("INVESTING_RSS_URLS", "") or "").split(","))),
+        default_factory=lambda: _list_from_env("INVESTING_RSS_URLS", []),
         description="Comma-separated RSS feed URLs"
     )
 
     # ForexFactory
-    ff_calendar_page: Optional[str] = Field(default=os.getenv("FF_CALENDAR_PAGE"))
-    ff_export_json_url: Optional[str] = Field(default=os.getenv("FF_EXPORT_JSON_URL"))
-    ff_timezone: str = Field(default=os.getenv("FF_TIMEZONE", "UTC"))
+    ff_calendar_page: Optional[str] = Field(default_factory=lambda: _ENV.get("FF_CALENDAR_PAGE"))
+    ff_export_json_url: Optional[str] = Field(default_factory=lambda: _ENV.get("FF_EXPORT_JSON_URL"))
+    ff_timezone: str = Field(default_factory=lambda: _ENV.get("FF_TIMEZONE", "UTC"))
 
     # Windowing/Scheduling
-    refresh_interval_min: int = Field(default=int(os.getenv("REFRESH_INTERVAL_MIN", 15)))
-    upcoming_default_hours: int = Field(default=int(os.getenv("UPCOMING_DEFAULT_HOURS", 8)))
+    refresh_interval_min: int = Field(default_factory=lambda: int(_ENV.get("REFRESH_INTERVAL_MIN", 15)))
+    upcoming_default_hours: int = Field(default_factory=lambda: int(_ENV.get("UPCOMING_DEFAULT_HOURS", 8)))
 
     # Importance default
-    importance_default: int = Field(default=int(os.getenv("NEWS_IMPORTANCE_DEFAULT", 2)))
+    importance_default: int = Field(default_factory=lambda: int(_ENV.get("NEWS_IMPORTANCE_DEFAULT", 2)))
 
 class LoggingConfig(BaseModel):
     """Logging configuration schema"""
+    model_config = _FROZEN_CONFIG
     
     level: str = Field(default="INFO", description="Logging level")
     file: str = Field(default="logs/trading.log", description="Log file path")
@@ -96,6 +138,7 @@ class LoggingConfig(BaseModel):
 
 class MT5Config(BaseModel):
     """MetaTrader 5 configuration schema"""
+    model_config = _FROZEN_CONFIG
     
     login: Optional[int] = Field(None, description="MT5 login number")
     password: Optional[str] = Field(None, description="MT5 password")
@@ -105,6 +148,7 @@ class MT5Config(BaseModel):
 
 class TradingConfig(BaseModel):
     """Trading configuration schema"""
+    model_config = _FROZEN_CONFIG
     
     symbols: List[str] = Field(default=["XAUUSD"], description="Trading symbols")
     default_timeframe: str = Field(default="M5", description="Default timeframe")
@@ -123,6 +167,7 @@ class TradingConfig(BaseModel):
 
 class TelegramConfig(BaseModel):
     """Telegram bot configuration schema"""
+    model_config = _FROZEN_CONFIG
     
     bot_token: Optional[str] = Field(None, description="Telegram bot token")
     admin_chat_ids: List[int] = Field(default=[], description="Admin chat IDs")
@@ -132,6 +177,7 @@ class TelegramConfig(BaseModel):
 
 class StrategyConfig(BaseModel):
     """Strategy configuration schema"""
+    model_config = _FROZEN_CONFIG
     
     enabled: List[str] = Field(
         default=["al_brooks", "linda_raschke", "ict"], 
@@ -146,6 +192,7 @@ class StrategyConfig(BaseModel):
 
 class RiskConfig(BaseModel):
     """Risk management configuration schema"""
+    model_config = _FROZEN_CONFIG
     
     max_daily_loss: float = Field(default=5.0, description="Maximum daily loss percentage")
     max_weekly_loss: float = Field(default=10.0, description="Maximum weekly loss percentage")
@@ -159,38 +206,21 @@ class RiskConfig(BaseModel):
 
 class TradingBotConfig(BaseModel):
     """Main trading bot configuration schema"""
+    model_config = _FROZEN_CONFIG
     
     # Core configurations
-    database: DatabaseConfig = Field(
-        default_factory=lambda: DatabaseConfig(
-            host=os.getenv("POSTGRES_HOST", "postgres"),
-            port=int(os.getenv("POSTGRES_PORT", 5432)),
-            password=os.getenv("POSTGRES_PASSWORD", "default_password"),
-            user=os.getenv("POSTGRES_USER", "default_user")
-            )
-        )
+    database: DatabaseConfig = Field(default_factory=lambda: DatabaseConfig(**_database_env()))
     
     logging: LoggingConfig = Field(default_factory=LoggingConfig)
-    mt5: MT5Config = Field(
-        default_factory=lambda: MT5Config(
-            login=int(os.getenv("MT5_LOGIN", 123456)),
-            password=os.getenv("MT5_PASSWORD", "default_password"),
-            server=os.getenv("MT5_SERVER", "MetaQuotes-Demo")
-            )
-        )
+    mt5: MT5Config = Field(default_factory=lambda: MT5Config(**_mt5_env()))
     
     trading: TradingConfig = Field(default_factory=TradingConfig)
-    telegram: TelegramConfig = Field(default_factory=lambda: TelegramConfig(
-        bot_token=os.getenv("TELEGRAM_TOKEN")
-    ))
+    telegram: TelegramConfig = Field(default_factory=lambda: TelegramConfig(**_telegram_env()))
 
     strategies: StrategyConfig = Field(default_factory=StrategyConfig)
     risk: RiskConfig = Field(default_factory=RiskConfig)
     news: NewsConfig = Field(default_factory=NewsConfig)
-    finnhub: FinnhubConfig = Field(default_factory=lambda : FinnhubConfig(
-        api_base=os.getenv("FINNHUB_API_BASE"),
-        api_token=os.getenv("FINNHUB_API_KEY")
-    ))
+    finnhub: FinnhubConfig = Field(default_factory=lambda: FinnhubConfig(**_finnhub_env()))
 
     # System settings
     debug_mode: bool = Field(default=False, description="Enable debug mode")
@@ -202,3 +232,28 @@ class TradingBotConfig(BaseModel):
         # This avoids duplication of environment override logic
         super().__init__(**data)
 
+    @classmethod
+    def from_env(cls) -> TradingBotConfig:
+        """Build the default config from environment variables, skipping validation
+        
+        The values come from our own env parsing (already typed), so the nested
+        models are assembled with model_construct. Use TradingBotConfig(**data)
+        for externally supplied data.
+        """
+        return cls.model_construct(
+            database=DatabaseConfig.model_construct(**_database_env()),
+            logging=LoggingConfig.model_construct(),
+            mt5=MT5Config.model_construct(**_mt5_env()),
+            trading=TradingConfig.model_construct(),
+            telegram=TelegramConfig.model_construct(**_telegram_env()),
+            strategies=StrategyConfig.model_construct(),
+            risk=RiskConfig.model_construct(),
+            news=NewsConfig.model_construct(),
+            finnhub=FinnhubConfig.model_construct(**_finnhub_env())
+        )
+
+@lru_cache()
+def get_config() -> TradingBotConfig:
+    """Get the process-wide TradingBotConfig, built on first use"""
+    return TradingBotConfig.from_env()
+
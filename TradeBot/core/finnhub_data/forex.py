@@ -1,50 +1,73 @@
 from __future__ import annotations
 
 import datetime as dt
-from typing import Any, Dict, List, Optional, Union
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Sequence, Tuple, Union
 
-import pandas as pd
-from .httpClient import FinnhubHTTP
+from .httpClient import FinnhubHTTP, get_http
 from TradeBot.logger import get_logger
 
+if TYPE_CHECKING:
+    import pandas as pd
+
 log = get_logger(__name__)
 
-_ALLOWED_RESOLUTIONS = {"1", "5", "15", "30", "60", "D", "W", "M"}
+_ALLOWED_RESOLUTIONS = frozenset({"1", "5", "15", "30", "60", "D", "W", "M"})
+_CANDLE_FIELDS = ("o", "h", "l", "c", "v")
+_CANDLE_COLUMNS = ["open", "high", "low", "close", "volume"]
+
+def _date_to_unix(d: dt.date) -> int:
+    return int(dt.datetime(d.year, d.month, d.day).timestamp())
+
+# Exact-type dispatch for the common inputs; subclasses fall through to isinstance
+_TO_UNIX = {
+    int: int,
+    float: int,
+    dt.datetime: lambda ts: int(ts.timestamp()),
+    dt.date: _date_to_unix,
+}
 
 def _ensure_unix(ts: Union[int, float, dt.datetime, dt.date]) -> int:
+    convert = _TO_UNIX.get(type(ts))
+    if convert is not None:
+        return convert(ts)
     if isinstance(ts, (int, float)):
         return int(ts)
     if isinstance(ts, dt.datetime):
         return int(ts.timestamp())
     if isinstance(ts, dt.date):
-        return int(dt.datetime(ts.year, ts.month, ts.day).timestamp())
+        return _date_to_unix(ts)
     raise TypeError("from/to must be int(timestamp) or datetime/date.")
 
-def list_exchanges(client: FinnhubHTTP) -> List[str]:
+def _client(client: Optional[FinnhubHTTP]) -> FinnhubHTTP:
+    # None means the shared get_http() client, whose session stays alive between calls
+    return get_http() if client is None else client
+
+def list_exchanges(client: Optional[FinnhubHTTP] = None) -> List[str]:
     log.debug("list_exchanges()")
-    data = client.get("/forex/exchange")
+    data = _client(client).get("/forex/exchange")
     out = data if isinstance(data, list) else list(data or [])
     log.debug("list_exchanges: %s exchanges", len(out))
     return out
 
-def list_symbols(client: FinnhubHTTP, exchange: str) -> List[str]:
+def list_symbols(client: Optional[FinnhubHTTP], exchange: str) -> List[str]:
     log.debug("list_symbols(exchange=%s)", exchange)
-    data = client.get("/forex/symbol", params={"exchange": exchange})
+    data = _client(client).get("/forex/symbol", params={"exchange": exchange})
     out = data if isinstance(data, list) else list(data or [])
     log.debug("list_symbols: %s symbols for %s", len(out), exchange)
     return out
 
-def all_rates(client: FinnhubHTTP, base: str = "USD", date: Optional[str] = None) -> Dict[str, Any]:
+def all_rates(client: Optional[FinnhubHTTP], base: str = "USD", date: Optional[str] = None) -> Dict[str, Any]:
     log.debug("all_rates(base=%s, date=%s)", base, date)
     params: Dict[str, Any] = {"base": base}
     if date:
         params["date"] = date
-    data = client.get("/forex/rates", params=params)
+    data = _client(client).get("/forex/rates", params=params)
     log.debug("all_rates: keys=%s", list(data.keys())[:5])
     return data
 
 def candles(
-    client: FinnhubHTTP,
+    client: Optional[FinnhubHTTP],
     symbol: str,
     resolution: str,
     start: Union[int, float, dt.datetime, dt.date],
@@ -59,32 +82,71 @@ def candles(
     _from = _ensure_unix(start)
     _to = _ensure_unix(end)
 
-    data = client.get("/forex/candle", params={"symbol": symbol, "resolution": resolution, "from": _from, "to": _to})
-    if not as_df or pd is None:
+    data = _client(client).get("/forex/candle", params={"symbol": symbol, "resolution": resolution, "from": _from, "to": _to})
+    if not as_df:
+        return data
+    # pandas is only needed for DataFrame output; keep it off the import path
+    try:
+        import numpy as np
+        import pandas as pd
+    except ImportError:
+        log.warning("candles: pandas not installed, returning raw response")
         return data
     if not data or data.get("s") != "ok":
         log.warning("candles: empty or non-ok response for %s (%s)", symbol, resolution)
         return pd.DataFrame()
 
-    df = pd.DataFrame({
-        "t": data.get("t", []),
-        "o": data.get("o", []),
-        "h": data.get("h", []),
-        "l": data.get("l", []),
-        "c": data.get("c", []),
-        "v": data.get("v", []),
-    })
-    if not df.empty:
-        df["t"] = pd.to_datetime(df["t"], unit="s", utc=True)
-        df = df.set_index("t").sort_index()
-        if tz:
-            df.index = df.index.tz_convert(tz)  # type: ignore
-        df.rename(columns={"o": "open", "h": "high", "l": "low", "c": "close", "v": "volume"}, inplace=True)  # type: ignore
+    # One contiguous float64 block instead of six object lists coerced column by column
+    t = np.asarray(data.get("t", []), dtype=np.int64)
+    block = np.empty((len(t), len(_CANDLE_FIELDS)), dtype=np.float64)
+    for j, key in enumerate(_CANDLE_FIELDS):
+        values = data.get(key)
+        block[:, j] = np.asarray(values, dtype=np.float64) if values else np.nan
+
+    index = pd.DatetimeIndex(pd.to_datetime(t, unit="s", utc=True), name="t")
+    if tz:
+        index = index.tz_convert(tz)
+    df = pd.DataFrame(block, index=index, columns=_CANDLE_COLUMNS, copy=False)
+    # Finnhub returns candles in time order; only sort if that ever changes
+    if not df.index.is_monotonic_increasing:
+        df = df.sort_index()
     log.debug("candles: %s rows for %s (%s)", len(df), symbol, resolution)
     return df  # type: ignore
 
-def quote(client: FinnhubHTTP, symbol: str) -> Dict[str, Any]:
+CandleRequest = Tuple[str, str, Union[int, float, dt.datetime, dt.date], Union[int, float, dt.datetime, dt.date]]
+
+def candles_bulk(
+    client: Optional[FinnhubHTTP],
+    requests: Sequence[CandleRequest],
+    as_df: bool = True,
+    tz: Optional[str] = None,
+    max_workers: int = 8,
+) -> Dict[CandleRequest, Union["pd.DataFrame", Dict[str, Any], Exception]]:
+    """Fetch several (symbol, resolution, start, end) candle ranges concurrently.
+
+    Requests overlap on the client's pooled session; the result maps each request
+    tuple to its candles, or to the exception it raised so one bad symbol does not
+    fail the batch.
+    """
+    client = _client(client)
+    unique = list(dict.fromkeys(requests))
+    log.debug("candles_bulk: %s requests, %s workers", len(unique), max_workers)
+
+    def fetch(req: CandleRequest) -> Union["pd.DataFrame", Dict[str, Any], Exception]:
+        symbol, resolution, start, end = req
+        try:
+            return candles(client, symbol, resolution, start, end, as_df=as_df, tz=tz)
+        except Exception as e:
+            log.warning("candles_bulk: %s (%s) failed: %s", symbol, resolution, e)
+            return e
+
+    if len(unique) <= 1:
+        return {req: fetch(req) for req in unique}
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(unique))) as pool:
+        return dict(zip(unique, pool.map(fetch, unique)))
+
+def quote(client: Optional[FinnhubHTTP], symbol: str) -> Dict[str, Any]:
     log.debug("quote(symbol=%s)", symbol)
-    data = client.get("/quote", params={"symbol": symbol})
+    data = _client(client).get("/quote", params={"symbol": symbol})
     log.debug("quote: keys=%s", list(data.keys()))
     return data
@@ -5,40 +5,68 @@ import random
 import time
 import requests
 import logging
+from requests.adapters import HTTPAdapter
 from dataclasses import dataclass
-from typing import Optional, Any, Dict
+from functools import lru_cache
+from typing import Optional, Any, Dict, Tuple
 
-from TradeBot.config.setting_schema import TradingBotConfig
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+from TradeBot.config.setting_schema import get_config
 from .exceptions import FinnhubAuthError, FinnhubHTTPError, FinnhubRateLimit
 from TradeBot.logger import get_logger
 
 log = get_logger(__name__)
-config = TradingBotConfig()
+
+# اندازه‌ی pool اتصال‌ها؛ باید حداقل به اندازه‌ی تعداد thread های candles_bulk باشد
+POOL_MAXSIZE = 16
+# حداکثر بایت‌های body که در پیام FinnhubHTTPError نگه داشته می‌شود
+ERROR_BODY_LIMIT = 1024
 
 class FinnhubHTTP:
     def __init__(
         self,
         *,
-        base_url: Optional[str] = config.finnhub.api_base,
-        token: Optional[str] = config.finnhub.api_token,
-        timeout: int = config.finnhub.HTTP_TIMEOUT,
-        retries: int = config.finnhub.HTTP_RETRIES,
-        backoff: float = config.finnhub.HTTP_BACKOFF,
+        base_url: Optional[str] = None,
+        token: Optional[str] = None,
+        timeout: Optional[int] = None,
+        retries: Optional[int] = None,
+        backoff: Optional[float] = None,
         proxies: Optional[Dict[str, str]] = None,
         session: Optional[requests.Session] = None
     ) -> None:
+        # پیش‌فرض‌ها از کانفیگ مشترک، فقط وقتی واقعاً کلاینت ساخته می‌شود
+        cfg = get_config().finnhub
+        base_url = base_url or cfg.api_base
+        token = token or cfg.api_token
+        timeout = cfg.HTTP_TIMEOUT if timeout is None else timeout
+        retries = cfg.HTTP_RETRIES if retries is None else retries
+        backoff = cfg.HTTP_BACKOFF if backoff is None else backoff
+
         if not token:
             raise FinnhubAuthError(
                 "FINNHUB_API_TOKEN تعریف نشده است. آن را در conf/setting.py یا env تنظیم کنید."
             )
         self.base_url = base_url
+        self._base = (base_url or "").rstrip("/")  # پیشوند ثابت URL؛ path همیشه با / شروع می‌شود
         self.token = token
         self.timeout = timeout
         self.retries = retries
         self.backoff = backoff
         self.proxies = proxies
+        # تأخیر پایه‌ی هر تلاش یک‌بار محاسبه می‌شود (backoff * 2^attempt)
+        self._delays = tuple(backoff * (1 << a) for a in range(retries + 1))
         # اگر session پاس داده نشده باشد، lazy init می‌کنیم تا اگر کسی فایل را ناقص import کرد، باز هم خراب نشود:
         self._session: Optional[requests.Session] = session  # ساخته نمی‌کنیم تا اولین درخواست
+        # کلاینت‌های get_http بین فراخواننده‌ها مشترک‌اند و با خروج از with بسته نمی‌شوند
+        self._shared = False
+        # PreparedRequest آماده برای هر (method, path) و تنظیمات send؛ وابسته به session فعلی
+        self._prepared: Dict[Tuple[str, str], requests.PreparedRequest] = {}
+        self._send_kwargs: Optional[Dict[str, Any]] = None
 
     # ------------- Context Manager -------------
     def __enter__(self) -> "FinnhubHTTP":
@@ -46,69 +74,70 @@ class FinnhubHTTP:
         return self
 
     def __exit__(self, exc_type, exc, tb) -> None:
+        if self._shared:
+            return
         try:
             if self._session is not None:
                 self._session.close()
         finally:
             self._session = None
+            self._prepared.clear()
+            self._send_kwargs = None
 
     # ------------- Utilities -------------
     def _ensure_session(self) -> None:
         if self._session is None:
-            self._session = requests.Session()
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=POOL_MAXSIZE, pool_maxsize=POOL_MAXSIZE)
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            self._session = session
+
+    def _prepare(self, method: str, path: str, params: Dict[str, Any]) -> requests.PreparedRequest:
+        """نسخه‌ای از PreparedRequest کش‌شده برای این endpoint؛ فقط query string دوباره ساخته می‌شود."""
+        assert self._session is not None
+        key = (method, path)
+        template = self._prepared.get(key)
+        if template is None:
+            template = self._session.prepare_request(requests.Request(method, self._base + path))
+            self._prepared[key] = template
+        if self._send_kwargs is None:
+            # proxy/verify محیطی همان چیزی است که session.request هر بار محاسبه می‌کرد
+            self._send_kwargs = self._session.merge_environment_settings(
+                self._base, self.proxies or {}, None, None, None
+            )
+        prepared = template.copy()
+        prepared.prepare_url(template.url, params)
+        return prepared
 
     def _sleep_backoff(self, attempt: int, retry_after: Optional[float] = None) -> None:
         if retry_after is not None:
             time.sleep(max(0.0, float(retry_after)))
             return
-        delay = (2 ** attempt) * self.backoff
-        delay = delay * (0.8 + random.random() * 0.4)  # ±20% jitter
-        time.sleep(delay)
+        time.sleep(self._delays[attempt] * (0.8 + random.random() * 0.4))  # ±20% jitter
 
     def _request(self, method: str, path: str, params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         self._ensure_session()
         assert self._session is not None  # برای MyPy/Type checkers
 
-        params = params.copy() if params else {}
-        params["token"] = self.token
+        # یک dict برای کل درخواست؛ dict ورودی فراخواننده دست نمی‌خورد
+        params = {**params, "token": self.token} if params else {"token": self.token}
 
-        safe_params = {k: ("***" if k.lower() == "token" else v) for k, v in params.items()}
-        url = f"{self.base_url}{path}"
+        debug = log.isEnabledFor(logging.DEBUG)
+        safe_params = {k: ("***" if k.lower() == "token" else v) for k, v in params.items()} if debug else None
+        method = method.upper()
+        prepared = self._prepare(method, path, params)
+        send_kwargs = self._send_kwargs or {}
+        send = self._session.send
 
         last_err: Optional[Exception] = None
         for attempt in range(self.retries + 1):
-            try:
-                log.debug("HTTP %s %s params=%s attempt=%s", method.upper(), path, safe_params, attempt + 1)
-
-                resp = self._session.request(
-                    method=method.upper(),
-                    url=url,
-                    params=params,
-                    timeout=self.timeout,
-                    proxies=self.proxies,
-                )
-
-                if resp.status_code == 401:
-                    log.error("401 Unauthorized for %s", path)
-                    raise FinnhubAuthError("Unauthorized (401) — توکن را بررسی کنید.")
-                if resp.status_code == 429:
-                    retry_after = float(resp.headers.get("Retry-After", "0") or 0)
-                    if attempt < self.retries:
-                        log.warning("429 Rate-Limit on %s — retry in %ss (attempt=%s)", path, retry_after or "backoff", attempt + 1)
-                        self._sleep_backoff(attempt, retry_after if retry_after > 0 else None)
-                        continue
-                    raise FinnhubRateLimit("Rate limit exceeded (429).", retry_after=retry_after or None)
-
-                if 400 <= resp.status_code < 600:
-                    log.error("HTTP %s on %s: %s", resp.status_code, path, resp.text[:200])
-                    raise FinnhubHTTPError(resp.status_code, resp.text)
-
-                # OK
-                try:
-                    return resp.json()
-                except json.JSONDecodeError:
-                    return {"raw": resp.text}
+            if debug:
+                log.debug("HTTP %s %s params=%s attempt=%s", method, path, safe_params, attempt + 1)
 
+            # فقط خود ارسال در try است؛ بررسی status بیرون از آن و بدون raise/catch داخلی
+            try:
+                resp = send(prepared, timeout=self.timeout, **send_kwargs)
             except (requests.Timeout, requests.ConnectionError) as e:
                 last_err = e
                 if attempt < self.retries:
@@ -118,6 +147,32 @@ class FinnhubHTTP:
                 log.error("Network error after retries on %s: %s", path, e)
                 raise FinnhubHTTPError(599, f"Network error after retries: {e}") from e
 
+            status = resp.status_code
+            if status == 401:
+                log.error("401 Unauthorized for %s", path)
+                raise FinnhubAuthError("Unauthorized (401) — توکن را بررسی کنید.")
+            elif status == 429:
+                retry_after = float(resp.headers.get("Retry-After", "0") or 0)
+                if attempt < self.retries:
+                    log.warning("429 Rate-Limit on %s — retry in %ss (attempt=%s)", path, retry_after or "backoff", attempt + 1)
+                    self._sleep_backoff(attempt, retry_after if retry_after > 0 else None)
+                    continue
+                raise FinnhubRateLimit("Rate limit exceeded (429).", retry_after=retry_after or None)
+            elif 400 <= status < 600:
+                # فقط ابتدای body دیکد می‌شود؛ صفحه‌های خطای HTML بزرگ کامل کپی نمی‌شوند
+                body = resp.content[:ERROR_BODY_LIMIT].decode("utf-8", "replace")
+                if log.isEnabledFor(logging.ERROR):
+                    log.error("HTTP %s on %s: %s", status, path, body[:200])
+                raise FinnhubHTTPError(status, body)
+
+            # OK — پارس مستقیم از bytes، بدون decode به str
+            try:
+                if ORJSON_AVAILABLE:
+                    return orjson.loads(resp.content)
+                return json.loads(resp.content)
+            except json.JSONDecodeError:  # orjson.JSONDecodeError هم زیرکلاس همین است
+                return {"raw": resp.text}
+
         if last_err:
             log.error("Exhausted retries for %s: %s", path, last_err)
             raise FinnhubHTTPError(599, f"Exhausted retries: {last_err}") from last_err
@@ -131,4 +186,39 @@ class FinnhubHTTP:
         """بستن session به‌صورت دستی (اگر از with استفاده نکردی)."""
         if self._session is not None:
             self._session.close()
-            self._session = None
\ No newline at end of file
+            self._session = None
+            self._prepared.clear()
+            self._send_kwargs = None
+
+@lru_cache(maxsize=8)
+def _cached_http(
+    base_url: Optional[str],
+    token: Optional[str],
+    timeout: Optional[int],
+    retries: Optional[int],
+    backoff: Optional[float],
+    proxies_key: Optional[Tuple[Tuple[str, str], ...]],
+) -> FinnhubHTTP:
+    client = FinnhubHTTP(
+        base_url=base_url,
+        token=token,
+        timeout=timeout,
+        retries=retries,
+        backoff=backoff,
+        proxies=dict(proxies_key) if proxies_key else None,
+    )
+    client._shared = True
+    return client
+
+def get_http(
+    *,
+    base_url: Optional[str] = None,
+    token: Optional[str] = None,
+    timeout: Optional[int] = None,
+    retries: Optional[int] = None,
+    backoff: Optional[float] = None,
+    proxies: Optional[Dict[str, str]] = None,
+) -> FinnhubHTTP:
+    """کلاینت مشترک برای هر ترکیب تنظیمات؛ session و اتصال keep-alive بین درخواست‌ها حفظ می‌شود."""
+    proxies_key = tuple(sorted(proxies.items())) if proxies else None
+    return _cached_http(base_url, token, timeout, retries, backoff, proxies_key)
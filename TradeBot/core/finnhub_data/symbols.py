@@ -1,5 +1,5 @@
 from __future__ import annotations
-from typing import List, Dict, Any, Set
+from typing import List, Dict, Any, FrozenSet, Optional, Set, Tuple
 
 SYMBOLS: List[Dict[str, Any]] = [
     {
@@ -64,28 +64,33 @@ SYMBOLS: List[Dict[str, Any]] = [
     },
 ]
 
+# Alias keys in order of precedence, with the Finnhub symbol template for each
+_FINNHUB_ALIAS_TEMPLATES = (
+    ("finnhub", "{}"),
+    ("oanda_code", "OANDA:{}"),
+    ("oanda_proxy_symbol", "OANDA:{}"),
+)
+
 def _mk_finnhub_symbol(entry: Dict[str, Any]) -> str | None:
     aliases = entry.get("aliases", {})
-
-    fh = aliases.get("finnhub")
-    if fh:
-        return str(fh).strip()
-
-    oc = aliases.get("oanda_code")
-    if oc:
-        return f"OANDA:{oc}".strip()
-    
-    ops = aliases.get("oanda_proxy_symbol")
-    if ops:
-        return f"OANDA:{ops}".strip()
-
+    for key, template in _FINNHUB_ALIAS_TEMPLATES:
+        value = aliases.get(key)
+        if value:
+            return template.format(str(value).strip())
     return None
 
 NAME_TO_ENTRY: Dict[str, Dict[str, Any]] = {e["name"]: e for e in SYMBOLS}
-NAME_TO_FINNHUB: Dict[str, str] = {e["name"]: _mk_finnhub_symbol(e) for e in SYMBOLS if _mk_finnhub_symbol(e)} # type: ignore
+_pairs = [(e["name"], _mk_finnhub_symbol(e)) for e in SYMBOLS]
+NAME_TO_FINNHUB: Dict[str, str] = {n: fh for n, fh in _pairs if fh}
 
 FINNHUB_TO_NAME: Dict[str, str] = {fh: name for name, fh in NAME_TO_FINNHUB.items()}
 
+# SYMBOLS is static: normalize roles once here instead of on every lookup
+_SYMBOLS_NORMALIZED: Tuple[Tuple[str, FrozenSet[str], Optional[str]], ...] = tuple(
+    (e["name"], frozenset(r.strip().lower() for r in e.get("role", [])), fh)
+    for e, (_, fh) in zip(SYMBOLS, _pairs)
+)
+
 def finnhub_symbol_for_names(names: List[str]) -> List[str]:
     out: List[str] = []
     for n in names:
@@ -98,12 +103,5 @@ def finnhub_symbol_for_names(names: List[str]) -> List[str]:
 def finnhub_symbols_for_roles(roles: Set[str]) -> List[str]:
     if not roles:
         roles = {"api_list"}
-    out: List[str] = []
     role_lc = {r.strip().lower() for r in roles if r.strip()}
-    for e in SYMBOLS:
-        eroles = {r.strip().lower() for r in e.get("role", [])}
-        if eroles & role_lc:
-            fh = NAME_TO_FINNHUB.get(e["name"])
-            if fh:
-                out.append(fh)
-    return out
+    return [fh for _, eroles, fh in _SYMBOLS_NORMALIZED if fh and eroles & role_lc]
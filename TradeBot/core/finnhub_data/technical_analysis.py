@@ -2,11 +2,28 @@ from __future__ import annotations
 
 import datetime as dt
 from typing import Any, Dict, List, Optional, Union
+import numpy as np
 import pandas as pd
 
 from .httpClient import FinnhubHTTP
 from TradeBot.logger import get_logger
 
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+    
+    def njit(*args, **kwargs):
+        """No-op stand-in so the scan kernels run as plain Python without numba"""
+        return lambda fn: fn
+
+try:
+    import bottleneck as bn
+    BOTTLENECK_AVAILABLE = True
+except ImportError:
+    BOTTLENECK_AVAILABLE = False
+
 log = get_logger(__name__)
 
 # Resolutions supported by Finnhub
@@ -24,6 +41,61 @@ def _ensure_unix(ts: Union[int, float, dt.datetime, dt.date]) -> int:
     raise TypeError("timestamp must be int(timestamp) or datetime/date.")
 
 
+@njit(cache=True)
+def _scan_double_extremes(idx: np.ndarray, px: np.ndarray, opposite: np.ndarray, tops: bool) -> np.ndarray:
+    """Positions j (into idx/px) that complete a double top (tops=True) or double bottom
+    
+    For each extreme i, the first later extreme j within 1% of it matches when the
+    opposite series between them moves at least 2% away (a valley below both tops,
+    or a peak above both bottoms).
+    """
+    out = np.empty(len(idx), dtype=np.int64)
+    count = 0
+    for i in range(len(idx) - 1):
+        for j in range(i + 1, len(idx)):
+            p1 = px[i]
+            p2 = px[j]
+            if abs(p1 - p2) / p1 >= 0.01:
+                continue
+            if tops:
+                between = opposite[idx[i]]
+                for k in range(idx[i] + 1, idx[j]):
+                    if opposite[k] < between:
+                        between = opposite[k]
+                matched = between < min(p1, p2) * 0.98
+            else:
+                between = opposite[idx[i]]
+                for k in range(idx[i] + 1, idx[j]):
+                    if opposite[k] > between:
+                        between = opposite[k]
+                matched = between > max(p1, p2) * 1.02
+            if matched:
+                out[count] = j
+                count += 1
+                break
+    return out[:count]
+
+
+def _centered_extreme(values: np.ndarray, span: int, use_max: bool) -> np.ndarray:
+    """Centered rolling max/min over an odd span; NaN where the window is incomplete"""
+    if span > len(values):
+        return np.full(len(values), np.nan)
+    if BOTTLENECK_AVAILABLE:
+        # bottleneck's O(N) moving window is trailing; shift it back by half a span
+        half = span // 2
+        trailing = bn.move_max(values, window=span) if use_max else bn.move_min(values, window=span)
+        out = np.full(len(values), np.nan)
+        out[:len(values) - half] = trailing[half:]
+        return out
+    rolling = pd.Series(values).rolling(span, center=True)
+    return (rolling.max() if use_max else rolling.min()).to_numpy()
+
+
+def _time_label(index: pd.Index, pos: int) -> str:
+    ts = index[pos]
+    return ts.isoformat() if hasattr(ts, 'isoformat') else str(ts)
+
+
 
 
 def support_resistance_levels(
@@ -60,33 +132,34 @@ def support_resistance_levels(
     resistance_levels = []
     
     try:
-        # Calculate moving averages locally
-        price_df['sma_20'] = price_df['close'].rolling(window=20).mean()
-        price_df['sma_50'] = price_df['close'].rolling(window=50).mean()
-        
-        # Add moving average levels as potential support/resistance
-        sma20_levels = price_df['sma_20'].dropna().tolist()
-        sma50_levels = price_df['sma_50'].dropna().tolist()
-        
-        support_levels.extend(sma20_levels)
-        resistance_levels.extend(sma20_levels)
-        support_levels.extend(sma50_levels)
-        resistance_levels.extend(sma50_levels)
+        # Moving averages (20, 50) as potential support/resistance; 'valid'
+        # convolution only yields full windows, but a NaN close spreads into
+        # every window covering it, so drop those like rolling().dropna() did
+        close = price_df['close'].to_numpy(dtype=np.float64)
+        for period in (20, 50):
+            if len(close) >= period:
+                sma = np.convolve(close, np.full(period, 1.0 / period), mode='valid')
+                sma_levels = sma[~np.isnan(sma)].tolist()
+                support_levels.extend(sma_levels)
+                resistance_levels.extend(sma_levels)
         
         # Find swing highs and lows (local maxima/minima)
         # Look for peaks and troughs over a rolling window
         window = min(10, len(price_df) // 4)  # Adaptive window size
         
         if window > 2:
-            # Find local highs (resistance)
-            for i in range(window, len(price_df) - window):
-                if price_df['high'].iloc[i] == price_df['high'].iloc[i-window:i+window+1].max():
-                    resistance_levels.append(price_df['high'].iloc[i])
+            span = 2 * window + 1
+            highs = price_df['high'].to_numpy(dtype=np.float64)
+            lows = price_df['low'].to_numpy(dtype=np.float64)
+            
+            # Centered rolling max/min over the same window; the partial windows
+            # at both edges stay NaN and never compare equal
+            rolling_high = _centered_extreme(highs, span, use_max=True)
+            rolling_low = _centered_extreme(lows, span, use_max=False)
             
-            # Find local lows (support)
-            for i in range(window, len(price_df) - window):
-                if price_df['low'].iloc[i] == price_df['low'].iloc[i-window:i+window+1].min():
-                    support_levels.append(price_df['low'].iloc[i])
+            # Local highs (resistance) and local lows (support)
+            resistance_levels.extend(highs[highs == rolling_high].tolist())
+            support_levels.extend(lows[lows == rolling_low].tolist())
         
         # Add recent significant levels
         recent_days = min(20, len(price_df))
@@ -266,60 +339,39 @@ def simple_pattern_detection(
         if len(price_df) >= 20:  # Need enough data points
             
             # 1. Detect Double Top/Bottom patterns
-            highs = price_df['high'].rolling(window=5, center=True).max()
-            lows = price_df['low'].rolling(window=5, center=True).min()
-            
-            # Find local peaks (double tops)
-            peaks = []
-            troughs = []
+            high = price_df['high'].to_numpy(dtype=np.float64)
+            low = price_df['low'].to_numpy(dtype=np.float64)
             
-            for i in range(2, len(price_df) - 2):
-                if price_df['high'].iloc[i] == highs.iloc[i]:
-                    peaks.append((i, price_df['high'].iloc[i]))
-                if price_df['low'].iloc[i] == lows.iloc[i]:
-                    troughs.append((i, price_df['low'].iloc[i]))
+            # Local peaks/troughs: bars equal to their centered 5-bar max/min
+            # (the two bars at each edge have no full window and never match)
+            rolling_high = _centered_extreme(high, 5, use_max=True)
+            rolling_low = _centered_extreme(low, 5, use_max=False)
+            peak_idx = np.flatnonzero(high == rolling_high)
+            trough_idx = np.flatnonzero(low == rolling_low)
             
-            # Check for double tops (two peaks at similar levels)
-            if len(peaks) >= 2:
-                for i in range(len(peaks) - 1):
-                    for j in range(i + 1, len(peaks)):
-                        peak1_idx, peak1_price = peaks[i]
-                        peak2_idx, peak2_price = peaks[j]
-                        
-                        # Check if peaks are at similar levels (within 1%)
-                        if abs(peak1_price - peak2_price) / peak1_price < 0.01:
-                            # Check if there's a valley between them
-                            valley_between = min(price_df['low'].iloc[peak1_idx:peak2_idx])
-                            if valley_between < min(peak1_price, peak2_price) * 0.98:
-                                patterns.append({
-                                    "pattern": "Double Top",
-                                    "time": price_df.index[peak2_idx].isoformat() if hasattr(price_df.index[peak2_idx], 'isoformat') else str(price_df.index[peak2_idx]),
-                                    "price": peak2_price,
-                                    "confidence": "medium",
-                                    "type": "bearish"
-                                })
-                                break
+            # Double tops: two peaks within 1% with a valley 2% below them
+            if len(peak_idx) >= 2:
+                peak_px = high[peak_idx]
+                for j in _scan_double_extremes(peak_idx, peak_px, low, True):
+                    patterns.append({
+                        "pattern": "Double Top",
+                        "time": _time_label(price_df.index, peak_idx[j]),
+                        "price": float(peak_px[j]),
+                        "confidence": "medium",
+                        "type": "bearish"
+                    })
             
-            # Check for double bottoms (two troughs at similar levels)
-            if len(troughs) >= 2:
-                for i in range(len(troughs) - 1):
-                    for j in range(i + 1, len(troughs)):
-                        trough1_idx, trough1_price = troughs[i]
-                        trough2_idx, trough2_price = troughs[j]
-                        
-                        # Check if troughs are at similar levels (within 1%)
-                        if abs(trough1_price - trough2_price) / trough1_price < 0.01:
-                            # Check if there's a peak between them
-                            peak_between = max(price_df['high'].iloc[trough1_idx:trough2_idx])
-                            if peak_between > max(trough1_price, trough2_price) * 1.02:
-                                patterns.append({
-                                    "pattern": "Double Bottom",
-                                    "time": price_df.index[trough2_idx].isoformat() if hasattr(price_df.index[trough2_idx], 'isoformat') else str(price_df.index[trough2_idx]),
-                                    "price": trough2_price,
-                                    "confidence": "medium",
-                                    "type": "bullish"
-                                })
-                                break
+            # Double bottoms: two troughs within 1% with a peak 2% above them
+            if len(trough_idx) >= 2:
+                trough_px = low[trough_idx]
+                for j in _scan_double_extremes(trough_idx, trough_px, high, False):
+                    patterns.append({
+                        "pattern": "Double Bottom",
+                        "time": _time_label(price_df.index, trough_idx[j]),
+                        "price": float(trough_px[j]),
+                        "confidence": "medium",
+                        "type": "bullish"
+                    })
             
             # 2. Detect trend breakouts
             recent_data = price_df.tail(10)  # Last 10 periods
@@ -1,8 +1,22 @@
 from __future__ import annotations
+from types import MappingProxyType
+from typing import Mapping
+
 from TradeBot.logger import get_logger
 
 log = get_logger(__name__)
 
+# Every accepted label -> importance level, built once at import
+_IMPORTANCE_MAP: Mapping[str, int] = MappingProxyType({
+    label: level
+    for level, labels in (
+        (3, ("3", "high", "hi", "h", "red", "very high", "high impact")),
+        (2, ("2", "medium", "med", "m", "orange", "moderate")),
+        (1, ("1", "low", "lo", "l", "yellow", "minor")),
+    )
+    for label in labels
+})
+
 def map_importance(val, default_: int = 2) -> int:
     if isinstance(val, int):
         return val if val in (1, 2, 3) else default_
@@ -10,13 +24,9 @@ def map_importance(val, default_: int = 2) -> int:
     if val is None:
         return default_
 
-    s = str(val).strip().lower()
-    if s in {"3", "high", "hi", "h", "red", "very high", "high impact"}:
-        return 3
-    if s in {"2", "medium", "med", "m", "orange", "moderate"}:
-        return 2
-    if s in {"1", "low", "lo", "l", "yellow", "minor"}:
-        return 1
+    level = _IMPORTANCE_MAP.get(str(val).strip().lower())
+    if level is not None:
+        return level
 
     log.debug("[news] importance fallback for value=%r -> %s", val, default_)
     return default_
@@ -1,5 +1,6 @@
 from __future__ import annotations
 import time
+from functools import lru_cache
 from typing import Optional, Any, Sequence
 from datetime import datetime, timezone
 from email.utils import parsedate_to_datetime
@@ -17,6 +18,12 @@ def to_unix_utc(dt: datetime) -> int:
 def rss_pubdate_to_unix(pubdate: Optional[str]) -> Optional[int]:
     if not pubdate:
         return None
+    return _parse_pubdate(pubdate)
+
+# Feeds repeat the same pubDate strings across items and refreshes; a failed
+# parse is cached too, so its warning is logged once per distinct value
+@lru_cache(maxsize=4096)
+def _parse_pubdate(pubdate: str) -> Optional[int]:
     try:
         # Try RFC 2822 format first (standard RSS)
         dt = parsedate_to_datetime(pubdate)
@@ -24,13 +31,11 @@ def rss_pubdate_to_unix(pubdate: Optional[str]) -> Optional[int]:
     except Exception:
         try:
             # Try ISO 8601 format (YYYY-MM-DD HH:MM:SS)
-            from datetime import datetime
             dt = datetime.fromisoformat(pubdate.replace('Z', '+00:00'))
             return to_unix_utc(dt)
         except Exception:
             try:
                 # Try simple format (YYYY-MM-DD HH:MM:SS) 
-                from datetime import datetime
                 dt = datetime.strptime(pubdate, '%Y-%m-%d %H:%M:%S')
                 return to_unix_utc(dt)
             except Exception as e:
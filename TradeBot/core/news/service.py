@@ -1,4 +1,5 @@
 from __future__ import annotations
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from typing import List
 
 from TradeBot.config.setting_schema import TradingBotConfig
@@ -71,30 +72,40 @@ class NewsService:
             )
 
     def fetch_all(self) -> List[NormalizedNews]:
-        if not self.enabled:
+        if not self.enabled or not self.clients:
             return []
+        # Sources are independent network fetches: run them side by side, then
+        # merge in client order so the result does not depend on timing
+        batches = {}
+        with ThreadPoolExecutor(max_workers=min(8, len(self.clients))) as ex:
+            futures = {ex.submit(c.fetch): c for c in self.clients}
+            for fut in as_completed(futures):
+                c = futures[fut]
+                try:
+                    batch = fut.result()
+                    before = len(batch)
+                    if NEWS.max_items_per_source and len(batch) > NEWS.max_items_per_source:
+                        batch = batch[:NEWS.max_items_per_source]
+                    batches[c] = batch
+                    log.info("[news] %s fetched=%s (capped=%s)",
+                             c.__class__.__name__, before, len(batch))
+                except Exception:
+                    log.exception("[news] source %s failed", c.__class__.__name__)
         items: List[NormalizedNews] = []
         for c in self.clients:
-            try:
-                batch = c.fetch()
-                before = len(batch)
-                if NEWS.max_items_per_source and len(batch) > NEWS.max_items_per_source:
-                    batch = batch[:NEWS.max_items_per_source]
-                items.extend(batch)
-                log.info("[news] %s fetched=%s (capped=%s) total=%s",
-                         c.__class__.__name__, before, len(batch), len(items))
-            except Exception:
-                log.exception("[news] source %s failed", c.__class__.__name__)
+            items.extend(batches.get(c, []))
+        log.info("[news] fetched total=%s from %s sources", len(items), len(batches))
         return items
 
     def persist(self, items: List[NormalizedNews]) -> int:
         if not items:
             log.info("[news] nothing to persist")
             return 0
-        rows = [x.as_row() for x in items if x.t and x.title and x.source]
-        if not rows:
+        if not any(x.t and x.title and x.source for x in items):
             log.warning("[news] all rows invalid or missing core fields; skipped")
             return 0
+        # Stream rows straight into the single multi-row upsert instead of building a list first
+        rows = (x.as_row() for x in items if x.t and x.title and x.source)
         with get_session() as s:
             affected = upsert_news_events(s, rows=rows)
             log.info("[news] persisted rows=%s", affected)
@@ -25,7 +25,7 @@ from flask import Flask, jsonify, request
 from TradeBot.config.setting_schema import TradingBotConfig
 
 # ---- Finnhub (HTTP client + feature modules)
-from TradeBot.core.finnhub_data.httpClient import FinnhubHTTP
+from TradeBot.core.finnhub_data.httpClient import FinnhubHTTP, get_http
 from TradeBot.core.finnhub_data import forex as fx
 from TradeBot.core.finnhub_data.symbols import finnhub_symbols_for_roles, FINNHUB_TO_NAME, finnhub_symbol_for_names
 from TradeBot.core.finnhub_data import technical_analysis as ta
@@ -98,7 +98,8 @@ def _require_params(params: Dict[str, Any], *names: str):
 # Helpers
 # =========================================================
 def get_finnhub() -> FinnhubHTTP:
-    return FinnhubHTTP(
+    # Shared per settings: keeps the Finnhub connection alive across API requests
+    return get_http(
         base_url=CFG.finnhub.api_base,
         token=CFG.finnhub.api_token,
         timeout=getattr(CFG.finnhub, "HTTP_TIMEOUT", 15),
@@ -333,15 +334,14 @@ def api_forex_candles():
     saves: Dict[str, int] = {}
     errors: Dict[str, str] = {}
 
+    # Fetch all symbols concurrently; rows are then processed and saved in order
     with get_finnhub() as client:
+        fetched = fx.candles_bulk(client, [(code, resolution, start_i, end_i) for code in final_symbols], as_df=False)
         for code in final_symbols:
             try:
-                raw = client.get("/forex/candle", params={
-                    "symbol": code,
-                    "resolution": resolution,
-                    "from": start_i,
-                    "to": end_i,
-                })
+                raw = fetched[(code, resolution, start_i, end_i)]
+                if isinstance(raw, Exception):
+                    raise raw
                 rows: List[Dict[str, Any]] = []
                 if isinstance(raw, dict) and raw.get("s") == "ok":
                     t = raw.get("t", [])
@@ -284,8 +284,16 @@ class TradingBotTelegram:
             
         logger.info("Starting Telegram bot...")
         
-        # Create application
-        application = Application.builder().token(self.bot_token).build()
+        # Create application. Handlers reply and edit concurrently across chats, so
+        # give them a real keep-alive pool, separate from the long-polling one
+        application = (
+            Application.builder()
+            .token(self.bot_token)
+            .connection_pool_size(32)
+            .pool_timeout(20)
+            .get_updates_connection_pool_size(4)
+            .build()
+        )
         
         # Setup handlers
         self.setup_handlers(application)
@@ -295,6 +303,11 @@ class TradingBotTelegram:
             async with application:
                 logger.info("Bot is running. Press Ctrl+C to stop.")
                 await application.start()
+                
+                # Overlap the fast LLM system setup with polling startup
+                if LLM_AVAILABLE:
+                    fast_llm_command_handler.start_background_init()
+                
                 await application.updater.start_polling(
                     allowed_updates=Update.ALL_TYPES,
                     drop_pending_updates=True
@@ -168,7 +168,7 @@ class TradingOrchestrator:
         try:
             # Step 1: Generate LLM signals (fast mode)
             logger.info("📊 Step 1: Generating LLM trading signals...")
-            llm_results = self.llm_system.run_fast_analysis(
+            llm_results = await self.llm_system.run_fast_analysis_async(
                 symbols=self.settings['symbols'],
                 max_symbols=3
             )